@@ -0,0 +1,251 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from metodos_directos import gauss_eliminacion, gauss_eliminacion_solo_matriz, calcular_determinante
+from metodos_iterativos import jacobi, gauss_seidel
+from estructura import resolver_automatico
+from metodos_no_lineales import newton_raphson_1var, newton_raphson_sistema, crear_funcion
+
+TAMANOS_POR_DEFECTO = (25, 50, 100, 200)
+
+# Tiempo máximo de importación de cada módulo (segundos). main.py no debe cargar
+# numpy ni los métodos hasta que se usan; el resto está dominado por numpy.
+PRESUPUESTO_IMPORTACION = {
+    "main": 0.025,
+    "lotes": 0.300,
+    "metodos_directos": 0.300,
+    "metodos_iterativos": 0.300,
+    "metodos_no_lineales": 0.300,
+}
+
+def matriz_diagonal_dominante(n, semilla):
+    """
+    Matriz aleatoria n x n estrictamente diagonalmente dominante.
+    """
+    rng = np.random.default_rng(semilla)
+    A = rng.random((n, n)) / n
+    A += np.diag(2 * A.sum(axis=1))
+    return A, rng.random(n)
+
+def sistema_bratu(n):
+    """
+    Discretización en n puntos de -u'' = e^u con u(0) = u(1) = 0 (sistema tridiagonal).
+    """
+    h2 = (1.0 / (n + 1)) ** 2
+    F = []
+    for i in range(n):
+        def f(*u, i=i):
+            izquierda = u[i - 1] if i > 0 else 0.0
+            derecha = u[i + 1] if i < n - 1 else 0.0
+            return (izquierda - 2 * u[i] + derecha) / h2 + np.exp(u[i])
+        F.append(f)
+    return F
+
+def _casos(n):
+    """
+    Casos de prueba de tamaño n: (nombre de la función, familia, función sin argumentos).
+    Los datos se generan antes de medir, con una semilla fija por tamaño.
+    """
+    A, b = matriz_diagonal_dominante(n, semilla=n)
+    tridiagonal = np.diag(np.full(n, 4.0)) + np.diag(np.ones(n - 1), 1) + np.diag(np.ones(n - 1), -1)
+    polinomio = crear_funcion(f"x**{n} - 2")
+    bratu = sistema_bratu(n)
+    return [
+        ("gauss_eliminacion", "diagonal_dominante",
+         lambda: gauss_eliminacion(A, b)),
+        ("gauss_precision_mixta", "diagonal_dominante",
+         lambda: gauss_eliminacion(A, b, precision="mixta")),
+        ("gauss_eliminacion", "tridiagonal",
+         lambda: gauss_eliminacion(tridiagonal, b)),
+        ("resolver_automatico", "tridiagonal",
+         lambda: resolver_automatico(tridiagonal, b)),
+        ("gauss_eliminacion_solo_matriz", "diagonal_dominante",
+         lambda: gauss_eliminacion_solo_matriz(A)),
+        ("jacobi", "diagonal_dominante",
+         lambda: jacobi(A, b, tol=1e-10, max_iter=500)),
+        ("gauss_seidel", "diagonal_dominante",
+         lambda: gauss_seidel(A, b, tol=1e-10, max_iter=500)),
+        ("calcular_determinante", "diagonal_dominante",
+         lambda: calcular_determinante(A)),
+        ("newton_raphson_1var", "x^n - 2",
+         lambda: newton_raphson_1var(polinomio, None, 2.0, tol=1e-12, max_iter=500)),
+        ("newton_raphson_sistema", "bratu",
+         lambda: newton_raphson_sistema(bratu, None, np.zeros(n), tol=1e-10)),
+    ]
+
+def medir(funcion, repeticiones):
+    """
+    Ejecuta la función varias veces sin mostrar su salida por pantalla.
+
+    Retorna:
+    - Lista con el tiempo de cada repetición en segundos
+    """
+    tiempos = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            funcion()
+            tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+def ejecutar_benchmark(tamanos=TAMANOS_POR_DEFECTO, repeticiones=5, filtro=None):
+    """
+    Mide todos los casos para cada tamaño.
+
+    Parámetros:
+    - tamanos: Tamaños de problema a medir
+    - repeticiones: Repeticiones de cada caso (se guarda la mejor y la mediana)
+    - filtro: Si se indica, solo se miden las funciones cuyo nombre lo contiene
+
+    Retorna:
+    - Lista de diccionarios con funcion, familia, n, mejor y mediana (segundos)
+    """
+    resultados = []
+    for n in tamanos:
+        for nombre, familia, funcion in _casos(n):
+            if filtro and filtro not in nombre:
+                continue
+            tiempos = medir(funcion, repeticiones)
+            resultados.append({
+                "funcion": nombre,
+                "familia": familia,
+                "n": n,
+                "mejor": min(tiempos),
+                "mediana": float(np.median(tiempos)),
+            })
+            print(f"{nombre:32s} {familia:20s} n={n:<5d} mejor={min(tiempos) * 1e3:10.3f} ms")
+    return resultados
+
+def medir_importacion(modulo, repeticiones=5):
+    """
+    Mide el tiempo de importación de un módulo en un intérprete nuevo con
+    python -X importtime (tiempo acumulado, incluidas sus dependencias).
+
+    Retorna:
+    - Mejor tiempo de las repeticiones, en segundos
+    """
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        # Se lanza desde el directorio del proyecto para encontrar los módulos
+        # aunque el benchmark se ejecute desde otro directorio
+        proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+                                 capture_output=True, text=True, check=True,
+                                 cwd=os.path.dirname(os.path.abspath(__file__)))
+        for linea in proceso.stderr.splitlines():
+            partes = [p.strip() for p in linea.split("|")]
+            if len(partes) == 3 and partes[2] == modulo:
+                mejor = min(mejor, int(partes[1]) * 1e-6)
+    return mejor
+
+def comprobar_importacion(repeticiones=5):
+    """
+    Mide la importación de los módulos de PRESUPUESTO_IMPORTACION.
+
+    Retorna:
+    - Lista de diccionarios con modulo, tiempo, presupuesto y si lo supera
+    """
+    resultados = []
+    for modulo, presupuesto in PRESUPUESTO_IMPORTACION.items():
+        tiempo = medir_importacion(modulo, repeticiones)
+        excede = tiempo > presupuesto
+        resultados.append({"modulo": modulo, "tiempo": tiempo, "presupuesto": presupuesto,
+                           "excede": excede})
+        aviso = "  EXCEDE EL PRESUPUESTO" if excede else ""
+        print(f"import {modulo:28s} {tiempo * 1e3:10.3f} ms "
+              f"(presupuesto {presupuesto * 1e3:.0f} ms){aviso}")
+    return resultados
+
+def comparar(resultados, referencia, umbral):
+    """
+    Compara el mejor tiempo de cada caso con el de la referencia.
+
+    Retorna:
+    - Lista de regresiones: casos cuyo tiempo supera umbral veces el de referencia
+    """
+    previos = {(r["funcion"], r["familia"], r["n"]): r for r in referencia.get("resultados", [])}
+    regresiones = []
+    for r in resultados:
+        previo = previos.get((r["funcion"], r["familia"], r["n"]))
+        if previo is None or previo["mejor"] <= 0:
+            continue
+        razon = r["mejor"] / previo["mejor"]
+        if razon > umbral:
+            regresiones.append({"funcion": r["funcion"], "familia": r["familia"], "n": r["n"],
+                                "referencia": previo["mejor"], "actual": r["mejor"],
+                                "razon": razon})
+    return regresiones
+
+def entorno():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+        "procesador": platform.processor(),
+    }
+
+def procesar_argumentos(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmark de los métodos numéricos")
+    parser.add_argument("--salida", default="resultados_benchmark.json",
+                        help="Archivo JSON donde se guardan los resultados")
+    parser.add_argument("--referencia", default=None,
+                        help="Archivo JSON de referencia con el que comparar")
+    parser.add_argument("--guardar-referencia", action="store_true",
+                        help="Guarda también los resultados como nueva referencia")
+    parser.add_argument("--umbral", type=float, default=1.25,
+                        help="Razón actual/referencia a partir de la cual hay regresión")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--tamanos", default=",".join(map(str, TAMANOS_POR_DEFECTO)),
+                        help="Tamaños separados por comas")
+    parser.add_argument("--filtro", default=None,
+                        help="Mide solo las funciones cuyo nombre contiene este texto")
+    parser.add_argument("--sin-importacion", action="store_true",
+                        help="No comprueba el presupuesto de tiempo de importación")
+    args = parser.parse_args(argumentos)
+    if args.guardar_referencia and not args.referencia:
+        parser.error("--guardar-referencia necesita --referencia")
+    return args
+
+def main(argumentos=None):
+    args = procesar_argumentos(argumentos)
+    tamanos = [int(t) for t in args.tamanos.split(",") if t.strip()]
+
+    resultados = ejecutar_benchmark(tamanos, args.repeticiones, args.filtro)
+    informe = {"entorno": entorno(), "repeticiones": args.repeticiones, "resultados": resultados}
+    if not args.sin_importacion:
+        informe["importacion"] = comprobar_importacion(args.repeticiones)
+
+    if args.referencia:
+        try:
+            with open(args.referencia, encoding="utf-8") as f:
+                referencia = json.load(f)
+        except FileNotFoundError:
+            print(f"No existe la referencia {args.referencia}; no se compara.")
+        else:
+            informe["regresiones"] = comparar(resultados, referencia, args.umbral)
+            for r in informe["regresiones"]:
+                print(f"REGRESIÓN: {r['funcion']} ({r['familia']}, n={r['n']}) "
+                      f"{r['razon']:.2f} veces más lento que la referencia")
+
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump(informe, f, indent=2)
+    print(f"Resultados guardados en {args.salida}")
+
+    if args.guardar_referencia:
+        with open(args.referencia, "w", encoding="utf-8") as f:
+            json.dump(informe, f, indent=2)
+        print(f"Referencia actualizada en {args.referencia}")
+
+    excesos = [r for r in informe.get("importacion", []) if r["excede"]]
+    return 1 if informe.get("regresiones") or excesos else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+import numpy as np
+
+class Dual:
+    """
+    Número dual para diferenciación automática en modo directo.
+    Guarda un valor y sus derivadas respecto a k direcciones a la vez, de modo que
+    una sola evaluación de la función da el valor y todas las derivadas parciales
+    exactas (sin error de truncamiento).
+
+    Atributos:
+    - valor: Número o array con el valor
+    - deriv: Array de forma np.shape(valor) + (k,) con las derivadas
+    """
+
+    __slots__ = ("valor", "deriv")
+
+    def __init__(self, valor, deriv):
+        self.valor = valor
+        self.deriv = np.asarray(deriv, dtype=float)
+
+    def __repr__(self):
+        return f"Dual({self.valor!r}, {self.deriv!r})"
+
+    # Operadores de Python: se delegan en las ufuncs de numpy
+    def __add__(self, otro):
+        return np.add(self, otro)
+
+    def __radd__(self, otro):
+        return np.add(otro, self)
+
+    def __sub__(self, otro):
+        return np.subtract(self, otro)
+
+    def __rsub__(self, otro):
+        return np.subtract(otro, self)
+
+    def __mul__(self, otro):
+        return np.multiply(self, otro)
+
+    def __rmul__(self, otro):
+        return np.multiply(otro, self)
+
+    def __truediv__(self, otro):
+        return np.true_divide(self, otro)
+
+    def __rtruediv__(self, otro):
+        return np.true_divide(otro, self)
+
+    def __pow__(self, otro):
+        return np.power(self, otro)
+
+    def __rpow__(self, otro):
+        return np.power(otro, self)
+
+    def __mod__(self, otro):
+        return np.remainder(self, otro)
+
+    def __neg__(self):
+        return np.negative(self)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return np.absolute(self)
+
+    def __array_ufunc__(self, ufunc, metodo, *entradas, **kwargs):
+        if metodo != "__call__" or kwargs:
+            return NotImplemented
+        if ufunc in _UNARIAS:
+            (a,) = entradas
+            derivada = _UNARIAS[ufunc](a.valor)
+            return Dual(ufunc(a.valor), _escalar(derivada, a.deriv))
+        if ufunc in _BINARIAS:
+            return _BINARIAS[ufunc](*entradas)
+        return NotImplemented
+
+def _partes(x):
+    """
+    Retorna (valor, derivadas) de un Dual o (x, None) de una constante.
+    """
+    if isinstance(x, Dual):
+        return x.valor, x.deriv
+    return x, None
+
+def _escalar(factor, deriv):
+    """
+    Multiplica cada derivada por factor (que tiene la forma del valor).
+    """
+    return np.asarray(factor)[..., None] * deriv
+
+def _sumar(da, db, forma):
+    """
+    Suma dos bloques de derivadas (None = cero) ajustándolos a la forma del resultado.
+    """
+    total = da if db is None else (db if da is None else da + db)
+    return np.broadcast_to(total, np.shape(forma) + total.shape[-1:])
+
+def _add(a, b):
+    va, da = _partes(a)
+    vb, db = _partes(b)
+    valor = va + vb
+    return Dual(valor, _sumar(da, db, valor))
+
+def _subtract(a, b):
+    va, da = _partes(a)
+    vb, db = _partes(b)
+    valor = va - vb
+    return Dual(valor, _sumar(da, None if db is None else -db, valor))
+
+def _multiply(a, b):
+    va, da = _partes(a)
+    vb, db = _partes(b)
+    valor = va * vb
+    return Dual(valor, _sumar(None if da is None else _escalar(vb, da),
+                              None if db is None else _escalar(va, db), valor))
+
+def _true_divide(a, b):
+    va, da = _partes(a)
+    vb, db = _partes(b)
+    valor = va / vb
+    return Dual(valor, _sumar(None if da is None else _escalar(1.0 / vb, da),
+                              None if db is None else _escalar(-valor / vb, db), valor))
+
+def _power(a, b):
+    va, da = _partes(a)
+    vb, db = _partes(b)
+    valor = np.power(va, vb)
+    parte_a = parte_b = None
+    if da is not None:
+        parte_a = _escalar(vb * np.power(va, vb - 1.0), da)
+    if db is not None:
+        parte_b = _escalar(valor * np.log(va), db)
+    return Dual(valor, _sumar(parte_a, parte_b, valor))
+
+def _remainder(a, b):
+    va, da = _partes(a)
+    vb, db = _partes(b)
+    valor = np.remainder(va, vb)
+    parte_b = None if db is None else _escalar(-np.floor_divide(va, vb), db)
+    return Dual(valor, _sumar(da, parte_b, valor))
+
+_BINARIAS = {
+    np.add: _add,
+    np.subtract: _subtract,
+    np.multiply: _multiply,
+    np.true_divide: _true_divide,
+    np.power: _power,
+    np.remainder: _remainder,
+}
+
+# Derivada de cada función de una variable, evaluada en el valor
+_UNARIAS = {
+    np.negative: lambda v: -np.ones_like(v, dtype=float),
+    np.positive: lambda v: np.ones_like(v, dtype=float),
+    np.absolute: np.sign,
+    np.sin: np.cos,
+    np.cos: lambda v: -np.sin(v),
+    np.tan: lambda v: 1.0 / np.cos(v) ** 2,
+    np.arcsin: lambda v: 1.0 / np.sqrt(1.0 - v ** 2),
+    np.arccos: lambda v: -1.0 / np.sqrt(1.0 - v ** 2),
+    np.arctan: lambda v: 1.0 / (1.0 + v ** 2),
+    np.sinh: np.cosh,
+    np.cosh: np.sinh,
+    np.tanh: lambda v: 1.0 / np.cosh(v) ** 2,
+    np.exp: np.exp,
+    np.log: lambda v: 1.0 / v,
+    np.log10: lambda v: 1.0 / (v * np.log(10.0)),
+    np.log2: lambda v: 1.0 / (v * np.log(2.0)),
+    np.sqrt: lambda v: 0.5 / np.sqrt(v),
+}
+
+def derivada(f):
+    """
+    Crea la derivada exacta de una función de una variable por diferenciación
+    automática. Si x es un array se deriva elemento a elemento.
+
+    Parámetros:
+    - f: Función de x construida con operaciones y funciones de numpy
+
+    Retorna:
+    - Función df(x)
+    """
+    def df(x):
+        resultado = f(Dual(x, np.ones(np.shape(x) + (1,))))
+        if not isinstance(resultado, Dual):
+            return np.zeros(np.shape(x)) if np.shape(x) else 0.0
+        return resultado.deriv[..., 0]
+    return df
+
+def evaluar_sistema(F, *variables):
+    """
+    Evalúa todas las ecuaciones de F en los mismos valores de las variables.
+    Si las variables son arrays de tamaño m, se evalúan m puntos en una sola llamada
+    a cada ecuación.
+
+    Retorna:
+    - Array (len(F),) o (len(F), m) con los valores
+    """
+    forma = np.broadcast_shapes(*[np.shape(v) for v in variables])
+    return np.array([np.broadcast_to(f(*variables), forma) for f in F], dtype=float)
+
+def colorear_columnas(patron):
+    """
+    Agrupa las columnas de un Jacobiano disperso en colores de forma que dos columnas
+    del mismo color no tengan elementos distintos de cero en la misma fila. Todas las
+    columnas de un color se pueden perturbar a la vez.
+
+    Parámetros:
+    - patron: Matriz booleana (filas x columnas) con los elementos que pueden ser
+      distintos de cero
+
+    Retorna:
+    - Array con el color de cada columna (0, 1, ...)
+    """
+    patron = np.asarray(patron, dtype=bool)
+    n = patron.shape[1]
+    colores = np.full(n, -1)
+    for j in range(n):
+        # Columnas que comparten alguna fila con j
+        filas = patron[:, j]
+        vecinas = np.flatnonzero(patron[filas].any(axis=0))
+        usados = colores[vecinas]
+        color = 0
+        while np.any(usados == color):
+            color += 1
+        colores[j] = color
+    return colores
+
+def _recuperar(compacta, patron, colores, escala=None):
+    """
+    Reconstruye el Jacobiano a partir de su forma comprimida por colores:
+    J[i, j] = compacta[i, colores[j]] donde patron[i, j] es True.
+    """
+    filas, columnas = np.nonzero(patron)
+    valores = compacta[filas, colores[columnas]]
+    if escala is not None:
+        valores = valores / escala[columnas]
+    J = np.zeros(patron.shape)
+    J[filas, columnas] = valores
+    return J
+
+def jacobiano(F, patron=None):
+    """
+    Crea el Jacobiano exacto de un sistema por diferenciación automática.
+    Cada ecuación se evalúa una sola vez con todas las variables como números duales,
+    lo que da su fila completa del Jacobiano.
+
+    Con un patrón de dispersión, las variables del mismo color (ver colorear_columnas)
+    comparten dirección, así que cada evaluación solo arrastra tantas derivadas como
+    colores en lugar de n.
+
+    Parámetros:
+    - F: Lista de funciones [F1, F2, ...] de las mismas n variables
+    - patron: Matriz booleana opcional con los elementos no nulos del Jacobiano
+
+    Retorna:
+    - Función J(*variables) que retorna la matriz Jacobiana (len(F) x n)
+    """
+    colores = None if patron is None else colorear_columnas(patron)
+    patron = None if patron is None else np.asarray(patron, dtype=bool)
+
+    def J(*variables):
+        n = len(variables)
+        semillas = np.eye(n) if colores is None else np.eye(colores.max() + 1)[colores]
+        duales = [Dual(v, semillas[i]) for i, v in enumerate(variables)]
+        compacta = np.zeros((len(F), semillas.shape[1]))
+        for i, f in enumerate(F):
+            resultado = f(*duales)
+            if isinstance(resultado, Dual):
+                compacta[i] = resultado.deriv
+        return compacta if colores is None else _recuperar(compacta, patron, colores)
+    return J
+
+def jacobiano_diferencias(F, patron=None, h=1e-6):
+    """
+    Crea el Jacobiano de un sistema por diferencias centrales.
+    Todos los puntos perturbados se evalúan en una sola llamada vectorizada a cada
+    ecuación. Con un patrón de dispersión se perturban a la vez todas las columnas
+    del mismo color, así que solo hacen falta 2 · (número de colores) puntos.
+
+    Parámetros:
+    - F: Lista de funciones vectorizadas [F1, F2, ...] de las mismas n variables
+    - patron: Matriz booleana opcional con los elementos no nulos del Jacobiano
+    - h: Tamaño relativo del paso
+
+    Retorna:
+    - Función J(*variables) que retorna la matriz Jacobiana (len(F) x n)
+    """
+    colores = None if patron is None else colorear_columnas(patron)
+    patron = None if patron is None else np.asarray(patron, dtype=bool)
+
+    def J(*variables):
+        x = np.array(variables, dtype=float)
+        n = x.shape[0]
+        pasos = h * np.maximum(1.0, np.abs(x))
+        if colores is None:
+            S = np.diag(pasos)
+        else:
+            S = np.eye(colores.max() + 1)[colores] * pasos[:, None]
+
+        # Columnas x + S y x - S evaluadas juntas
+        puntos = np.concatenate([x[:, None] + S, x[:, None] - S], axis=1)
+        valores = evaluar_sistema(F, *puntos)
+        c = S.shape[1]
+        diferencias = (valores[:, :c] - valores[:, c:]) / 2.0
+        if colores is None:
+            return diferencias / pasos
+        return _recuperar(diferencias, patron, colores, pasos)
+    return J
@@ -0,0 +1,437 @@
+import numpy as np
+from matriz_dispersa import MatrizCSR, como_csr
+from metodos_directos import gauss_eliminacion
+
+def _coordenadas(A, tol=0.0):
+    """
+    Retorna las filas, columnas y valores de los elementos de A con |valor| > tol,
+    sin pasar por una matriz densa si A es dispersa.
+    """
+    A = como_csr(A)
+    if isinstance(A, MatrizCSR):
+        filas = np.repeat(np.arange(A.shape[0]), np.diff(A.indptr))
+        columnas, valores = A.indices, A.datos
+    else:
+        A = np.asarray(A, dtype=float)
+        filas, columnas = np.nonzero(np.abs(A) > tol)
+        return filas, columnas, A[filas, columnas]
+
+    guardar = np.abs(valores) > tol
+    return filas[guardar], columnas[guardar], valores[guardar]
+
+def es_diagonal_dominante(A, estricta=True):
+    """
+    Comprueba si A es diagonalmente dominante por filas: |a_ii| > Σ_{j≠i} |a_ij|
+    (o >= si estricta es False). Cuesta O(n²) operaciones vectorizadas con una
+    matriz densa y O(nnz) con una dispersa.
+    """
+    A = como_csr(A)
+    if isinstance(A, MatrizCSR):
+        diagonal = np.abs(A.diagonal())
+        fuera = A.suma_abs_por_fila(sin_diagonal=True)
+    else:
+        absolutos = np.abs(np.asarray(A, dtype=float))
+        diagonal = absolutos.diagonal().copy()
+        np.fill_diagonal(absolutos, 0.0)
+        fuera = absolutos.sum(axis=1)
+
+    if estricta:
+        return bool(np.all(diagonal > fuera))
+    return bool(np.all(diagonal >= fuera))
+
+def anchos_banda(A, tol=0.0):
+    """
+    Retorna (inferior, superior): número de diagonales distintas de cero por
+    debajo y por encima de la diagonal principal.
+    """
+    filas, columnas, _ = _coordenadas(A, tol)
+    if filas.size == 0:
+        return 0, 0
+    distancia = filas - columnas
+    return int(max(distancia.max(), 0)), int(max(-distancia.min(), 0))
+
+def es_simetrica(A, tol=0.0):
+    """
+    Comprueba si A = A^T (con diferencias de como mucho tol).
+    """
+    A = como_csr(A)
+    if not isinstance(A, MatrizCSR):
+        A = np.asarray(A, dtype=float)
+        return bool(np.allclose(A, A.T, rtol=0.0, atol=tol))
+
+    # Con una matriz dispersa se comparan las tripletas de A y de A^T ordenadas
+    filas, columnas, valores = _coordenadas(A, tol)
+    n = A.shape[0]
+    orden = np.argsort(filas * n + columnas)
+    orden_t = np.argsort(columnas * n + filas)
+    return bool(np.array_equal(filas[orden], columnas[orden_t])
+                and np.array_equal(columnas[orden], filas[orden_t])
+                and np.allclose(valores[orden], valores[orden_t], rtol=0.0, atol=tol))
+
+def _tridiagonal_definida_positiva(diagonal, inferior):
+    """
+    Indica si una matriz tridiagonal simétrica es definida positiva, en O(n): lo es
+    si y solo si todos los pivotes de su factorización LDLᵀ son positivos.
+
+    Parámetros:
+    - diagonal: Diagonal principal
+    - inferior: Subdiagonal (inferior[i] = A[i, i-1]; inferior[0] no se usa)
+    """
+    d, e = diagonal.tolist(), inferior.tolist()
+    pivote = d[0]
+    if pivote <= 0:
+        return False
+    for i in range(1, len(d)):
+        pivote = d[i] - e[i] * e[i] / pivote
+        if pivote <= 0:
+            return False
+    return True
+
+def cholesky(matriz, tam_bloque=64):
+    """
+    Factoriza una matriz simétrica definida positiva como A = L L^T, por bloques
+    de columnas como _lu_bloques: el resto de la matriz se actualiza con un único
+    producto matriz-matriz por bloque. Hace la mitad de operaciones que LU y no
+    necesita pivoteo.
+
+    Retorna:
+    - L: Matriz triangular inferior
+    """
+    A = np.array(matriz, dtype=float)
+    n = A.shape[0]
+
+    for k in range(0, n, tam_bloque):
+        fin = min(k + tam_bloque, n)
+        for j in range(k, fin):
+            A[j:, j] -= A[j:, k:j] @ A[j, k:j]
+            if A[j, j] <= 0:
+                raise ValueError("La matriz no es definida positiva.")
+            A[j, j] = np.sqrt(A[j, j])
+            A[j + 1:, j] /= A[j, j]
+        if fin < n:
+            A[fin:, fin:] -= A[fin:, k:fin] @ A[fin:, k:fin].T
+
+    return np.tril(A)
+
+def resolver_triangular(T, b, inferior=True):
+    """
+    Resuelve T x = b por sustitución hacia adelante (T triangular inferior) o
+    hacia atrás (superior). b puede ser un vector o una matriz n x k.
+    """
+    n = T.shape[0]
+    if np.any(T.diagonal() == 0):
+        raise ValueError("El sistema no tiene solución única (pivote cero).")
+
+    x = np.array(b, dtype=float)
+    if inferior:
+        for i in range(n):
+            x[i] = (x[i] - T[i, :i] @ x[:i]) / T[i, i]
+    else:
+        for i in range(n - 1, -1, -1):
+            x[i] = (x[i] - T[i, i + 1:] @ x[i + 1:]) / T[i, i]
+    return x
+
+def resolver_triangular_bandas(banda, b, inferior=True):
+    """
+    Resuelve T x = b con T triangular en banda, en O(n·ancho).
+
+    Parámetros:
+    - banda: T en el formato de a_bandas: a_bandas(T, ancho, 0) si es inferior o
+      a_bandas(T, 0, ancho) si es superior
+    - b: Vector de términos independientes (o matriz n x k)
+    - inferior: True si T es triangular inferior, False si es superior
+    """
+    n, ancho = banda.shape[0], banda.shape[1] - 1
+    diagonal = banda[:, ancho] if inferior else banda[:, 0]
+    if np.any(diagonal == 0):
+        raise ValueError("El sistema no tiene solución única (pivote cero).")
+
+    # x lleva ancho ceros de relleno para no comprobar los bordes
+    b = np.asarray(b, dtype=float)
+    x = np.zeros((n + ancho,) + b.shape[1:])
+    if inferior:
+        x[ancho:] = b
+        for i in range(n):
+            x[ancho + i] = (x[ancho + i] - banda[i, :ancho] @ x[i:ancho + i]) / diagonal[i]
+        return x[ancho:]
+    x[:n] = b
+    for i in range(n - 1, -1, -1):
+        x[i] = (x[i] - banda[i, 1:] @ x[i + 1:i + 1 + ancho]) / diagonal[i]
+    return x[:n]
+
+def resolver_triangular_dispersa(T, b, inferior=True):
+    """
+    Resuelve T x = b con T triangular guardada como MatrizCSR, en O(nnz) y sin
+    pasar por una matriz densa.
+    """
+    n = T.shape[0]
+    diagonal = T.diagonal()
+    if np.any(diagonal == 0):
+        raise ValueError("El sistema no tiene solución única (pivote cero).")
+
+    x = np.array(b, dtype=float)
+    orden = range(n) if inferior else range(n - 1, -1, -1)
+    for i in orden:
+        columnas, valores = T.fila(i)
+        fuera = columnas != i
+        x[i] = (x[i] - valores[fuera] @ x[columnas[fuera]]) / diagonal[i]
+    return x
+
+def resolver_cholesky(L, b):
+    """
+    Resuelve L L^T x = b con el factor de Cholesky.
+    """
+    return resolver_triangular(L.T, resolver_triangular(L, b), inferior=False)
+
+def a_bandas(A, inferior, superior, tol=0.0):
+    """
+    Guarda A en formato de bandas compacto: una fila por fila de A con sus
+    inferior + superior + 1 diagonales, banda[i, j - i + inferior] = A[i, j].
+    Ocupa O(n·(inferior + superior)) en lugar de O(n²).
+    """
+    n = A.shape[0]
+    filas, columnas, valores = _coordenadas(A, tol)
+    banda = np.zeros((n, inferior + superior + 1))
+    banda[filas, columnas - filas + inferior] = valores
+    return banda
+
+def thomas(inferior, diagonal, superior, b):
+    """
+    Algoritmo de Thomas para un sistema tridiagonal, en O(n).
+    No pivota, así que solo es estable si la matriz es diagonalmente dominante o
+    definida positiva.
+
+    Parámetros:
+    - inferior: Subdiagonal (inferior[i] = A[i, i-1]; inferior[0] no se usa)
+    - diagonal: Diagonal principal
+    - superior: Superdiagonal (superior[i] = A[i, i+1]; el último no se usa)
+    - b: Vector de términos independientes (o matriz n x k)
+
+    Retorna:
+    - Un numpy array con la solución del sistema x.
+    """
+    a, d, c = list(inferior), list(diagonal), list(superior)
+    b = np.asarray(b, dtype=float)
+    y = b.tolist() if b.ndim == 1 else list(b.copy())
+    n = len(d)
+
+    # Eliminación hacia adelante con escalares de Python (más rápido que numpy elemento a elemento)
+    c_prima = [0.0] * n
+    if d[0] == 0:
+        raise ValueError("El sistema no tiene solución única (pivote cero).")
+    c_prima[0] = c[0] / d[0]
+    y[0] = y[0] / d[0]
+    for i in range(1, n):
+        denominador = d[i] - a[i] * c_prima[i - 1]
+        if denominador == 0:
+            raise ValueError("El sistema no tiene solución única (pivote cero).")
+        c_prima[i] = c[i] / denominador
+        y[i] = (y[i] - a[i] * y[i - 1]) / denominador
+
+    # Sustitución hacia atrás
+    for i in range(n - 2, -1, -1):
+        y[i] = y[i] - c_prima[i] * y[i + 1]
+    return np.array(y)
+
+def factorizar_bandas(A, inferior, superior, tol=0.0):
+    """
+    Factorización PA = LU con pivoteo parcial de una matriz en banda, en
+    O(n·inferior·(inferior + superior)). Con el pivoteo la banda superior de U
+    crece hasta inferior + superior diagonales, que ya se reservan en el formato
+    compacto.
+
+    Retorna:
+    - U: Bandas de U (U[k, t] = U[k, k + t]), con n + inferior filas
+    - multiplicadores: Multiplicadores de L de cada paso (n x inferior)
+    - pivotes: Fila intercambiada con la k en el paso k
+    """
+    n = A.shape[0]
+    ancho = inferior + superior
+
+    # Cada fila guarda las columnas i - inferior ... i + ancho; las filas extra
+    # (a cero) evitan comprobar los bordes en las últimas filas
+    bandas = np.zeros((n + inferior, inferior + ancho + 1))
+    filas, columnas, valores = _coordenadas(A, tol)
+    bandas[filas, columnas - filas + inferior] = valores
+
+    # Índices del bloque de filas k..k+inferior y columnas k..k+ancho dentro de bandas
+    m = np.arange(inferior + 1)[:, None]
+    posiciones = inferior - m + np.arange(ancho + 1)[None, :]
+
+    multiplicadores = np.zeros((n, inferior))
+    pivotes = np.arange(n)
+    for k in range(n):
+        bloque = bandas[k + m, posiciones]
+        p = np.argmax(np.abs(bloque[:, 0]))
+        if bloque[p, 0] == 0:
+            raise ValueError("El sistema no tiene solución única (pivote cero).")
+        if p != 0:
+            bloque[[0, p]] = bloque[[p, 0]]
+            pivotes[k] = k + p
+        factores = bloque[1:, 0] / bloque[0, 0]
+        bloque[1:] -= np.outer(factores, bloque[0])
+        multiplicadores[k] = factores
+        bandas[k + m, posiciones] = bloque
+
+    return bandas[:, inferior:], multiplicadores, pivotes
+
+def resolver_bandas(U, multiplicadores, pivotes, b):
+    """
+    Resuelve A x = b con la factorización de factorizar_bandas, en O(n·ancho).
+    """
+    n, inferior = multiplicadores.shape
+    ancho = U.shape[1] - 1
+
+    y = np.array(b, dtype=float)
+    for k in range(n):
+        p = pivotes[k]
+        if p != k:
+            y[[k, p]] = y[[p, k]]
+        fin = min(k + 1 + inferior, n)
+        y[k + 1:fin] -= np.multiply.outer(multiplicadores[k, :fin - k - 1], y[k])
+
+    x = np.zeros((n + ancho,) + y.shape[1:])
+    for k in range(n - 1, -1, -1):
+        x[k] = (y[k] - U[k, 1:] @ x[k + 1:k + 1 + ancho]) / U[k, 0]
+    return x[:n]
+
+def analizar_estructura(A, tol=0.0, comprobar_definida=True):
+    """
+    Analiza la estructura de una matriz cuadrada (densa o dispersa).
+
+    Parámetros:
+    - A: Matriz cuadrada
+    - tol: Los elementos con |valor| <= tol se consideran cero
+    - comprobar_definida: Si es True se intenta la factorización de Cholesky para
+      saber si es definida positiva (O(n³)); si es False solo se descarta cuando
+      no es simétrica o tiene algún elemento diagonal <= 0. En las tridiagonales
+      simétricas se comprueba siempre, con los pivotes de LDLᵀ en O(n)
+
+    Retorna:
+    - Diccionario con n, diagonal, triangular_inferior, triangular_superior,
+      ancho_inferior, ancho_superior, tridiagonal, simetrica, diagonal_dominante
+      y definida_positiva (True, False o None si no se ha comprobado)
+    """
+    A = como_csr(A)
+    if A.ndim != 2 or A.shape[0] != A.shape[1]:
+        raise ValueError("La matriz debe ser cuadrada.")
+
+    n = A.shape[0]
+    inferior, superior = anchos_banda(A, tol)
+    simetrica = inferior == superior and es_simetrica(A, tol)
+    diagonal = A.diagonal() if isinstance(A, MatrizCSR) else np.diag(A).astype(float)
+
+    definida_positiva = None
+    if not simetrica or np.any(diagonal <= 0):
+        definida_positiva = False
+    elif inferior <= 1:
+        # En las tridiagonales simétricas la comprobación es O(n), así que siempre se hace
+        banda = a_bandas(A, 1, 1, tol)
+        definida_positiva = _tridiagonal_definida_positiva(banda[:, 1], banda[:, 0])
+    elif comprobar_definida:
+        try:
+            cholesky(A.toarray() if isinstance(A, MatrizCSR) else A)
+            definida_positiva = True
+        except ValueError:
+            definida_positiva = False
+
+    return {
+        "n": n,
+        "diagonal": inferior == 0 and superior == 0,
+        "triangular_inferior": superior == 0,
+        "triangular_superior": inferior == 0,
+        "ancho_inferior": inferior,
+        "ancho_superior": superior,
+        "tridiagonal": inferior <= 1 and superior <= 1,
+        "simetrica": simetrica,
+        "diagonal_dominante": es_diagonal_dominante(A),
+        "definida_positiva": definida_positiva,
+    }
+
+def elegir_nucleo(estructura):
+    """
+    Elige el método más barato válido para la estructura de analizar_estructura:
+    "diagonal", "triangular_inferior_bandas", "triangular_superior_bandas",
+    "triangular_inferior", "triangular_superior", "thomas", "lu_bandas",
+    "cholesky" o "lu_densa".
+    """
+    n = estructura["n"]
+    inferior, superior = estructura["ancho_inferior"], estructura["ancho_superior"]
+    # La banda solo compensa si es estrecha comparada con n
+    banda_estrecha = 4 * (inferior + superior) < n
+
+    if estructura["diagonal"]:
+        return "diagonal"
+    for lado in ("triangular_inferior", "triangular_superior"):
+        if estructura[lado]:
+            return lado + "_bandas" if banda_estrecha else lado
+    if estructura["tridiagonal"] and (estructura["diagonal_dominante"]
+                                      or estructura["definida_positiva"]):
+        return "thomas"
+    if banda_estrecha:
+        return "lu_bandas"
+    if estructura["simetrica"] and estructura["definida_positiva"] is not False:
+        return "cholesky"
+    return "lu_densa"
+
+def resolver_automatico(matriz, vector, tol=0.0):
+    """
+    Resuelve Ax = b con el método más barato según la estructura de A:
+    división por la diagonal, sustitución triangular (en banda, O(n·ancho)),
+    algoritmo de Thomas (tridiagonal, O(n)), LU en banda (O(n·ancho²)), Cholesky
+    (simétrica definida positiva) o eliminación de Gauss densa.
+    Con una matriz dispersa los métodos diagonal, triangulares, de Thomas y en
+    banda no pasan por una matriz densa.
+
+    Parámetros:
+    - matriz: Matriz de coeficientes (densa o dispersa, n x n)
+    - vector: Vector de términos independientes (tamaño n, o matriz n x k)
+    - tol: Los elementos con |valor| <= tol se consideran cero
+
+    Retorna:
+    - x: Solución del sistema
+    - nucleo: Nombre del método usado (ver elegir_nucleo)
+    """
+    A = como_csr(matriz)
+    if not isinstance(A, MatrizCSR):
+        A = np.asarray(A, dtype=float)
+    b = np.asarray(vector, dtype=float)
+    if A.shape[0] != b.shape[0]:
+        raise ValueError("Las dimensiones de la matriz y el vector no son compatibles.")
+
+    estructura = analizar_estructura(A, tol, comprobar_definida=False)
+    nucleo = elegir_nucleo(estructura)
+    inferior, superior = estructura["ancho_inferior"], estructura["ancho_superior"]
+
+    if nucleo == "diagonal":
+        diagonal = A.diagonal() if isinstance(A, MatrizCSR) else np.diag(A).astype(float)
+        if np.any(diagonal == 0):
+            raise ValueError("El sistema no tiene solución única (pivote cero).")
+        return (b.T / diagonal).T, nucleo
+
+    if nucleo == "thomas":
+        banda = a_bandas(A, 1, 1, tol)
+        return thomas(banda[:, 0], banda[:, 1], banda[:, 2], b), nucleo
+
+    if nucleo in ("triangular_inferior_bandas", "triangular_superior_bandas"):
+        banda = a_bandas(A, inferior, superior, tol)
+        return resolver_triangular_bandas(banda, b, inferior=superior == 0), nucleo
+
+    if nucleo == "lu_bandas":
+        U, multiplicadores, pivotes = factorizar_bandas(A, inferior, superior, tol)
+        return resolver_bandas(U, multiplicadores, pivotes, b), nucleo
+
+    if nucleo in ("triangular_inferior", "triangular_superior"):
+        if isinstance(A, MatrizCSR):
+            return resolver_triangular_dispersa(A, b, inferior=superior == 0), nucleo
+        return resolver_triangular(A, b, inferior=superior == 0), nucleo
+
+    densa = A.toarray() if isinstance(A, MatrizCSR) else A
+
+    if nucleo == "cholesky":
+        try:
+            return resolver_cholesky(cholesky(densa), b), nucleo
+        except ValueError:
+            nucleo = "lu_densa"
+
+    return gauss_eliminacion(densa, b), nucleo
@@ -0,0 +1,116 @@
+import ast
+from functools import lru_cache
+
+import numpy as np
+
+# Funciones que se pueden usar en las expresiones (también como np.sin, math.sin, ...)
+FUNCIONES = {
+    "sin": np.sin, "cos": np.cos, "tan": np.tan,
+    "asin": np.arcsin, "acos": np.arccos, "atan": np.arctan,
+    "arcsin": np.arcsin, "arccos": np.arccos, "arctan": np.arctan,
+    "sinh": np.sinh, "cosh": np.cosh, "tanh": np.tanh,
+    "exp": np.exp, "log": np.log, "log10": np.log10, "log2": np.log2,
+    "sqrt": np.sqrt, "abs": np.abs, "pow": np.power,
+}
+
+CONSTANTES = {"pi": np.pi, "e": np.e}
+
+MODULOS = ("np", "numpy", "math")
+
+OPERADORES = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.USub, ast.UAdd)
+
+class _Validador(ast.NodeTransformer):
+    """
+    Recorre el árbol de la expresión, rechaza todo lo que no esté en la lista blanca
+    y reescribe np.sin / math.sin como sin.
+    """
+
+    def __init__(self, variables):
+        self.variables = variables
+
+    def generic_visit(self, nodo):
+        if not isinstance(nodo, (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Load) + OPERADORES):
+            raise ValueError(f"Elemento no permitido en la expresión: {type(nodo).__name__}")
+        return super().generic_visit(nodo)
+
+    def visit_Constant(self, nodo):
+        if isinstance(nodo.value, bool) or not isinstance(nodo.value, (int, float)):
+            raise ValueError(f"Constante no permitida en la expresión: {nodo.value!r}")
+        return nodo
+
+    def visit_Name(self, nodo):
+        if nodo.id not in self.variables and nodo.id not in CONSTANTES:
+            raise ValueError(f"Nombre desconocido en la expresión: {nodo.id}")
+        return nodo
+
+    def visit_Call(self, nodo):
+        funcion = nodo.func
+        if (isinstance(funcion, ast.Attribute) and isinstance(funcion.value, ast.Name)
+                and funcion.value.id in MODULOS):
+            funcion = ast.Name(id=funcion.attr, ctx=ast.Load())
+        if not isinstance(funcion, ast.Name) or funcion.id not in FUNCIONES:
+            raise ValueError(f"Función no permitida en la expresión: {ast.unparse(nodo.func)}")
+        if nodo.keywords:
+            raise ValueError("Las funciones de la expresión no admiten argumentos con nombre.")
+        nodo.func = funcion
+        nodo.args = [self.visit(arg) for arg in nodo.args]
+        return nodo
+
+def normalizar_expresion(texto):
+    """
+    Normaliza el texto de una expresión para usarlo como clave de la caché.
+    """
+    return " ".join(texto.split())
+
+def analizar_expresion(texto, variables=("x",)):
+    """
+    Analiza una expresión y comprueba que solo usa números, las variables indicadas,
+    las constantes pi y e, operadores aritméticos y las funciones de FUNCIONES.
+
+    Retorna:
+    - Árbol sintáctico (ast.Expression) validado
+
+    Lanza ValueError si la expresión no es válida.
+    """
+    try:
+        arbol = ast.parse(texto.strip(), mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Error de sintaxis en la expresión: {e.msg}") from None
+    return _Validador(tuple(variables)).visit(arbol)
+
+@lru_cache(maxsize=512)
+def _compilar(texto, variables):
+    arbol = analizar_expresion(texto, variables)
+    argumentos = ast.arguments(posonlyargs=[], args=[ast.arg(arg=v) for v in variables],
+                               kwonlyargs=[], kw_defaults=[], defaults=[])
+    lambda_ = ast.Expression(body=ast.Lambda(args=argumentos, body=arbol.body))
+    codigo = compile(ast.fix_missing_locations(lambda_), "<expresion>", "eval")
+    funcion = eval(codigo, {"__builtins__": {}, **FUNCIONES, **CONSTANTES})
+
+    # Una expresión constante debe devolver un array si recibe arrays
+    usa_variables = any(isinstance(n, ast.Name) and n.id in variables for n in ast.walk(arbol))
+    if not usa_variables:
+        constante = funcion
+
+        def funcion(*args):
+            return np.zeros(np.broadcast_shapes(*[np.shape(a) for a in args])) + constante(*args)
+
+    return funcion
+
+def compilar_expresion(texto, variables=("x",)):
+    """
+    Compila una expresión matemática en una función de numpy vectorizada: acepta
+    escalares o arrays en cada variable y opera elemento a elemento.
+    El resultado se guarda en una caché indexada por el texto normalizado, así que
+    volver a compilar la misma expresión no repite el análisis.
+
+    Parámetros:
+    - texto: Expresión, por ejemplo "x**2 - 4" o "sin(x) * exp(-y)"
+    - variables: Nombres de las variables, en el orden de los argumentos
+
+    Retorna:
+    - Función de las variables que evalúa la expresión
+
+    Lanza ValueError si la expresión no es válida.
+    """
+    return _compilar(normalizar_expresion(texto), tuple(variables))
@@ -0,0 +1,216 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+def tam_panel_para_memoria(n, memoria_max):
+    """
+    Número de columnas de cada panel para que los paneles en memoria (el actual, el
+    que se está usando y el que se lee por adelantado, más uno de margen) no
+    superen memoria_max bytes.
+    """
+    return int(min(max(memoria_max // (4 * 8 * n), 1), n))
+
+def _leer_por_adelantado(hilo, leer, claves):
+    """
+    Genera leer(clave) para cada clave; mientras se trabaja con un resultado, el
+    hilo ya está leyendo el siguiente del disco.
+    """
+    claves = list(claves)
+    if not claves:
+        return
+    futuro = hilo.submit(leer, claves[0])
+    for siguiente in claves[1:]:
+        actual = futuro.result()
+        futuro = hilo.submit(leer, siguiente)
+        yield actual
+    yield futuro.result()
+
+def _factorizar_paneles(A, paneles, t, vector=None, escalonada=None):
+    """
+    Factorización PA = LU con pivoteo parcial por paneles de t columnas (variante
+    "left-looking"): cada panel se lee de A, se le aplican en orden los paneles ya
+    factorizados (leídos del disco de uno en uno) y se factoriza en memoria.
+
+    Los intercambios de filas se aplican de forma diferida: cada panel de L se
+    guarda tal como quedó al factorizarlo, sin aplicarle los intercambios de los
+    paneles siguientes, y los intercambios de un panel se aplican a los paneles
+    posteriores justo antes de usarlo. Así nunca hay que reescribir en el disco
+    paneles ya factorizados.
+
+    Parámetros:
+    - A: Matriz n x n (np.memmap o array), que solo se lee
+    - paneles: np.memmap (número de paneles, n, t) donde se guarda la factorización
+    - t: Número de columnas de cada panel
+    - vector: Si se indica, se le aplican en el sitio los intercambios y la
+      sustitución hacia adelante con L a medida que se factoriza (queda L⁻¹ P b)
+    - escalonada: Si se indica (memmap n x n a cero), se escribe en ella U, que es
+      una forma escalonada de A
+    """
+    n = A.shape[0]
+    num_paneles = paneles.shape[0]
+    pivotes = np.arange(n)
+
+    def leer_entrada(j):
+        j0, j1 = j * t, min((j + 1) * t, n)
+        C = np.zeros((n, t))
+        C[:, :j1 - j0] = A[:, j0:j1]
+        return C
+
+    def leer_panel(k):
+        return np.array(paneles[k])
+
+    with ThreadPoolExecutor(max_workers=1) as hilo:
+        for j, C in enumerate(_leer_por_adelantado(hilo, leer_entrada, range(num_paneles))):
+            j0, j1 = j * t, min((j + 1) * t, n)
+            ancho = j1 - j0
+
+            # Aplicar los paneles anteriores, leyendo el siguiente mientras se usa el actual
+            for k, L in enumerate(_leer_por_adelantado(hilo, leer_panel, range(j))):
+                k0, k1 = k * t, (k + 1) * t
+                for i in range(k0, k1):
+                    if pivotes[i] != i:
+                        C[[i, pivotes[i]]] = C[[pivotes[i], i]]
+                # Filas de U del bloque k: L_kk⁻¹ C (L_kk con diagonal unitaria)
+                for i in range(k0 + 1, k1):
+                    C[i] -= L[i, :i - k0] @ C[k0:i]
+                C[k1:] -= L[k1:] @ C[k0:k1]
+
+            # Factorizar el panel en memoria
+            for i in range(ancho):
+                fila = j0 + i
+                p = fila + np.argmax(np.abs(C[fila:, i]))
+                if C[p, i] == 0:
+                    raise ValueError("El sistema no tiene solución única (pivote cero).")
+                pivotes[fila] = p
+                if p != fila:
+                    C[[fila, p]] = C[[p, fila]]
+                C[fila + 1:, i] /= C[fila, i]
+                C[fila + 1:, i + 1:ancho] -= np.outer(C[fila + 1:, i], C[fila, i + 1:ancho])
+
+            paneles[j] = C
+
+            if vector is not None:
+                for i in range(j0, j1):
+                    if pivotes[i] != i:
+                        vector[[i, pivotes[i]]] = vector[[pivotes[i], i]]
+                for i in range(j0 + 1, j1):
+                    vector[i] -= C[i, :i - j0] @ vector[j0:i]
+                vector[j1:] -= C[j1:, :ancho] @ vector[j0:j1]
+
+            if escalonada is not None:
+                # Las filas de U hasta j1 de este panel ya no cambian
+                escalonada[:j1, j0:j1] = np.triu(C[:j1, :ancho], -j0)
+
+    paneles.flush()
+
+def _sustitucion_atras_paneles(paneles, t, y):
+    """
+    Resuelve U x = y en el sitio sobre y, leyendo U por paneles desde el último.
+    """
+    n = y.shape[0]
+    num_paneles = paneles.shape[0]
+
+    def leer_panel(j):
+        return np.array(paneles[j])
+
+    with ThreadPoolExecutor(max_workers=1) as hilo:
+        orden = range(num_paneles - 1, -1, -1)
+        for j, U in zip(orden, _leer_por_adelantado(hilo, leer_panel, orden)):
+            j0, j1 = j * t, min((j + 1) * t, n)
+            for i in range(j1 - 1, j0 - 1, -1):
+                y[i] = (y[i] - U[i, i - j0 + 1:j1 - j0] @ y[i + 1:j1]) / U[i, i - j0]
+            y[:j0] -= U[:j0, :j1 - j0] @ y[j0:j1]
+    return y
+
+def _abrir_paneles(n, t, ruta_trabajo, ruta_salida):
+    """
+    Crea el archivo de trabajo con los paneles. Cada panel se guarda contiguo, de
+    modo que leer o escribir uno es una sola lectura secuencial del disco.
+    """
+    if ruta_trabajo is None:
+        directorio = os.path.dirname(os.path.abspath(ruta_salida))
+        descriptor, ruta_trabajo = tempfile.mkstemp(suffix=".paneles", dir=directorio)
+        os.close(descriptor)
+    num_paneles = -(-n // t)
+    return ruta_trabajo, np.memmap(ruta_trabajo, dtype=float, mode="w+", shape=(num_paneles, n, t))
+
+def _comprobar_matriz(matriz):
+    if matriz.ndim != 2 or matriz.shape[0] != matriz.shape[1]:
+        raise ValueError("La matriz debe ser cuadrada.")
+
+def gauss_fuera_de_memoria(matriz, vector, ruta_salida, tam_panel=None,
+                           memoria_max=256 * 1024 * 1024, ruta_trabajo=None):
+    """
+    Resuelve Ax = b con eliminación de Gauss con pivoteo parcial sin cargar la
+    matriz entera en memoria: la matriz (normalmente un np.memmap, como los que
+    retorna matriz.cargar_matriz) se procesa por paneles de columnas y solo hay
+    unos pocos paneles en memoria a la vez. La factorización se guarda en un
+    archivo de trabajo temporal del mismo tamaño que la matriz.
+
+    Parámetros:
+    - matriz: Matriz de coeficientes n x n (np.memmap o array)
+    - vector: Vector de términos independientes (tamaño n)
+    - ruta_salida: Archivo .npy donde se guarda la solución
+    - tam_panel: Columnas de cada panel (por defecto, según memoria_max)
+    - memoria_max: Memoria aproximada en bytes para los paneles
+    - ruta_trabajo: Archivo de trabajo (por defecto, uno temporal junto a
+      ruta_salida que se borra al terminar)
+
+    Retorna:
+    - La solución x como np.memmap de ruta_salida
+    """
+    _comprobar_matriz(matriz)
+    n = matriz.shape[0]
+    b = np.array(vector, dtype=float)
+    if b.shape != (n,):
+        raise ValueError("Las dimensiones de la matriz y el vector no son compatibles.")
+
+    t = tam_panel or tam_panel_para_memoria(n, memoria_max)
+    temporal = ruta_trabajo is None
+    ruta_trabajo, paneles = _abrir_paneles(n, t, ruta_trabajo, ruta_salida)
+    try:
+        _factorizar_paneles(matriz, paneles, t, vector=b)
+        _sustitucion_atras_paneles(paneles, t, b)
+    finally:
+        del paneles
+        if temporal:
+            os.remove(ruta_trabajo)
+
+    solucion = np.lib.format.open_memmap(ruta_salida, mode="w+", dtype=float, shape=(n,))
+    solucion[:] = b
+    solucion.flush()
+    return solucion
+
+def forma_escalonada_fuera_de_memoria(matriz, ruta_salida, tam_panel=None,
+                                      memoria_max=256 * 1024 * 1024, ruta_trabajo=None):
+    """
+    Calcula una forma escalonada de la matriz (la U de PA = LU, con pivoteo
+    parcial) sin cargarla entera en memoria, y la escribe en el disco a medida
+    que se obtiene cada panel.
+
+    Parámetros:
+    - matriz: Matriz n x n (np.memmap o array)
+    - ruta_salida: Archivo .npy donde se guarda la forma escalonada
+    - tam_panel, memoria_max, ruta_trabajo: Como en gauss_fuera_de_memoria
+
+    Retorna:
+    - La forma escalonada como np.memmap de ruta_salida
+    """
+    _comprobar_matriz(matriz)
+    n = matriz.shape[0]
+
+    t = tam_panel or tam_panel_para_memoria(n, memoria_max)
+    escalonada = np.lib.format.open_memmap(ruta_salida, mode="w+", dtype=float, shape=(n, n))
+    temporal = ruta_trabajo is None
+    ruta_trabajo, paneles = _abrir_paneles(n, t, ruta_trabajo, ruta_salida)
+    try:
+        _factorizar_paneles(matriz, paneles, t, escalonada=escalonada)
+    finally:
+        del paneles
+        if temporal:
+            os.remove(ruta_trabajo)
+
+    escalonada.flush()
+    return escalonada
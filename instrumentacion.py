@@ -0,0 +1,148 @@
+import json
+import time
+
+class Traza:
+    """
+    Registro de la ejecución de los métodos numéricos.
+    Se pasa a un método con el argumento traza=... y recibe, en cada iteración, el
+    número de iteración, el residuo, la norma del paso y el tiempo transcurrido, además
+    de contadores como evaluaciones de funciones, evaluaciones del Jacobiano o una
+    estimación de las operaciones en coma flotante (flops).
+
+    Una misma traza puede acompañar varias ejecuciones seguidas; cada una queda
+    registrada por separado en el perfil.
+
+    Parámetros:
+    - callback: Función opcional callback(metodo, registro) que se llama en cada
+      iteración con un diccionario {iteracion, residuo, paso, tiempo}
+    - guardar_iteraciones: Si es False solo se guardan los contadores y los tiempos
+    """
+
+    activa = True
+
+    def __init__(self, callback=None, guardar_iteraciones=True):
+        self.callback = callback
+        self.guardar_iteraciones = guardar_iteraciones
+        self.ejecuciones = []
+        self._actual = None
+        self._inicio = 0.0
+
+    def iniciar(self, metodo, n=None):
+        """
+        Empieza el registro de una nueva ejecución del método indicado.
+        """
+        self._actual = {"metodo": metodo, "n": n, "iteraciones": [], "contadores": {},
+                        "convergido": None, "num_iteraciones": 0, "tiempo_total": 0.0}
+        self.ejecuciones.append(self._actual)
+        self._inicio = time.perf_counter()
+        return self
+
+    def iteracion(self, iteracion, residuo=None, paso=None):
+        """
+        Registra una iteración y avisa al callback.
+        """
+        registro = {
+            "iteracion": iteracion,
+            "residuo": None if residuo is None else float(residuo),
+            "paso": None if paso is None else float(paso),
+            "tiempo": time.perf_counter() - self._inicio,
+        }
+        self._actual["num_iteraciones"] = iteracion
+        if self.guardar_iteraciones:
+            self._actual["iteraciones"].append(registro)
+        if self.callback is not None:
+            self.callback(self._actual["metodo"], registro)
+
+    def contar(self, nombre, cantidad=1):
+        """
+        Suma cantidad al contador nombre de la ejecución actual.
+        """
+        contadores = self._actual["contadores"]
+        contadores[nombre] = contadores.get(nombre, 0) + int(cantidad)
+
+    def finalizar(self, convergido):
+        """
+        Cierra la ejecución actual anotando si ha convergido y su tiempo total.
+        """
+        self._actual["convergido"] = bool(convergido)
+        self._actual["tiempo_total"] = time.perf_counter() - self._inicio
+
+    def perfil(self):
+        """
+        Retorna el perfil de todas las ejecuciones registradas.
+
+        Retorna:
+        - Diccionario con la lista de ejecuciones y los totales por método
+          (ejecuciones, tiempo, iteraciones y suma de cada contador)
+        """
+        totales = {}
+        for ejecucion in self.ejecuciones:
+            total = totales.setdefault(ejecucion["metodo"], {
+                "ejecuciones": 0, "tiempo_total": 0.0, "iteraciones": 0, "contadores": {}})
+            total["ejecuciones"] += 1
+            total["tiempo_total"] += ejecucion["tiempo_total"]
+            total["iteraciones"] += ejecucion["num_iteraciones"]
+            for nombre, valor in ejecucion["contadores"].items():
+                total["contadores"][nombre] = total["contadores"].get(nombre, 0) + valor
+        return {"ejecuciones": self.ejecuciones, "totales": totales}
+
+    def exportar(self, ruta):
+        """
+        Guarda el perfil en un archivo JSON.
+        """
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(self.perfil(), f, indent=2)
+
+    def mostrar_resumen(self):
+        """
+        Muestra por pantalla los totales del perfil.
+        """
+        print("\n--- PERFIL DE EJECUCIÓN ---")
+        for metodo, total in self.perfil()["totales"].items():
+            print(f"{metodo}: {total['ejecuciones']} ejecución(es), "
+                  f"{total['iteraciones']} iteraciones, {total['tiempo_total'] * 1e3:.3f} ms")
+            for nombre, valor in total["contadores"].items():
+                print(f"  {nombre}: {valor}")
+
+class _TrazaNula:
+    """
+    Traza que no registra nada. La usan los métodos cuando no se pasa ninguna, para
+    no tener que comprobar en cada iteración si hay traza.
+    """
+
+    activa = False
+
+    def iteracion(self, iteracion, residuo=None, paso=None):
+        pass
+
+    def contar(self, nombre, cantidad=1):
+        pass
+
+    def finalizar(self, convergido):
+        pass
+
+TRAZA_NULA = _TrazaNula()
+
+def iniciar_traza(traza, metodo, n=None):
+    """
+    Empieza una ejecución en la traza indicada, o retorna una traza nula si es None.
+    Los cálculos que solo sirven para la traza (como un residuo adicional) deben
+    hacerse únicamente si traza.activa es True.
+    """
+    if traza is None:
+        return TRAZA_NULA
+    return traza.iniciar(metodo, n)
+
+def cerrar_traza(traza, convergido):
+    """
+    Cierra la ejecución actual de la traza, si se ha pasado alguna.
+    """
+    if traza is not None:
+        traza.finalizar(convergido)
+
+def elementos(A):
+    """
+    Número de elementos guardados de una matriz (nnz si es dispersa), que es lo que
+    cuesta un producto matriz-vector.
+    """
+    return A.nnz if hasattr(A, "nnz") else A.shape[0] * A.shape[1]
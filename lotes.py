@@ -0,0 +1,253 @@
+import importlib
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from instrumentacion import Traza
+
+# Métodos iterativos disponibles en los trabajos: módulo, función y parámetros
+# opcionales propios. Los módulos se importan al usarse por primera vez, así que
+# cada proceso solo carga los que necesitan sus trabajos.
+METODOS_ITERATIVOS = {
+    "jacobi": ("metodos_iterativos", "jacobi", ()),
+    "gauss_seidel": ("metodos_iterativos", "gauss_seidel", ()),
+    "sor": ("metodos_iterativos", "sor", ("omega", "ordenacion")),
+    "gauss_seidel_rojo_negro": ("metodos_iterativos", "gauss_seidel_rojo_negro", ()),
+    "jacobi_bloques": ("metodos_iterativos", "jacobi_bloques", ("tam_bloque", "hilos")),
+    "gradiente_conjugado": ("metodos_krylov", "gradiente_conjugado", ("precondicionador",)),
+    "gmres": ("metodos_krylov", "gmres", ("precondicionador", "reinicio")),
+    "bicgstab": ("metodos_krylov", "bicgstab", ("precondicionador",)),
+}
+
+# Soluciones anteriores de este proceso, para los trabajos con "reutilizar": true
+_contexto = None
+
+def _importar(modulo, nombre):
+    """
+    Retorna la función nombre del módulo indicado, importándolo si hace falta.
+    """
+    return getattr(importlib.import_module(modulo), nombre)
+
+def _a_json(valor):
+    """
+    Convierte arrays y escalares de numpy en tipos que se pueden escribir en JSON.
+    """
+    if isinstance(valor, np.ndarray):
+        return valor.tolist()
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, (list, tuple)):
+        return [_a_json(v) for v in valor]
+    return valor
+
+def _leer_matriz_trabajo(trabajo, densa=True):
+    """
+    Obtiene la matriz de un trabajo, escrita en "matriz" o en el archivo "archivo".
+    Con densa=False un .mtx en coordenadas se mantiene como MatrizCSR.
+    """
+    if "archivo" in trabajo:
+        from matriz import cargar_matriz
+        matriz = cargar_matriz(trabajo["archivo"], densa)
+        if matriz is None:
+            raise ValueError(f"No se pudo cargar la matriz de {trabajo['archivo']}")
+        return matriz
+    return np.array(trabajo["matriz"], dtype=float)
+
+def _resolver_fuera_de_memoria(trabajo):
+    """
+    Ejecuta un trabajo "gauss" o "forma_escalonada" con "salida": la matriz se
+    procesa por paneles sin cargarla entera y el resultado se escribe en el
+    archivo .npy de "salida", cuya ruta es el resultado del trabajo.
+    """
+    from fuera_de_memoria import gauss_fuera_de_memoria, forma_escalonada_fuera_de_memoria
+
+    matriz = _leer_matriz_trabajo(trabajo)
+    opciones = {k: trabajo[k] for k in ("tam_panel", "memoria_max") if k in trabajo}
+    if trabajo["operacion"] == "gauss":
+        gauss_fuera_de_memoria(matriz, np.array(trabajo["vector"], dtype=float),
+                               trabajo["salida"], **opciones)
+    else:
+        forma_escalonada_fuera_de_memoria(matriz, trabajo["salida"], **opciones)
+    return {"resultado": trabajo["salida"]}
+
+def _resolver(trabajo, traza=None):
+    """
+    Ejecuta la operación de un trabajo y retorna un diccionario con sus resultados.
+    Los métodos iterativos y de Newton registran sus iteraciones en traza, si se indica.
+    """
+    operacion = trabajo["operacion"]
+    tol = trabajo.get("tol", 1e-6)
+    max_iter = trabajo.get("max_iter", 100)
+
+    if operacion in ("gauss", "forma_escalonada", "determinante", "inversa"):
+        from metodos_directos import (
+            gauss_eliminacion,
+            gauss_eliminacion_solo_matriz,
+            calcular_determinante,
+            calcular_inversa,
+        )
+    elif operacion in ("newton_1var", "newton_sistema", "broyden"):
+        from metodos_no_lineales import crear_funcion, crear_sistema
+        from metodos_no_lineales import newton_raphson_1var, newton_raphson_sistema, broyden_sistema
+
+    if operacion in ("gauss", "forma_escalonada") and "salida" in trabajo:
+        return _resolver_fuera_de_memoria(trabajo)
+
+    if operacion == "gauss":
+        matriz = _leer_matriz_trabajo(trabajo)
+        return {"resultado": gauss_eliminacion(matriz, np.array(trabajo["vector"], dtype=float),
+                                               precision=trabajo.get("precision", "doble"))}
+
+    if operacion == "automatico":
+        from estructura import resolver_automatico
+        x, nucleo = resolver_automatico(_leer_matriz_trabajo(trabajo, densa=False),
+                                        np.array(trabajo["vector"], dtype=float))
+        return {"resultado": x, "nucleo": nucleo}
+
+    if operacion == "forma_escalonada":
+        return {"resultado": gauss_eliminacion_solo_matriz(_leer_matriz_trabajo(trabajo))}
+
+    if operacion == "determinante":
+        return {"resultado": calcular_determinante(_leer_matriz_trabajo(trabajo))}
+
+    if operacion == "inversa":
+        inversa = calcular_inversa(_leer_matriz_trabajo(trabajo))
+        if inversa is None:
+            raise ValueError("La matriz no es invertible.")
+        return {"resultado": inversa}
+
+    if operacion in METODOS_ITERATIVOS:
+        modulo, nombre, opciones = METODOS_ITERATIVOS[operacion]
+        metodo = _importar(modulo, nombre)
+        matriz = _leer_matriz_trabajo(trabajo, densa=False)
+        x0 = trabajo.get("x0")
+        if x0 is not None:
+            x0 = np.array(x0, dtype=float)
+        extra = {k: trabajo[k] for k in opciones if k in trabajo}
+        vector = np.array(trabajo["vector"], dtype=float)
+        if x0 is None and trabajo.get("reutilizar", False):
+            global _contexto
+            if _contexto is None:
+                _contexto = _importar("metodos_iterativos", "ContextoSolucion")()
+            x, iteraciones, errores = _contexto.resolver(metodo, matriz, vector, tol, max_iter,
+                                                         traza=traza, **extra)
+        else:
+            x, iteraciones, errores = metodo(matriz, vector, x0, tol, max_iter, traza=traza, **extra)
+        return {"resultado": x, "iteraciones": iteraciones, "errores": errores}
+
+    if operacion == "newton_1var":
+        f = crear_funcion(trabajo["expresion"])
+        if f is None:
+            raise ValueError(f"Expresión no válida: {trabajo['expresion']}")
+        raiz, iteraciones, x_hist, errores = newton_raphson_1var(f, None, float(trabajo["x0"]),
+                                                                  tol, max_iter, traza=traza)
+        return {"resultado": raiz, "iteraciones": iteraciones, "errores": errores}
+
+    if operacion == "newton_sistema":
+        F, J = crear_sistema(trabajo["expresiones"])
+        if F is None:
+            raise ValueError("Expresiones del sistema no válidas.")
+        sol, iteraciones, sol_hist, errores = newton_raphson_sistema(F, J, trabajo["x0"],
+                                                                     tol, max_iter, traza=traza)
+        return {"resultado": sol, "iteraciones": iteraciones, "errores": errores}
+
+    if operacion == "broyden":
+        F, J = crear_sistema(trabajo["expresiones"])
+        if F is None:
+            raise ValueError("Expresiones del sistema no válidas.")
+        sol, iteraciones, sol_hist, errores = broyden_sistema(
+            F, J, trabajo["x0"], tol, max_iter, variante=trabajo.get("variante", "buena"),
+            traza=traza)
+        return {"resultado": sol, "iteraciones": iteraciones, "errores": errores}
+
+    raise ValueError(f"Operación desconocida: {operacion}")
+
+def ejecutar_trabajo(trabajo):
+    """
+    Ejecuta un trabajo del lote y retorna su registro de resultado.
+    Los errores no se propagan: quedan anotados en el registro.
+
+    Parámetros:
+    - trabajo: Diccionario con "operacion" y sus datos (y opcionalmente "id"; con
+      "perfil": true se añade al registro el perfil de ejecución de instrumentacion.Traza)
+
+    Retorna:
+    - Diccionario con id, operacion, ok, tiempo (segundos) y resultado o error
+    """
+    registro = {"id": trabajo.get("id"), "operacion": trabajo.get("operacion")}
+    traza = Traza() if trabajo.get("perfil") else None
+    inicio = time.perf_counter()
+    try:
+        salida = _resolver(trabajo, traza)
+        registro["ok"] = True
+        registro.update({clave: _a_json(valor) for clave, valor in salida.items()})
+    except Exception as e:
+        registro["ok"] = False
+        registro["error"] = f"{type(e).__name__}: {e}"
+    registro["tiempo"] = time.perf_counter() - inicio
+    if traza is not None:
+        registro["perfil"] = traza.perfil()
+    return registro
+
+def leer_trabajos(ruta):
+    """
+    Lee un archivo JSONL con un trabajo por línea. Las líneas vacías se ignoran.
+    Si una línea no es JSON válido o no es un objeto se retorna un registro de
+    error en su lugar.
+    """
+    with open(ruta, encoding="utf-8") as f:
+        for numero, linea in enumerate(f, start=1):
+            if not linea.strip():
+                continue
+            try:
+                trabajo = json.loads(linea)
+            except json.JSONDecodeError as e:
+                yield {"id": f"linea-{numero}", "invalido": f"JSON no válido: {e}"}
+                continue
+            if not isinstance(trabajo, dict):
+                yield {"id": f"linea-{numero}", "invalido": "El trabajo debe ser un objeto JSON."}
+                continue
+            trabajo.setdefault("id", f"linea-{numero}")
+            yield trabajo
+
+def ejecutar_lote(ruta_entrada, ruta_salida, procesos=None):
+    """
+    Ejecuta todos los trabajos de un archivo JSONL en un grupo de procesos y escribe
+    cada resultado en ruta_salida (JSONL) en cuanto termina.
+
+    Parámetros:
+    - ruta_entrada: Archivo JSONL con los trabajos
+    - ruta_salida: Archivo JSONL donde se escriben los resultados
+    - procesos: Número de procesos (None para usar todos los núcleos)
+
+    Retorna:
+    - Diccionario con el número de trabajos correctos y con error, y el tiempo total
+    """
+    inicio = time.perf_counter()
+    correctos = fallidos = 0
+
+    with open(ruta_salida, "w", encoding="utf-8") as salida, \
+            ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        pendientes = []
+        for trabajo in leer_trabajos(ruta_entrada):
+            if "invalido" in trabajo:
+                registro = {"id": trabajo["id"], "operacion": None, "ok": False,
+                            "error": trabajo["invalido"], "tiempo": 0.0}
+                salida.write(json.dumps(registro) + "\n")
+                fallidos += 1
+                continue
+            pendientes.append(ejecutor.submit(ejecutar_trabajo, trabajo))
+
+        for futuro in as_completed(pendientes):
+            registro = futuro.result()
+            salida.write(json.dumps(registro) + "\n")
+            salida.flush()
+            if registro["ok"]:
+                correctos += 1
+            else:
+                fallidos += 1
+
+    return {"correctos": correctos, "fallidos": fallidos,
+            "tiempo_total": time.perf_counter() - inicio}
@@ -1,24 +1,7 @@
-from matriz import leer_matriz
-from metodos_directos import (
-    calcular_determinante,
-    inversa_2x2,
-    transpuesta_manual,
-    sumar_matrices,
-    restar_matrices,
-    multiplicar_matrices,
-    intercambiar_filas,
-    multiplicar_fila_por_escalar,
-    operar_filas,
-    gauss_eliminacion,  # Importamos la función de Gauss
-    gauss_eliminacion_solo_matriz  # Importamos la función para forma escalonada
-)
-from metodos_iterativos import resolver_sistema_iterativo, mostrar_resultados_iterativos
-from metodos_no_lineales import (
-    resolver_ecuacion_no_lineal, 
-    mostrar_resultados_newton_1var,
-    resolver_sistema_no_lineal,
-    mostrar_resultados_newton_sistema
-)
+import argparse
+
+# Los módulos de cálculo (y numpy) se importan dentro de cada opción del menú, la
+# primera vez que se usan, para que el programa arranque rápido.
 
 def mostrar_menu_principal():
     print("\n=== MENÚ PRINCIPAL ===")
@@ -28,12 +11,13 @@ def mostrar_menu_principal():
     print("4. Resolver sistema no lineal (Newton-Raphson)")
     print("5. Resolver sistema lineal con eliminación de Gauss")  # Nueva opción
     print("6. Transformar matriz en forma escalonada con eliminación de Gauss")  # Nueva opción
+    print("7. Buscar todas las raíces de una ecuación en un intervalo (Newton multiarranque)")
     print("0. Salir")
 
 def mostrar_menu_metodos_directos():
     print("\n--- MENÚ DE OPERACIONES DIRECTAS ---")
     print("1. Calcular determinante")
-    print("2. Calcular inversa (solo 2x2)")
+    print("2. Calcular inversa")
     print("3. Transpuesta")
     print("4. Sumar otra matriz")
     print("5. Restar otra matriz")
@@ -44,6 +28,19 @@ def mostrar_menu_metodos_directos():
     print("0. Volver al menú principal")
 
 def metodos_directos_menu():
+    from matriz import leer_matriz
+    from metodos_directos import (
+        calcular_determinante,
+        calcular_inversa,
+        transpuesta_manual,
+        sumar_matrices,
+        restar_matrices,
+        multiplicar_matrices,
+        intercambiar_filas,
+        multiplicar_fila_por_escalar,
+        operar_filas,
+    )
+
     matriz = leer_matriz()
     if matriz is None:
         return
@@ -56,12 +53,9 @@ def metodos_directos_menu():
             print("Determinante:", calcular_determinante(matriz))
 
         elif opcion == "2":
-            if matriz.shape != (2, 2):
-                print("Solo se puede calcular la inversa de una matriz 2x2.")
-            else:
-                inversa = inversa_2x2(matriz)
-                if inversa is not None:
-                    print("Inversa:\n", inversa)
+            inversa = calcular_inversa(matriz)
+            if inversa is not None:
+                print("Inversa:\n", inversa)
 
         elif opcion == "3":
             print("Transpuesta:\n", transpuesta_manual(matriz))
@@ -119,11 +113,13 @@ def main():
             
         elif opcion == "2":
             # Resolver sistema con métodos iterativos
+            from metodos_iterativos import resolver_sistema_iterativo, mostrar_resultados_iterativos
             x, iteraciones, errores = resolver_sistema_iterativo()
             mostrar_resultados_iterativos(x, iteraciones, errores)
             
         elif opcion == "3":
             # Resolver ecuación no lineal con Newton-Raphson
+            from metodos_no_lineales import resolver_ecuacion_no_lineal, mostrar_resultados_newton_1var
             resultados = resolver_ecuacion_no_lineal()
             if resultados[0] is not None:
                 raiz, iteraciones, x_hist, errores, expr_f = resultados
@@ -131,6 +127,7 @@ def main():
             
         elif opcion == "4":
             # Resolver sistema no lineal con Newton-Raphson
+            from metodos_no_lineales import resolver_sistema_no_lineal, mostrar_resultados_newton_sistema
             resultados = resolver_sistema_no_lineal()
             if resultados[0] is not None:
                 sol, iteraciones, sol_hist, errores, expr_F = resultados
@@ -138,6 +135,9 @@ def main():
         
         elif opcion == "5":
             # Resolver sistema lineal con eliminación de Gauss
+            import numpy as np
+            from matriz import leer_matriz
+            from metodos_directos import gauss_eliminacion
             print("Introduce la matriz de coeficientes:")
             matriz = leer_matriz()
             if matriz is None:
@@ -158,6 +158,8 @@ def main():
         
         elif opcion == "6":
             # Transformar matriz en forma escalonada con eliminación de Gauss
+            from matriz import leer_matriz
+            from metodos_directos import gauss_eliminacion_solo_matriz
             print("Introduce la matriz de coeficientes:")
             matriz = leer_matriz()
             if matriz is None:
@@ -170,11 +172,43 @@ def main():
             except ValueError as e:
                 print("Error:", e)
             
+        elif opcion == "7":
+            # Buscar todas las raíces con Newton-Raphson desde muchos puntos iniciales
+            from metodos_no_lineales import buscar_raices_intervalo, mostrar_raices
+            raices, expr_f = buscar_raices_intervalo()
+            mostrar_raices(raices, expr_f)
+            
         elif opcion == "0":
             print("Saliendo del programa.")
             break
         else:
             print("Opción no válida.")
 
+def procesar_argumentos(argumentos=None):
+    parser = argparse.ArgumentParser(description="Programa de Métodos Numéricos")
+    parser.add_argument("--lote", metavar="TRABAJOS.jsonl",
+                        help="Ejecuta sin menú los trabajos de un archivo JSONL")
+    parser.add_argument("--salida", metavar="RESULTADOS.jsonl", default="resultados.jsonl",
+                        help="Archivo JSONL donde se escriben los resultados del lote")
+    parser.add_argument("--procesos", type=int, default=None,
+                        help="Número de procesos para el lote o el servicio (por defecto, todos los núcleos)")
+    parser.add_argument("--servicio", action="store_true",
+                        help="Arranca el servicio local de resolución (líneas JSON)")
+    parser.add_argument("--puerto", type=int, default=8765,
+                        help="Puerto TCP del servicio en 127.0.0.1")
+    parser.add_argument("--socket", metavar="RUTA", default=None,
+                        help="Escucha en un socket Unix en lugar de TCP")
+    return parser.parse_args(argumentos)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = procesar_argumentos()
+    if args.lote:
+        from lotes import ejecutar_lote
+        resumen = ejecutar_lote(args.lote, args.salida, args.procesos)
+        print(f"Lote terminado: {resumen['correctos']} correctos, {resumen['fallidos']} con error "
+              f"en {resumen['tiempo_total']:.2f} s. Resultados en {args.salida}")
+    elif args.servicio:
+        from servicio import ejecutar_servicio
+        ejecutar_servicio(puerto=args.puerto, ruta_socket=args.socket, procesos=args.procesos)
+    else:
+        main()
\ No newline at end of file
@@ -1,15 +1,30 @@
+import os
+import struct
 import numpy as np
+from matriz_dispersa import MatrizCSR
 
-def leer_matriz():
+# Cabecera de los archivos binarios: identificador, tipo de dato y dimensiones
+CABECERA_BINARIA = struct.Struct("<4s4sQQ")
+IDENTIFICADOR_BINARIO = b"MATB"
+
+def leer_matriz(densa=True):
+    """
+    Lee una matriz por teclado, o de un archivo si se escribe su ruta en la primera fila.
+    Con densa=False una matriz dispersa (.mtx en coordenadas) se devuelve como
+    MatrizCSR; si no, se convierte en un array denso.
+    """
     print("INSTRUCCIONES:")
     print("Introduce una matriz cuadrada de 2x2, 3x3 o 4x4 o superior.")
     print("Introduce los elementos de la matriz fila por fila, separados por espacios.")
     print("Pulsa Enter después de cada fila. La entrada finalizará automáticamente cuando completes las filas necesarias.")
+    print("También puedes escribir en la primera fila la ruta de un archivo .npy, .mtx o binario.")
 
     filas = []
     while True:
         try:
             entrada = input(f"Fila {len(filas) + 1}: ")
+            if not filas and os.path.isfile(entrada.strip()):
+                return cargar_matriz(entrada.strip(), densa)
             fila = list(map(float, entrada.strip().split()))
             filas.append(fila)
 
@@ -28,15 +43,153 @@ def leer_matriz():
         print("Error al crear la matriz:", e)
         return None
 
-    if matriz.shape[0] != matriz.shape[1]:
-        print("Error: La matriz no es cuadrada.")
+    if not validar_matriz(matriz):
         return None
 
+    print(f"Matriz {matriz.shape[0]}x{matriz.shape[1]} recibida correctamente:")
+    print(matriz)
+
+    return matriz
+
+def validar_matriz(matriz):
+    """
+    Comprueba que la matriz sea cuadrada y de un tamaño soportado.
+    Muestra el motivo si no lo es.
+    """
+    if len(matriz.shape) != 2 or matriz.shape[0] != matriz.shape[1]:
+        print("Error: La matriz no es cuadrada.")
+        return False
+
     if matriz.shape[0] not in (2, 3) and matriz.shape[0] < 4:
         print(f"Matriz de {matriz.shape[0]}x{matriz.shape[1]} no soportada actualmente.")
+        return False
+
+    return True
+
+def cargar_matriz_npy(ruta):
+    """
+    Carga una matriz de un archivo .npy proyectado en memoria (solo lectura).
+    Los datos se leen del disco a medida que se usan.
+    """
+    return np.load(ruta, mmap_mode="r")
+
+def guardar_matriz_binaria(ruta, matriz):
+    """
+    Guarda una matriz densa en formato binario: cabecera seguida de los valores
+    fila por fila en little-endian.
+    """
+    A = np.asarray(matriz)
+    tipo = A.dtype.newbyteorder("<")
+    codigo = tipo.str[1:].encode().ljust(4, b"\0")
+    with open(ruta, "wb") as f:
+        f.write(CABECERA_BINARIA.pack(IDENTIFICADOR_BINARIO, codigo, A.shape[0], A.shape[1]))
+        f.write(np.ascontiguousarray(A, dtype=tipo).tobytes())
+
+def cargar_matriz_binaria(ruta):
+    """
+    Carga una matriz en formato binario con cabecera como np.memmap de solo lectura.
+
+    Formato:
+    - 4 bytes: identificador b"MATB"
+    - 4 bytes: tipo de dato de numpy (por ejemplo b"f8"), completado con ceros
+    - 8 bytes: número de filas (entero sin signo, little-endian)
+    - 8 bytes: número de columnas (entero sin signo, little-endian)
+    - Valores de la matriz fila por fila en little-endian
+    """
+    with open(ruta, "rb") as f:
+        cabecera = f.read(CABECERA_BINARIA.size)
+    if len(cabecera) < CABECERA_BINARIA.size:
+        raise ValueError("El archivo es demasiado corto para contener la cabecera.")
+
+    identificador, codigo, filas, columnas = CABECERA_BINARIA.unpack(cabecera)
+    if identificador != IDENTIFICADOR_BINARIO:
+        raise ValueError("El archivo no tiene el formato binario de matrices.")
+
+    tipo = np.dtype("<" + codigo.rstrip(b"\0").decode())
+    return np.memmap(ruta, dtype=tipo, mode="r", offset=CABECERA_BINARIA.size,
+                     shape=(filas, columnas))
+
+def cargar_matriz_market(ruta):
+    """
+    Carga una matriz en formato Matrix Market (.mtx).
+    El formato de coordenadas se devuelve como MatrizCSR, sin pasar por una matriz
+    densa; el formato array se devuelve como numpy array.
+    """
+    with open(ruta) as f:
+        cabecera = f.readline().lower().split()
+        if len(cabecera) < 5 or cabecera[0] != "%%matrixmarket" or cabecera[1] != "matrix":
+            raise ValueError("El archivo no tiene una cabecera Matrix Market válida.")
+        formato, campo, simetria = cabecera[2], cabecera[3], cabecera[4]
+        if campo not in ("real", "integer", "pattern"):
+            raise ValueError(f"Tipo de dato Matrix Market no soportado: {campo}")
+
+        linea = f.readline()
+        while linea.startswith("%") or not linea.strip():
+            linea = f.readline()
+        tamanos = [int(v) for v in linea.split()]
+        if formato == "coordinate" and tamanos[2] == 0:
+            # Matriz nula: no hay ninguna línea de valores que leer
+            valores = np.zeros((0, 3))
+        elif formato == "coordinate":
+            valores = np.loadtxt(f, ndmin=2)
+        else:
+            valores = np.loadtxt(f, ndmin=1)
+
+    if formato == "array":
+        filas, columnas = tamanos[:2]
+        if simetria == "general":
+            return valores.reshape(columnas, filas).T.copy()
+        # En simétricas solo se guarda el triángulo inferior por columnas (sin la
+        # diagonal en las antisimétricas, que es cero)
+        A = np.zeros((filas, columnas))
+        if simetria == "skew-symmetric":
+            A[np.triu_indices(filas, 1)[::-1]] = valores
+            return A - np.tril(A, -1).T
+        A[np.triu_indices(filas)[::-1]] = valores
+        return A + np.tril(A, -1).T
+
+    filas, columnas, _ = tamanos
+    if valores.shape[1] < (2 if campo == "pattern" else 3):
+        raise ValueError("Faltan columnas en los valores del archivo Matrix Market.")
+    i = valores[:, 0].astype(np.int64) - 1
+    j = valores[:, 1].astype(np.int64) - 1
+    v = np.ones(i.shape[0]) if campo == "pattern" else valores[:, 2]
+
+    if simetria in ("symmetric", "skew-symmetric"):
+        fuera = i != j
+        signo = -1.0 if simetria == "skew-symmetric" else 1.0
+        i, j, v = (np.concatenate([i, j[fuera]]), np.concatenate([j, i[fuera]]),
+                   np.concatenate([v, signo * v[fuera]]))
+
+    return MatrizCSR.desde_coordenadas(i, j, v, (filas, columnas))
+
+def cargar_matriz(ruta, densa=True):
+    """
+    Carga una matriz de un archivo según su extensión (.npy, .mtx o binario) y
+    aplica las mismas comprobaciones que leer_matriz.
+    Los métodos directos necesitan una matriz densa; solo los iterativos y de
+    Krylov aceptan la MatrizCSR de un .mtx en coordenadas (densa=False).
+
+    Retorna:
+    - La matriz (np.memmap, numpy array o MatrizCSR), o None si hay un error
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    try:
+        if extension == ".npy":
+            matriz = cargar_matriz_npy(ruta)
+        elif extension == ".mtx":
+            matriz = cargar_matriz_market(ruta)
+        else:
+            matriz = cargar_matriz_binaria(ruta)
+    except (OSError, ValueError) as e:
+        print("Error al cargar la matriz:", e)
         return None
 
-    print(f"Matriz {matriz.shape[0]}x{matriz.shape[1]} recibida correctamente:")
-    print(matriz)
+    if not validar_matriz(matriz):
+        return None
+
+    if densa and isinstance(matriz, MatrizCSR):
+        matriz = matriz.toarray()
 
+    print(f"Matriz {matriz.shape[0]}x{matriz.shape[1]} cargada correctamente de {ruta}.")
     return matriz
@@ -0,0 +1,164 @@
+import numpy as np
+
+class MatrizCSR:
+    """
+    Matriz dispersa en formato CSR (Compressed Sparse Row).
+    Solo guarda los elementos distintos de cero, de modo que la memoria y el
+    coste de un producto matriz-vector son O(nnz) en lugar de O(n²).
+
+    Atributos:
+    - datos: Valores distintos de cero, fila por fila
+    - indices: Columna de cada valor de datos
+    - indptr: Posición en datos donde empieza cada fila (tamaño n_filas + 1)
+    - shape: Tupla (n_filas, n_columnas)
+    """
+
+    ndim = 2
+
+    def __init__(self, datos, indices, indptr, shape):
+        self.datos = np.asarray(datos, dtype=float)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.shape = (int(shape[0]), int(shape[1]))
+
+        if self.indptr.shape[0] != self.shape[0] + 1:
+            raise ValueError("indptr debe tener n_filas + 1 elementos.")
+        if self.datos.shape[0] != self.indices.shape[0]:
+            raise ValueError("datos e indices deben tener el mismo tamaño.")
+
+        # Fila a la que pertenece cada valor guardado
+        self._filas = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    @classmethod
+    def desde_coordenadas(cls, filas, columnas, valores, shape):
+        """
+        Construye la matriz a partir de tripletas (fila, columna, valor).
+        Las entradas repetidas se suman.
+        """
+        filas = np.asarray(filas, dtype=np.int64)
+        columnas = np.asarray(columnas, dtype=np.int64)
+        valores = np.asarray(valores, dtype=float)
+
+        # Ordenar por fila y columna, y sumar duplicados
+        orden = np.lexsort((columnas, filas))
+        filas, columnas, valores = filas[orden], columnas[orden], valores[orden]
+        if filas.size:
+            nuevo = np.ones(filas.size, dtype=bool)
+            nuevo[1:] = (filas[1:] != filas[:-1]) | (columnas[1:] != columnas[:-1])
+            grupos = np.cumsum(nuevo) - 1
+            valores = np.bincount(grupos, weights=valores)
+            filas, columnas = filas[nuevo], columnas[nuevo]
+
+        indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(filas, minlength=shape[0]), out=indptr[1:])
+        return cls(valores, columnas, indptr, shape)
+
+    @classmethod
+    def desde_densa(cls, A):
+        """
+        Construye la matriz a partir de un array denso.
+        """
+        A = np.asarray(A, dtype=float)
+        filas, columnas = np.nonzero(A)
+        return cls.desde_coordenadas(filas, columnas, A[filas, columnas], A.shape)
+
+    @property
+    def nnz(self):
+        return self.datos.shape[0]
+
+    def diagonal(self):
+        """
+        Retorna la diagonal de la matriz como vector denso.
+        """
+        n = min(self.shape)
+        d = np.zeros(n)
+        en_diagonal = self._filas == self.indices
+        d[self._filas[en_diagonal]] = self.datos[en_diagonal]
+        return d
+
+    def sin_diagonal(self):
+        """
+        Retorna una copia de la matriz sin los elementos de la diagonal.
+        """
+        fuera = self._filas != self.indices
+        indptr = np.zeros(self.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self._filas[fuera], minlength=self.shape[0]), out=indptr[1:])
+        return MatrizCSR(self.datos[fuera], self.indices[fuera], indptr, self.shape)
+
+    def suma_abs_por_fila(self, sin_diagonal=False):
+        """
+        Suma de los valores absolutos de cada fila, opcionalmente sin la diagonal.
+        """
+        pesos = np.abs(self.datos)
+        if sin_diagonal:
+            pesos = np.where(self._filas == self.indices, 0.0, pesos)
+        return np.bincount(self._filas, weights=pesos, minlength=self.shape[0])
+
+    def fila(self, i):
+        """
+        Retorna las columnas y los valores guardados de la fila i.
+        """
+        ini, fin = self.indptr[i], self.indptr[i + 1]
+        return self.indices[ini:fin], self.datos[ini:fin]
+
+    def submatriz_filas(self, filas):
+        """
+        Retorna una nueva MatrizCSR con las filas indicadas (en ese orden).
+        """
+        filas = np.asarray(filas, dtype=np.int64)
+        inicios = self.indptr[filas]
+        longitudes = self.indptr[filas + 1] - inicios
+        indptr = np.zeros(filas.shape[0] + 1, dtype=np.int64)
+        np.cumsum(longitudes, out=indptr[1:])
+
+        # Posiciones en datos de todos los elementos de las filas seleccionadas
+        desplazamiento = np.repeat(inicios - indptr[:-1], longitudes)
+        posiciones = np.arange(indptr[-1]) + desplazamiento
+        return MatrizCSR(self.datos[posiciones], self.indices[posiciones], indptr,
+                         (filas.shape[0], self.shape[1]))
+
+    def toarray(self):
+        """
+        Convierte la matriz a un array denso.
+        """
+        A = np.zeros(self.shape)
+        A[self._filas, self.indices] = self.datos
+        return A
+
+    def __matmul__(self, x):
+        """
+        Producto matriz-vector (o matriz-matriz densa) en O(nnz).
+        """
+        x = np.asarray(x, dtype=float)
+        if x.shape[0] != self.shape[1]:
+            raise ValueError("Las dimensiones no son compatibles para el producto.")
+
+        n = self.shape[0]
+        if x.ndim == 1:
+            return np.bincount(self._filas, weights=self.datos * x[self.indices], minlength=n)
+
+        productos = self.datos[:, None] * x[self.indices]
+        resultado = np.empty((n, x.shape[1]))
+        for j in range(x.shape[1]):
+            resultado[:, j] = np.bincount(self._filas, weights=productos[:, j], minlength=n)
+        return resultado
+
+    def __repr__(self):
+        return f"MatrizCSR(shape={self.shape}, nnz={self.nnz})"
+
+def es_dispersa(A):
+    """
+    Indica si A es una matriz dispersa (MatrizCSR o scipy.sparse).
+    """
+    return isinstance(A, MatrizCSR) or hasattr(A, "tocsr")
+
+def como_csr(A):
+    """
+    Convierte una matriz scipy.sparse a MatrizCSR sin pasar por una matriz densa.
+    Si A ya es MatrizCSR o es densa, se devuelve sin cambios.
+    """
+    if hasattr(A, "tocsr") and not isinstance(A, MatrizCSR):
+        csr = A.tocsr()
+        csr.sum_duplicates()
+        return MatrizCSR(csr.data, csr.indices, csr.indptr, csr.shape)
+    return A
@@ -1,6 +1,7 @@
-from matriz import leer_matriz
-import numpy as np
+import hashlib
+from collections import OrderedDict
 import numpy as np
+from instrumentacion import iniciar_traza
 
 # Determinante para una matriz 2x2
 def det_2x2(matriz):
@@ -20,8 +21,111 @@ def calcular_determinante(matriz):
     elif matriz.shape == (3, 3):
         return det_3x3(matriz)
     else:
-        print("Solo se soportan matrices de 2x2 o 3x3.")
-        return None
+        signo, log_abs = log_determinante(matriz)
+        return signo * np.exp(log_abs)
+
+def _paridad_permutacion(permutacion):
+    """
+    Retorna 1 si la permutación es par y -1 si es impar (n - número de ciclos).
+    """
+    visitado = np.zeros(permutacion.shape[0], dtype=bool)
+    ciclos = 0
+    for i in range(permutacion.shape[0]):
+        if not visitado[i]:
+            ciclos += 1
+            j = i
+            while not visitado[j]:
+                visitado[j] = True
+                j = permutacion[j]
+    return -1 if (permutacion.shape[0] - ciclos) % 2 else 1
+
+# Determinante de cualquier tamaño en escala logarítmica
+def log_determinante(matriz):
+    """
+    Calcula el determinante de una matriz n x n por eliminación (O(n³)) en escala
+    logarítmica, para que no se desborde con matrices grandes.
+    
+    Parámetros:
+    - matriz: Matriz cuadrada
+    
+    Retorna:
+    - signo: 1, -1 o 0 (matriz singular)
+    - log_abs: Logaritmo natural del valor absoluto del determinante (-inf si es singular)
+    """
+    A = np.array(matriz, dtype=float)
+    if A.ndim != 2 or A.shape[0] != A.shape[1]:
+        raise ValueError("La matriz debe ser cuadrada.")
+    
+    try:
+        permutacion = _lu_bloques(A)
+    except ValueError:
+        return 0.0, -np.inf
+    
+    diagonal = np.diag(A)
+    signo = _paridad_permutacion(permutacion) * np.prod(np.sign(diagonal))
+    return float(signo), float(np.sum(np.log(np.abs(diagonal))))
+
+# Determinantes de una pila de matrices (N, k, k)
+def determinantes_lote(pila, en_log=False):
+    """
+    Calcula los determinantes de una pila de N matrices k x k a la vez.
+    Para k <= 3 se evalúa la fórmula cerrada como una expresión vectorial sobre toda
+    la pila; para k mayores se hace la eliminación con pivoteo parcial vectorizada
+    sobre la pila.
+    
+    Parámetros:
+    - pila: Array de forma (N, k, k)
+    - en_log: Si es True se retorna (signos, log_abs) en lugar de los determinantes
+    
+    Retorna:
+    - Array de N determinantes, o la tupla (signos, log_abs) si en_log es True
+    """
+    A = np.asarray(pila, dtype=float)
+    if A.ndim != 3 or A.shape[1] != A.shape[2]:
+        raise ValueError("La pila debe tener forma (N, k, k).")
+    
+    N, k = A.shape[0], A.shape[1]
+    if k <= 3:
+        # Las fórmulas de det_2x2 y det_3x3 funcionan elemento a elemento sobre la pila
+        columnas = np.moveaxis(A, 0, -1)
+        if k == 1:
+            dets = A[:, 0, 0].copy()
+        elif k == 2:
+            dets = det_2x2(columnas)
+        else:
+            dets = det_3x3(columnas)
+        if not en_log:
+            return dets
+        with np.errstate(divide="ignore"):
+            return np.sign(dets), np.log(np.abs(dets))
+    
+    A = A.copy()
+    idx = np.arange(N)
+    signos = np.ones(N)
+    log_abs = np.zeros(N)
+    
+    for i in range(k):
+        # Pivoteo parcial en cada matriz de la pila
+        p = i + np.argmax(np.abs(A[:, i:, i]), axis=1)
+        fila_i = A[idx, i].copy()
+        A[idx, i] = A[idx, p]
+        A[idx, p] = fila_i
+        signos[p != i] *= -1
+        
+        pivote = A[:, i, i]
+        cero = pivote == 0
+        signos[cero] = 0.0
+        pivote = np.where(cero, 1.0, pivote)
+        signos *= np.sign(pivote)
+        log_abs += np.log(np.abs(pivote))
+        
+        factores = A[:, i + 1:, i] / pivote[:, None]
+        A[:, i + 1:, i:] -= factores[:, :, None] * A[:, None, i, i:]
+    
+    log_abs[signos == 0] = -np.inf
+    if en_log:
+        return signos, log_abs
+    return signos * np.exp(log_abs)
 
 # Inversa de una 2X2 
 def inversa_2x2(m):
@@ -33,6 +137,96 @@ def inversa_2x2(m):
                               [-m[1][0], m[0][0]]])
     return inv
 
+# Inversa de una matriz n x n
+def calcular_inversa(matriz):
+    """
+    Calcula la inversa de una matriz cuadrada de cualquier tamaño.
+    Para 2x2 usa la fórmula cerrada; en otro caso, la factorización LU (en caché).
+    
+    Retorna:
+    - La matriz inversa, o None si la matriz no es invertible
+    """
+    if matriz.shape == (2, 2):
+        return inversa_2x2(matriz)
+    try:
+        return factorizar_lu(matriz).inversa()
+    except ValueError:
+        print("La matriz no es invertible.")
+        return None
+
+# Inversas de una pila de matrices (N, k, k)
+def inversas_lote(pila, tol=1e-12):
+    """
+    Calcula las inversas de una pila de N matrices k x k a la vez.
+    Para 2x2 y 3x3 se usa la fórmula de la adjunta vectorizada sobre toda la pila;
+    para k mayores, Gauss-Jordan con pivoteo parcial vectorizado sobre la pila.
+    
+    Una matriz se marca como casi singular cuando |det| <= tol * (producto de las
+    normas de sus filas); su inversa se rellena con nan y el resto del lote sigue
+    calculándose.
+    
+    Parámetros:
+    - pila: Array de forma (N, k, k)
+    - tol: Umbral relativo para considerar una matriz casi singular
+    
+    Retorna:
+    - inversas: Array (N, k, k) con las inversas (nan en las casi singulares)
+    - singulares: Array booleano (N,) que marca las matrices casi singulares
+    """
+    A = np.asarray(pila, dtype=float)
+    if A.ndim != 3 or A.shape[1] != A.shape[2]:
+        raise ValueError("La pila debe tener forma (N, k, k).")
+    
+    N, k = A.shape[0], A.shape[1]
+    escala = np.prod(np.linalg.norm(A, axis=2), axis=1)
+    
+    if k <= 3:
+        dets = determinantes_lote(A)
+        if k == 1:
+            adjunta = np.ones_like(A)
+        elif k == 2:
+            adjunta = np.empty_like(A)
+            adjunta[:, 0, 0] = A[:, 1, 1]
+            adjunta[:, 0, 1] = -A[:, 0, 1]
+            adjunta[:, 1, 0] = -A[:, 1, 0]
+            adjunta[:, 1, 1] = A[:, 0, 0]
+        else:
+            # Las columnas de la adjunta son productos vectoriales de las filas
+            f0, f1, f2 = A[:, 0], A[:, 1], A[:, 2]
+            adjunta = np.stack([np.cross(f1, f2), np.cross(f2, f0), np.cross(f0, f1)], axis=2)
+        
+        singulares = np.abs(dets) <= tol * escala
+        dets = np.where(singulares, 1.0, dets)
+        inversas = adjunta / dets[:, None, None]
+    else:
+        # Gauss-Jordan sobre la matriz ampliada [A | I]
+        M = np.concatenate([A, np.broadcast_to(np.eye(k), A.shape)], axis=2)
+        idx = np.arange(N)
+        log_abs = np.zeros(N)
+        
+        for i in range(k):
+            p = i + np.argmax(np.abs(M[:, i:, i]), axis=1)
+            fila_i = M[idx, i].copy()
+            M[idx, i] = M[idx, p]
+            M[idx, p] = fila_i
+            
+            pivote = M[:, i, i]
+            pivote = np.where(pivote == 0, 1.0, pivote)
+            with np.errstate(divide="ignore"):
+                log_abs += np.log(np.abs(M[:, i, i]))
+            M[:, i] /= pivote[:, None]
+            
+            factores = M[:, :, i].copy()
+            factores[:, i] = 0.0
+            M -= factores[:, :, None] * M[:, None, i]
+        
+        with np.errstate(divide="ignore"):
+            singulares = log_abs <= np.log(tol) + np.log(escala)
+        inversas = M[:, :, k:]
+    
+    inversas[singulares] = np.nan
+    return inversas, singulares
+
 # Intercambio de filas 
 def intercambiar_filas(matriz, fila1, fila2):
     matriz[[fila1, fila2]] = matriz[[fila2, fila1]]
@@ -74,39 +268,286 @@ def transpuesta_manual(matriz):
     
     return resultado
 
-def gauss_eliminacion(matriz, vector):
+def _lu_bloques(A, tam_bloque=64):
+    """
+    Factoriza A en el sitio como PA = LU con pivoteo parcial, por bloques de columnas.
+    
+    Cada panel de tam_bloque columnas se factoriza columna a columna; después se
+    calcula la fila de bloques de U y el resto de la matriz se actualiza con un único
+    producto matriz-matriz (A22 -= L21 @ U12), que aprovecha mucho mejor la caché que
+    actualizar fila a fila.
+    
+    Retorna:
+    - permutacion: Orden de las filas de la matriz original (PA = A[permutacion])
+    """
+    n = A.shape[0]
+    permutacion = np.arange(n)
+    
+    for k in range(0, n, tam_bloque):
+        fin = min(k + tam_bloque, n)
+        
+        # Factorizar el panel A[k:, k:fin]
+        for i in range(k, fin):
+            p = i + np.argmax(np.abs(A[i:, i]))
+            if A[p, i] == 0:
+                raise ValueError("El sistema no tiene solución única (pivote cero).")
+            if p != i:
+                A[[i, p]] = A[[p, i]]
+                permutacion[[i, p]] = permutacion[[p, i]]
+            A[i + 1:, i] /= A[i, i]
+            A[i + 1:, i + 1:fin] -= np.outer(A[i + 1:, i], A[i, i + 1:fin])
+        
+        if fin < n:
+            # Fila de bloques de U: U12 = L11⁻¹ A12
+            for i in range(k, fin - 1):
+                A[i + 1:fin, fin:] -= np.outer(A[i + 1:fin, i], A[i, fin:])
+            # Actualización del resto como producto matriz-matriz
+            A[fin:, fin:] -= A[fin:, k:fin] @ A[k:fin, fin:]
+    
+    return permutacion
+
+def _inversas_diagonales(LU, tam_bloque=64):
+    """
+    Calcula las inversas de los bloques diagonales de tam_bloque x tam_bloque de L
+    y de U (con el tipo de dato de LU). Con ellas las sustituciones de
+    _sustitucion_lu y _sustitucion_lu_transpuesta son solo productos
+    matriz-vector por bloque, sin el bucle fila a fila, lo que compensa cuando
+    se resuelven varios sistemas seguidos con la misma factorización.
+    
+    Retorna:
+    - Lista con (L_kk⁻¹, U_kk⁻¹) de cada bloque
+    """
+    n = LU.shape[0]
+    inversas = []
+    for k in range(0, n, tam_bloque):
+        fin = min(k + tam_bloque, n)
+        bloque = LU[k:fin, k:fin].astype(float)
+        m = fin - k
+        inversa_L = np.eye(m)
+        for i in range(1, m):
+            inversa_L[i] -= bloque[i, :i] @ inversa_L[:i]
+        inversa_U = np.eye(m)
+        for i in range(m - 1, -1, -1):
+            inversa_U[i] = (inversa_U[i] - bloque[i, i + 1:] @ inversa_U[i + 1:]) / bloque[i, i]
+        inversas.append((inversa_L.astype(LU.dtype), inversa_U.astype(LU.dtype)))
+    return inversas
+
+def _sustitucion_lu(LU, permutacion, b, tam_bloque=64, inversas=None):
+    """
+    Resuelve LU x = b[permutacion] en el sitio sobre b (vector o matriz n x k).
+    
+    Como en _lu_bloques, las sustituciones se hacen por bloques de tam_bloque
+    filas: dentro del bloque fila a fila (o con un producto por la inversa del
+    bloque, si se indican las inversas de _inversas_diagonales) y el resto de b se
+    actualiza con un único producto matriz-matriz, que con muchas columnas (por
+    ejemplo, al calcular la inversa) es mucho más rápido que actualizar todo b en
+    cada fila.
     """
-    Resuelve un sistema de ecuaciones lineales Ax = b usando eliminación de Gauss.
+    n = LU.shape[0]
+    b[:] = b[permutacion]
+    
+    # Sustitución hacia adelante con L (diagonal unitaria)
+    for bloque, k in enumerate(range(0, n, tam_bloque)):
+        fin = min(k + tam_bloque, n)
+        if inversas is not None:
+            b[k:fin] = inversas[bloque][0] @ b[k:fin]
+        else:
+            for i in range(k, fin - 1):
+                b[i + 1:fin] -= np.multiply.outer(LU[i + 1:fin, i], b[i])
+        b[fin:] -= LU[fin:, k:fin] @ b[k:fin]
+    
+    # Sustitución hacia atrás con U
+    for k in reversed(range(0, n, tam_bloque)):
+        fin = min(k + tam_bloque, n)
+        if inversas is not None:
+            b[k:fin] = inversas[k // tam_bloque][1] @ b[k:fin]
+        else:
+            for i in range(fin - 1, k - 1, -1):
+                b[i] /= LU[i, i]
+                b[k:i] -= np.multiply.outer(LU[k:i, i], b[i])
+        b[:k] -= LU[:k, k:fin] @ b[k:fin]
+    
+    return b
+
+def gauss_eliminacion(matriz, vector, tam_bloque=64, en_sitio=False, precision="doble",
+                      traza=None):
+    """
+    Resuelve un sistema de ecuaciones lineales Ax = b usando eliminación de Gauss
+    con pivoteo parcial, organizada por bloques de columnas.
     
     Parámetros:
     - matriz: Matriz de coeficientes (numpy array de tamaño n x n).
     - vector: Vector de términos independientes (numpy array de tamaño n).
+    - tam_bloque: Número de columnas de cada bloque de la eliminación.
+    - en_sitio: Si es True no se copian matriz ni vector (si ya son arrays de
+      float): matriz queda sobrescrita con la factorización LU y vector con la
+      solución. Reduce a la mitad la memoria máxima para n grande.
+    - precision: "doble" para factorizar en float64, o "mixta" para factorizar en
+      float32 y refinar la solución en float64 (ver gauss_precision_mixta). La
+      precisión mixta no admite en_sitio, ya que necesita la matriz original.
+    - traza: Traza opcional que registra los refinamientos (solo con precision="mixta").
     
     Retorna:
     - Un numpy array con la solución del sistema x.
     """
-    n = len(vector)
-    A = np.array(matriz, dtype=float)
-    b = np.array(vector, dtype=float)
+    if precision == "mixta":
+        if en_sitio:
+            raise ValueError("La precisión mixta no admite en_sitio=True.")
+        return gauss_precision_mixta(matriz, vector, tam_bloque, traza=traza)
+    if precision != "doble":
+        raise ValueError(f"Precisión desconocida: {precision}")
+    
+    if en_sitio:
+        A = np.asarray(matriz, dtype=float)
+        b = np.asarray(vector, dtype=float)
+    else:
+        A = np.array(matriz, dtype=float)
+        b = np.array(vector, dtype=float)
+    
+    if A.shape[0] != A.shape[1] or A.shape[0] != b.shape[0]:
+        raise ValueError("Las dimensiones de la matriz y el vector no son compatibles.")
+    
+    permutacion = _lu_bloques(A, tam_bloque)
+    return _sustitucion_lu(A, permutacion, b)
 
-    # Eliminación hacia adelante
-    for i in range(n):
-        # Verificar si el pivote es cero
-        if A[i, i] == 0:
-            raise ValueError("El sistema no tiene solución única (pivote cero).")
-        
-        # Normalizar la fila actual dividiendo por el pivote
-        for j in range(i + 1, n):
-            factor = A[j, i] / A[i, i]
-            A[j, i:] -= factor * A[i, i:]
-            b[j] -= factor * b[i]
+def _sustitucion_lu_transpuesta(LU, permutacion, inversas, c, tam_bloque=64):
+    """
+    Resuelve A^T y = c con la factorización PA = LU (A^T = U^T L^T P), por
+    bloques como _sustitucion_lu con las inversas de _inversas_diagonales.
+    c puede ser un vector o una matriz n x k.
+    """
+    n = LU.shape[0]
+    z = np.array(c)
+    
+    # U^T es triangular inferior: sustitución hacia adelante
+    for k in range(0, n, tam_bloque):
+        fin = min(k + tam_bloque, n)
+        z[k:fin] = inversas[k // tam_bloque][1].T @ z[k:fin]
+        z[fin:] -= LU[k:fin, fin:].T @ z[k:fin]
+    
+    # L^T es triangular superior con diagonal unitaria: sustitución hacia atrás
+    for k in reversed(range(0, n, tam_bloque)):
+        fin = min(k + tam_bloque, n)
+        z[k:fin] = inversas[k // tam_bloque][0].T @ z[k:fin]
+        z[:k] -= LU[k:fin, :k].T @ z[k:fin]
+    
+    y = np.empty_like(z)
+    y[permutacion] = z
+    return y
 
-    # Sustitución hacia atrás
-    x = np.zeros(n)
-    for i in range(n - 1, -1, -1):
-        x[i] = (b[i] - np.dot(A[i, i + 1:], x[i + 1:])) / A[i, i]
+def _estimar_norma1_inversa(LU, permutacion, inversas, max_iter=5):
+    """
+    Estima ||A⁻¹||₁ con el método de Hager usando una factorización ya calculada
+    (y las inversas de _inversas_diagonales), con unas pocas resoluciones O(n²)
+    en lugar de calcular la inversa.
+    Los vectores tienen el tipo de dato de LU, para no convertir LU en cada producto.
+    """
+    n = LU.shape[0]
+    x = np.full(n, 1.0 / n, dtype=LU.dtype)
+    estimacion = 0.0
+    for _ in range(max_iter):
+        y = _sustitucion_lu(LU, permutacion, x.copy(), inversas=inversas)
+        estimacion = float(np.abs(y).sum(dtype=float))
+        signos = np.where(y >= 0, 1.0, -1.0).astype(LU.dtype)
+        z = _sustitucion_lu_transpuesta(LU, permutacion, inversas, signos)
+        j = np.argmax(np.abs(z))
+        if np.abs(z[j]) <= z @ x:
+            break
+        x = np.zeros(n, dtype=LU.dtype)
+        x[j] = 1.0
+    return estimacion
 
-    return x
+def _resolver_escalado(LU, permutacion, inversas, r):
+    """
+    Resuelve A d = r con una factorización en float32 haciendo la sustitución en
+    float32 (sin convertir LU a float64 en cada producto). r se divide antes por
+    su máximo para que no se desborde ni se pierda en float32; d se retorna en
+    float64.
+    """
+    escala = np.abs(r).max()
+    if escala == 0 or not np.isfinite(escala):
+        escala = 1.0
+    d = _sustitucion_lu(LU, permutacion, (r / escala).astype(LU.dtype), inversas=inversas)
+    return d.astype(float) * escala
+
+def gauss_precision_mixta(matriz, vector, tam_bloque=64, max_refinamientos=10,
+                          max_condicion=1e6, traza=None):
+    """
+    Resuelve Ax = b factorizando A en float32 y corrigiendo la solución con
+    refinamiento iterativo en float64: en cada paso se calcula el residuo
+    r = b - Ax en float64 y se resuelve A d = r con la misma factorización.
+    
+    La factorización, que es la parte O(n³), mueve la mitad de memoria que en
+    float64; cada refinamiento solo cuesta O(n²). Todas las sustituciones (la
+    estimación de la condición y los refinamientos) se hacen en float32 con las
+    inversas de los bloques diagonales, así que son solo productos por bloques.
+    En conjunto es alrededor de 1.3-1.4 veces más rápida que precision="doble"
+    para n entre 500 y 2500; no llega a 2 porque la factorización de cada panel
+    sigue siendo columna a columna y no depende del tipo de dato.
+    
+    Si el número de condición estimado supera max_condicion, la factorización en
+    float32 falla o el refinamiento no alcanza la precisión doble, se resuelve de
+    nuevo en float64.
+    
+    Parámetros:
+    - matriz: Matriz de coeficientes (numpy array de tamaño n x n).
+    - vector: Vector de términos independientes (tamaño n, o matriz n x k).
+    - tam_bloque: Número de columnas de cada bloque de la eliminación.
+    - max_refinamientos: Número máximo de pasos de refinamiento.
+    - max_condicion: Número de condición (norma 1) máximo para usar float32.
+    - traza: Traza opcional (instrumentacion.Traza) que registra cada refinamiento.
+    
+    Retorna:
+    - Un numpy array con la solución del sistema x.
+    """
+    A = np.asarray(matriz, dtype=float)
+    b = np.asarray(vector, dtype=float)
+    if A.ndim != 2 or A.shape[0] != A.shape[1] or A.shape[0] != b.shape[0]:
+        raise ValueError("Las dimensiones de la matriz y el vector no son compatibles.")
+    
+    n = A.shape[0]
+    traza = iniciar_traza(traza, "gauss_precision_mixta", n)
+    
+    # Los valores fuera del rango de float32 quedan como inf y se detectan después
+    with np.errstate(over="ignore"):
+        LU = A.astype(np.float32)
+    try:
+        if not np.all(np.isfinite(LU)):
+            raise ValueError("La matriz no se puede representar en float32.")
+        permutacion = _lu_bloques(LU, tam_bloque)
+        # Un pivote casi nulo da inversas con inf y una condición inf o nan
+        with np.errstate(over="ignore", invalid="ignore"):
+            inversas = _inversas_diagonales(LU)
+            condicion = (np.abs(A).sum(axis=0).max()
+                         * _estimar_norma1_inversa(LU, permutacion, inversas))
+        if not condicion <= max_condicion:
+            raise ValueError(f"Número de condición demasiado grande ({condicion:.2e}).")
+    except ValueError:
+        traza.contar("respaldo_float64")
+        traza.finalizar(False)
+        return gauss_eliminacion(A, b, tam_bloque)
+    traza.contar("flops", 2 * n ** 3 // 3)
+    
+    # Criterio de parada del refinamiento (el mismo que usa LAPACK en dsgesv)
+    limite = np.abs(A).sum(axis=1).max() * np.finfo(float).eps * np.sqrt(n)
+    x = _resolver_escalado(LU, permutacion, inversas, b)
+    for k in range(max_refinamientos + 1):
+        r = b - A @ x
+        residuo = np.abs(r).max()
+        if residuo <= limite * np.abs(x).max():
+            traza.finalizar(True)
+            return x
+        if k == max_refinamientos:
+            break
+        d = _resolver_escalado(LU, permutacion, inversas, r)
+        x += d
+        if traza.activa:
+            traza.iteracion(k + 1, residuo, np.abs(d).max())
+            traza.contar("flops", 4 * n * n * (1 if b.ndim == 1 else b.shape[1]))
+    
+    traza.contar("respaldo_float64")
+    traza.finalizar(False)
+    return gauss_eliminacion(A, b, tam_bloque)
 
 def gauss_eliminacion_solo_matriz(matriz):
     """
@@ -140,15 +581,131 @@ def gauss_eliminacion_solo_matriz(matriz):
 
     return A
 
+def huella_matriz(matriz):
+    """
+    Calcula una huella (hash) del contenido de una matriz: forma, tipo y valores.
+    Dos matrices con los mismos valores tienen la misma huella.
+    """
+    A = np.ascontiguousarray(matriz, dtype=float)
+    h = hashlib.sha1()
+    h.update(str(A.shape).encode())
+    h.update(A.tobytes())
+    return h.hexdigest()
+
+class FactorizacionLU:
+    """
+    Factorización PA = LU con pivoteo parcial de una matriz cuadrada.
+    Se calcula una vez en O(n³) y después cada sistema se resuelve en O(n²),
+    también con varios vectores de términos independientes a la vez.
+    
+    Atributos:
+    - LU: Matriz con U en el triángulo superior y los multiplicadores de L debajo
+    - permutacion: Orden de las filas de A tras el pivoteo (PA = A[permutacion])
+    """
+
+    def __init__(self, matriz, tam_bloque=64):
+        A = np.array(matriz, dtype=float)
+        if A.ndim != 2 or A.shape[0] != A.shape[1]:
+            raise ValueError("La matriz debe ser cuadrada.")
+        
+        self.permutacion = _lu_bloques(A, tam_bloque)
+        self.LU = A
+
+    @property
+    def n(self):
+        return self.LU.shape[0]
+
+    @property
+    def nbytes(self):
+        return self.LU.nbytes + self.permutacion.nbytes
+
+    def resolver(self, vector):
+        """
+        Resuelve A x = b usando la factorización.
+        
+        Parámetros:
+        - vector: Vector de tamaño n o matriz n x k con k términos independientes
+        
+        Retorna:
+        - Solución x con la misma forma que vector
+        """
+        b = np.array(vector, dtype=float)
+        if b.shape[0] != self.n:
+            raise ValueError("Las dimensiones de la matriz y el vector no son compatibles.")
+        
+        return _sustitucion_lu(self.LU, self.permutacion, b)
+
+    def inversa(self):
+        """
+        Retorna la inversa de la matriz resolviendo A X = I con la factorización.
+        """
+        return self.resolver(np.eye(self.n))
 
- # Ejemplo con la matriz problemática
-matriz = np.array([
-    [1, 2, 3, 4],
-    [0, 1, 2, 4],
-    [2, 3, 4, 5],
-    [2, 0, 1, 2]
-])
+class CacheFactorizaciones:
+    """
+    Caché LRU de factorizaciones LU indexada por la huella de la matriz.
+    Cuando el tamaño total supera max_bytes se descartan las menos usadas.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        self._entradas = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._entradas)
+
+    @property
+    def bytes_usados(self):
+        return self._bytes
+
+    def obtener(self, matriz):
+        """
+        Retorna la factorización de la matriz, calculándola solo si no está en caché.
+        """
+        clave = huella_matriz(matriz)
+        if clave in self._entradas:
+            self.aciertos += 1
+            self._entradas.move_to_end(clave)
+            return self._entradas[clave]
+        
+        self.fallos += 1
+        factorizacion = FactorizacionLU(matriz)
+        if factorizacion.nbytes > self.max_bytes:
+            return factorizacion
+        
+        self._entradas[clave] = factorizacion
+        self._bytes += factorizacion.nbytes
+        while self._bytes > self.max_bytes:
+            _, descartada = self._entradas.popitem(last=False)
+            self._bytes -= descartada.nbytes
+        return factorizacion
+
+    def limpiar(self):
+        self._entradas.clear()
+        self._bytes = 0
+
+_cache_lu = CacheFactorizaciones()
+
+def factorizar_lu(matriz, cache=_cache_lu):
+    """
+    Retorna la factorización LU de la matriz, reutilizando la de la caché si
+    ya se calculó para una matriz con el mismo contenido.
+    
+    Parámetros:
+    - matriz: Matriz cuadrada
+    - cache: CacheFactorizaciones a usar (None para no usar caché)
+    """
+    if cache is None:
+        return FactorizacionLU(matriz)
+    return cache.obtener(matriz)
+
+def resolver_lu(matriz, vector, cache=_cache_lu):
+    """
+    Resuelve A x = b con una factorización LU reutilizable.
+    vector puede ser un vector de tamaño n o una matriz n x k.
+    """
+    return factorizar_lu(matriz, cache).resolver(vector)
 
-resultado = gauss_eliminacion_solo_matriz(matriz)
-print("\nResultado final:")
-print(resultado)
\ No newline at end of file
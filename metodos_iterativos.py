@@ -1,21 +1,29 @@
+import inspect
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 import numpy as np
 from matriz import leer_matriz
+from matriz_dispersa import MatrizCSR, como_csr
+from metodos_krylov import gradiente_conjugado, gmres, bicgstab
+from instrumentacion import iniciar_traza, cerrar_traza, elementos
+from estructura import es_diagonal_dominante
+from metodos_directos import FactorizacionLU
 
 def criterio_convergencia(A):
     """
     Verifica si una matriz cumple con el criterio de convergencia para métodos iterativos.
     Para que converja, la matriz debe ser diagonalmente dominante.
+    Con una matriz dispersa la comprobación cuesta O(nnz).
     """
-    n = A.shape[0]
-    for i in range(n):
-        suma = sum(abs(A[i, j]) for j in range(n) if j != i)
-        if abs(A[i, i]) <= suma:
-            return False
-    return True
+    return es_diagonal_dominante(A)
 
-def verificar_sistema(A, b):
+def verificar_sistema(A, b, avisar=True):
     """
     Verifica si el sistema Ax = b es adecuado para métodos iterativos.
+    Con avisar=False solo se comprueban las dimensiones, sin el aviso de
+    dominancia diagonal (que no es el criterio de convergencia de todos los métodos).
     """
     if A.shape[0] != A.shape[1]:
         raise ValueError("La matriz A debe ser cuadrada")
@@ -23,7 +31,7 @@ def verificar_sistema(A, b):
     if A.shape[0] != b.shape[0]:
         raise ValueError("Las dimensiones de A y b no son compatibles")
     
-    if not criterio_convergencia(A):
+    if avisar and not criterio_convergencia(A):
         print("ADVERTENCIA: La matriz no cumple el criterio de convergencia (no es diagonalmente dominante).")
         print("Los métodos iterativos podrían no converger.")
 
@@ -38,22 +46,187 @@ def leer_vector_b():
         b[i] = float(input(f"b[{i}]: "))
     return b
 
-def jacobi(A, b, x0=None, tol=1e-6, max_iter=100):
+def separar_diagonal(A):
+    """
+    Separa la matriz A en su diagonal D y la parte fuera de la diagonal R = A - D.
+    Se calcula una sola vez para que cada iteración sea una operación vectorial.
+    
+    Parámetros:
+    - A: Matriz de coeficientes (densa o dispersa)
+    
+    Retorna:
+    - D: Vector con la diagonal de A
+    - R: Matriz A con la diagonal a cero (MatrizCSR si A es dispersa)
+    """
+    A = como_csr(A)
+    if isinstance(A, MatrizCSR):
+        return A.diagonal(), A.sin_diagonal()
+    
+    R = np.array(A, dtype=float)
+    D = np.diag(R).copy()
+    np.fill_diagonal(R, 0.0)
+    return D, R
+
+def iterar_jacobi(A, b, x0=None, tol=None, traza=None):
+    """
+    Genera las iteraciones del método de Jacobi para Ax = b, una a una y sin límite.
+    Quien recorre el generador decide cuándo parar (criterio propio, número de
+    iteraciones, tiempo...), y puede intercalar varias resoluciones.
+    
+    Si b es una matriz de tamaño n x k, se itera con las k columnas a la vez. Con tol,
+    cada columna deja de actualizarse en cuanto su error baja de tol, y el generador
+    termina cuando todas han convergido.
+    
+    Parámetros:
+    - A: Matriz de coeficientes (densa, MatrizCSR o scipy.sparse)
+    - b: Vector de términos independientes (o matriz n x k con varios)
+    - x0: Vector inicial (si no se proporciona, se usa un vector de ceros)
+    - tol: Tolerancia para congelar columnas (None para no congelar nunca)
+    - traza: Traza opcional (instrumentacion.Traza) que registra cada iteración
+    
+    Genera:
+    - (iteracion, x, error): primero (0, x0, None) y después cada iteración.
+      x es una vista de solo lectura (n o n x k) sobre el vector de trabajo, sin
+      copia: cambia con la siguiente iteración, así que hay que copiarla para
+      conservarla. Con varias columnas, error es un array con el de cada columna
+      (nan en las ya congeladas)
+    """
+    A = como_csr(A)
+    verificar_sistema(A, b)
+    
+    # Dimensión del sistema
+    n = A.shape[0]
+    
+    # Separar la diagonal una sola vez
+    D, R = separar_diagonal(A)
+    if np.any(D == 0):
+        raise ValueError("La diagonal de A contiene ceros; no se puede aplicar el método de Jacobi.")
+    
+    # Trabajar siempre con una matriz de columnas n x k
+    b = np.asarray(b, dtype=float)
+    varias = b.ndim == 2
+    B = b.reshape(n, -1)
+    k = B.shape[1]
+    
+    # Si no se proporciona vector inicial, usar ceros
+    if x0 is None:
+        x0 = np.zeros(n)
+    
+    # Inicializar solución (un mismo x0 de tamaño n sirve para todas las columnas)
+    x0 = np.asarray(x0, dtype=float)
+    X = np.empty((n, k))
+    X[:] = x0.reshape(n, -1)
+    vista = (X if varias else X[:, 0]).view()
+    vista.flags.writeable = False
+    
+    # Columnas que siguen iterando
+    activas = np.ones(k, dtype=bool)
+    traza = iniciar_traza(traza, "jacobi", n)
+    yield 0, vista, None
+    
+    it = 0
+    while activas.any():
+        it += 1
+        cols = np.flatnonzero(activas)
+        X_act = X[:, cols]
+        
+        # Calcular nuevos valores de todas las columnas activas
+        X_new = (B[:, cols] - R @ X_act) / D[:, None]
+        
+        # Calcular error de cada columna
+        paso = np.linalg.norm(X_new - X_act, axis=0)
+        error = paso / np.linalg.norm(X_new, axis=0)
+        
+        if traza.activa:
+            # El residuo en X_act es b - A X_act = D (X_new - X_act), sin coste extra
+            residuo = np.linalg.norm(D[:, None] * (X_new - X_act), axis=0)
+            traza.iteracion(it, residuo.max(), paso.max())
+            traza.contar("productos_matriz_vector", cols.size)
+            traza.contar("flops", cols.size * (2 * elementos(R) + 6 * n))
+        
+        # Actualizar solución
+        X[:, cols] = X_new
+        
+        # Congelar las columnas que han convergido
+        if tol is not None:
+            activas[cols[error < tol]] = False
+        
+        if varias:
+            errores = np.full(k, np.nan)
+            errores[cols] = error
+            yield it, vista, errores
+        else:
+            yield it, vista, error[0]
+
+def jacobi(A, b, x0=None, tol=1e-6, max_iter=100, traza=None):
     """
     Implementa el método iterativo de Jacobi para resolver el sistema Ax = b.
+    Cada iteración se calcula como x_new = (b - R x) / D sobre todo el vector.
+    Recorre iterar_jacobi hasta la convergencia o max_iter.
+    
+    Si b es una matriz de tamaño n x k, se resuelven las k columnas a la vez.
+    Cada columna comprueba su convergencia por separado y deja de actualizarse
+    en cuanto converge.
     
     Parámetros:
-    - A: Matriz de coeficientes
-    - b: Vector de términos independientes
+    - A: Matriz de coeficientes (densa, MatrizCSR o scipy.sparse)
+    - b: Vector de términos independientes (o matriz n x k con varios)
     - x0: Vector inicial (si no se proporciona, se usa un vector de ceros)
     - tol: Tolerancia para la convergencia
     - max_iter: Número máximo de iteraciones
+    - traza: Traza opcional (instrumentacion.Traza) que registra cada iteración
     
     Retorna:
-    - x: Vector solución
-    - iter_count: Número de iteraciones realizadas
-    - error_hist: Historial de errores
+    - x: Vector solución (matriz n x k si b tiene varias columnas)
+    - iter_count: Número de iteraciones realizadas (array con una por columna si b es n x k)
+    - error_hist: Historial de errores (con varias columnas, cada entrada es un array
+      con el error de cada columna; las columnas ya convergidas aparecen como nan)
     """
+    # Historial de errores
+    error_hist = []
+    
+    for it, x, error in islice(iterar_jacobi(A, b, x0, tol, traza), max_iter + 1):
+        if it == 0:
+            k = x.shape[1] if x.ndim == 2 else 1
+            iteraciones = np.full(k, max_iter)
+            convergidas = np.zeros(k, dtype=bool)
+            continue
+        error_hist.append(error)
+        
+        # Anotar las columnas que convergen en esta iteración
+        nuevas = np.atleast_1d(error < tol)
+        iteraciones[nuevas] = it
+        convergidas |= nuevas
+    
+    cerrar_traza(traza, convergidas.all())
+    if not convergidas.all():
+        if x.ndim == 2:
+            print(f"El método de Jacobi no convergió en {k - convergidas.sum()} de {k} columnas "
+                  f"después de {max_iter} iteraciones.")
+        else:
+            print(f"El método de Jacobi no convergió después de {max_iter} iteraciones.")
+    
+    x = x.copy()
+    if x.ndim == 2:
+        return x, iteraciones, error_hist
+    return x, int(iteraciones[0]), error_hist
+
+def iterar_gauss_seidel(A, b, x0=None, traza=None):
+    """
+    Genera los barridos del método de Gauss-Seidel para Ax = b, uno a uno y sin límite.
+    Con una matriz dispersa cada barrido solo recorre los elementos guardados (O(nnz)).
+    
+    Parámetros:
+    - A: Matriz de coeficientes (densa, MatrizCSR o scipy.sparse)
+    - b: Vector de términos independientes
+    - x0: Vector inicial (si no se proporciona, se usa un vector de ceros)
+    - traza: Traza opcional (instrumentacion.Traza) que registra cada iteración
+    
+    Genera:
+    - (iteracion, x, error): primero (0, x0, None) y después cada barrido. x es una
+      vista de solo lectura sobre el vector de trabajo (sin copia)
+    """
+    A = como_csr(A)
     verificar_sistema(A, b)
     
     # Dimensión del sistema
@@ -64,95 +237,598 @@ def jacobi(A, b, x0=None, tol=1e-6, max_iter=100):
         x0 = np.zeros(n)
     
     # Inicializar vector solución
-    x = x0.copy()
+    x = np.array(x0, dtype=float)
+    vista = x.view()
+    vista.flags.writeable = False
     
-    # Historial de errores
-    error_hist = []
+    if isinstance(A, MatrizCSR):
+        barrido = _barrido_gauss_seidel_csr(A, b)
+    else:
+        barrido = _barrido_gauss_seidel
     
-    # Iterar hasta convergencia o máximo de iteraciones
-    for k in range(max_iter):
-        x_new = np.zeros(n)
-        
-        # Calcular nuevos valores
-        for i in range(n):
-            suma = 0
-            for j in range(n):
-                if j != i:
-                    suma += A[i, j] * x[j]
-            x_new[i] = (b[i] - suma) / A[i, i]
+    traza = iniciar_traza(traza, "gauss_seidel", n)
+    yield 0, vista, None
+    
+    k = 0
+    while True:
+        k += 1
+        x_old = x.copy()
+        barrido(A, b, x, x_old)
         
         # Calcular error
-        error = np.linalg.norm(x_new - x) / np.linalg.norm(x_new)
-        error_hist.append(error)
+        paso = np.linalg.norm(x - x_old)
+        error = paso / np.linalg.norm(x)
+        _registrar_barrido(traza, A, b, x, k, paso)
+        yield k, vista, error
+
+def _barrido_gauss_seidel(A, b, x, x_old):
+    """
+    Un barrido de Gauss-Seidel sobre una matriz densa, actualizando x en el sitio.
+    """
+    n = A.shape[0]
+    for i in range(n):
+        suma1 = 0  # Suma de los términos ya calculados (índices menores que i)
+        suma2 = 0  # Suma de los términos no calculados (índices mayores que i)
         
-        # Actualizar vector solución
-        x = x_new.copy()
+        for j in range(0, i):
+            suma1 += A[i, j] * x[j]
+            
+        for j in range(i+1, n):
+            suma2 += A[i, j] * x_old[j]
+            
+        x[i] = (b[i] - suma1 - suma2) / A[i, i]
+
+def _barrido_gauss_seidel_csr(A, b):
+    """
+    Prepara los barridos de Gauss-Seidel sobre una MatrizCSR. Se actualiza x en el
+    sitio, así que cada fila ya usa los valores nuevos de las filas anteriores.
+    """
+    n = A.shape[0]
+    D = A.diagonal()
+    if np.any(D == 0):
+        raise ValueError("La diagonal de A contiene ceros; no se puede aplicar el método de Gauss-Seidel.")
+    
+    datos, indices, indptr = A.datos, A.indices, A.indptr
+    
+    def barrido(A, b, x, x_old):
+        for i in range(n):
+            ini, fin = indptr[i], indptr[i + 1]
+            # La suma incluye el término diagonal con el valor antiguo, que se descuenta
+            suma = datos[ini:fin] @ x[indices[ini:fin]] - D[i] * x[i]
+            x[i] = (b[i] - suma) / D[i]
+    
+    return barrido
+
+def _registrar_barrido(traza, A, b, x, k, paso):
+    """
+    Anota en la traza un barrido de Gauss-Seidel o SOR. El residuo b - Ax no lo
+    calcula el barrido, así que solo se obtiene (con un producto extra) si hay traza.
+    """
+    if not traza.activa:
+        return
+    traza.iteracion(k, np.linalg.norm(b - A @ x), paso)
+    traza.contar("barridos")
+    traza.contar("flops", 2 * elementos(A) + 4 * A.shape[0])
+
+def _recorrer(iteraciones, tol, max_iter, traza, nombre):
+    """
+    Recorre un generador de iteraciones (iterar_gauss_seidel, iterar_sor) hasta que el
+    error baja de tol o se alcanza max_iter.
+    
+    Retorna:
+    - x: Copia del último vector
+    - iter_count: Número de iteraciones realizadas
+    - error_hist: Historial de errores
+    """
+    error_hist = []
+    for k, x, error in islice(iteraciones, max_iter + 1):
+        if k == 0:
+            continue
+        error_hist.append(error)
         
         # Verificar convergencia
         if error < tol:
-            return x, k+1, error_hist
+            cerrar_traza(traza, True)
+            return x.copy(), k, error_hist
     
-    print(f"El método de Jacobi no convergió después de {max_iter} iteraciones.")
-    return x, max_iter, error_hist
+    cerrar_traza(traza, False)
+    print(f"El método {nombre} no convergió después de {max_iter} iteraciones.")
+    return x.copy(), max_iter, error_hist
 
-def gauss_seidel(A, b, x0=None, tol=1e-6, max_iter=100):
+def gauss_seidel(A, b, x0=None, tol=1e-6, max_iter=100, traza=None):
     """
     Implementa el método iterativo de Gauss-Seidel para resolver el sistema Ax = b.
+    Con una matriz dispersa cada barrido solo recorre los elementos guardados (O(nnz)).
+    Recorre iterar_gauss_seidel hasta la convergencia o max_iter.
     
     Parámetros:
-    - A: Matriz de coeficientes
+    - A: Matriz de coeficientes (densa, MatrizCSR o scipy.sparse)
     - b: Vector de términos independientes
     - x0: Vector inicial (si no se proporciona, se usa un vector de ceros)
     - tol: Tolerancia para la convergencia
     - max_iter: Número máximo de iteraciones
+    - traza: Traza opcional (instrumentacion.Traza) que registra cada iteración
     
     Retorna:
     - x: Vector solución
     - iter_count: Número de iteraciones realizadas
     - error_hist: Historial de errores
     """
+    return _recorrer(iterar_gauss_seidel(A, b, x0, traza), tol, max_iter, traza,
+                     "de Gauss-Seidel")
+
+def estimar_omega(A, iteraciones=50):
+    """
+    Estima el factor de relajación óptimo para SOR a partir del radio espectral ρ
+    de la matriz de iteración de Jacobi: ω = 2 / (1 + sqrt(1 - ρ²)).
+    ρ se aproxima con el método de la potencia, sin formar la matriz de iteración.
+    
+    Parámetros:
+    - A: Matriz de coeficientes (densa o dispersa)
+    - iteraciones: Número de pasos del método de la potencia
+    
+    Retorna:
+    - omega: Factor de relajación estimado (1.0 si no se puede estimar)
+    """
+    D, R = separar_diagonal(A)
+    if np.any(D == 0):
+        return 1.0
+    
+    v = np.random.default_rng(0).random(A.shape[0])
+    v /= np.linalg.norm(v)
+    rho = 0.0
+    for _ in range(iteraciones):
+        w = (R @ v) / D
+        rho = np.linalg.norm(w)
+        if rho == 0:
+            return 1.0
+        v = w / rho
+    
+    if rho >= 1:
+        return 1.0
+    return 2.0 / (1.0 + np.sqrt(1.0 - rho**2))
+
+def colorear_filas(A):
+    """
+    Reparte las incógnitas en clases de color de forma que dos incógnitas del mismo
+    color nunca estén acopladas (A[i, j] == 0 y A[j, i] == 0). Con el orden natural de
+    una malla de diferencias finitas se obtiene la ordenación rojo-negro.
+    
+    Parámetros:
+    - A: Matriz de coeficientes (densa o dispersa)
+    
+    Retorna:
+    - Lista de arrays con los índices de cada color
+    """
+    A = como_csr(A)
+    if not isinstance(A, MatrizCSR):
+        A = MatrizCSR.desde_densa(A)
+    
+    # Patrón simétrico sin diagonal: vecinos de cada incógnita
+    filas = A._filas
+    fuera = filas != A.indices
+    f, c = filas[fuera], A.indices[fuera]
+    grafo = MatrizCSR.desde_coordenadas(np.concatenate([f, c]), np.concatenate([c, f]),
+                                        np.ones(2 * f.size), A.shape)
+    
+    # Coloreado voraz en orden natural
+    n = A.shape[0]
+    colores = np.full(n, -1)
+    for i in range(n):
+        usados = colores[grafo.fila(i)[0]]
+        color = 0
+        while np.any(usados == color):
+            color += 1
+        colores[i] = color
+    
+    return [np.flatnonzero(colores == color) for color in range(colores.max() + 1)]
+
+def iterar_sor(A, b, x0=None, omega=None, ordenacion="natural", traza=None):
+    """
+    Genera las iteraciones del método SOR para Ax = b, una a una y sin límite.
+    Los parámetros son los de sor.
+    
+    Genera:
+    - (iteracion, x, error): primero (0, x0, None) y después cada barrido. x es una
+      vista de solo lectura sobre el vector de trabajo (sin copia)
+    """
+    A = como_csr(A)
     verificar_sistema(A, b)
     
+    if ordenacion not in ("natural", "multicolor"):
+        raise ValueError("La ordenación debe ser 'natural' o 'multicolor'.")
+    
+    if omega is None:
+        omega = estimar_omega(A)
+    if not 0 < omega < 2:
+        raise ValueError("El factor de relajación omega debe estar entre 0 y 2.")
+    
     # Dimensión del sistema
     n = A.shape[0]
+    D = A.diagonal() if isinstance(A, MatrizCSR) else np.diag(A).astype(float)
+    if np.any(D == 0):
+        raise ValueError("La diagonal de A contiene ceros; no se puede aplicar el método SOR.")
+    b = np.asarray(b, dtype=float)
     
     # Si no se proporciona vector inicial, usar ceros
     if x0 is None:
         x0 = np.zeros(n)
     
     # Inicializar vector solución
-    x = x0.copy()
+    x = np.array(x0, dtype=float)
+    vista = x.view()
+    vista.flags.writeable = False
     
-    # Historial de errores
-    error_hist = []
+    # Preparar los bloques de filas de cada color una sola vez
+    if ordenacion == "multicolor":
+        bloques = []
+        for idx in colorear_filas(A):
+            filas = A.submatriz_filas(idx) if isinstance(A, MatrizCSR) else np.asarray(A, dtype=float)[idx]
+            bloques.append((idx, filas, b[idx], D[idx]))
+    
+    traza = iniciar_traza(traza, "sor", n)
+    yield 0, vista, None
     
-    # Iterar hasta convergencia o máximo de iteraciones
-    for k in range(max_iter):
+    k = 0
+    while True:
+        k += 1
         x_old = x.copy()
         
-        # Calcular nuevos valores
-        for i in range(n):
-            suma1 = 0  # Suma de los términos ya calculados (índices menores que i)
-            suma2 = 0  # Suma de los términos no calculados (índices mayores que i)
-            
-            for j in range(0, i):
-                suma1 += A[i, j] * x[j]
-                
-            for j in range(i+1, n):
-                suma2 += A[i, j] * x_old[j]
-                
-            x[i] = (b[i] - suma1 - suma2) / A[i, i]
+        if ordenacion == "multicolor":
+            for idx, filas, b_c, D_c in bloques:
+                x[idx] += omega * (b_c - filas @ x) / D_c
+        elif isinstance(A, MatrizCSR):
+            datos, indices, indptr = A.datos, A.indices, A.indptr
+            for i in range(n):
+                ini, fin = indptr[i], indptr[i + 1]
+                x[i] += omega * (b[i] - datos[ini:fin] @ x[indices[ini:fin]]) / D[i]
+        else:
+            for i in range(n):
+                x[i] += omega * (b[i] - A[i] @ x) / D[i]
         
         # Calcular error
-        error = np.linalg.norm(x - x_old) / np.linalg.norm(x)
-        error_hist.append(error)
+        paso = np.linalg.norm(x - x_old)
+        error = paso / np.linalg.norm(x)
+        _registrar_barrido(traza, A, b, x, k, paso)
+        yield k, vista, error
+
+def sor(A, b, x0=None, tol=1e-6, max_iter=100, omega=None, ordenacion="natural", traza=None):
+    """
+    Implementa el método de sobrerrelajación sucesiva (SOR) para resolver Ax = b.
+    Con omega = 1 coincide con Gauss-Seidel. Recorre iterar_sor hasta la convergencia
+    o max_iter.
+    
+    Con ordenacion="multicolor" las incógnitas se agrupan en colores (rojo-negro en
+    mallas de diferencias finitas) y cada color se actualiza con una sola operación
+    vectorial, ya que sus incógnitas no dependen entre sí.
+    
+    Parámetros:
+    - A: Matriz de coeficientes (densa, MatrizCSR o scipy.sparse)
+    - b: Vector de términos independientes
+    - x0: Vector inicial (si no se proporciona, se usa un vector de ceros)
+    - tol: Tolerancia para la convergencia
+    - max_iter: Número máximo de iteraciones
+    - omega: Factor de relajación entre 0 y 2 (si no se proporciona, se estima)
+    - ordenacion: "natural" o "multicolor"
+    - traza: Traza opcional (instrumentacion.Traza) que registra cada iteración
+    
+    Retorna:
+    - x: Vector solución
+    - iter_count: Número de iteraciones realizadas
+    - error_hist: Historial de errores
+    """
+    return _recorrer(iterar_sor(A, b, x0, omega, ordenacion, traza), tol, max_iter, traza,
+                     "SOR")
+
+def gauss_seidel_rojo_negro(A, b, x0=None, tol=1e-6, max_iter=100, traza=None):
+    """
+    Gauss-Seidel con ordenación multicolor (rojo-negro): cada color se actualiza
+    con una operación vectorial. Es SOR con omega = 1 y ordenacion="multicolor".
+    """
+    return sor(A, b, x0, tol, max_iter, omega=1.0, ordenacion="multicolor", traza=traza)
+
+def _bloque_diagonal(A, ini, fin):
+    """
+    Retorna como matriz densa el bloque diagonal A[ini:fin, ini:fin].
+    """
+    if not isinstance(A, MatrizCSR):
+        return np.asarray(A[ini:fin, ini:fin], dtype=float)
+    
+    bloque = np.zeros((fin - ini, fin - ini))
+    for i in range(ini, fin):
+        columnas, valores = A.fila(i)
+        dentro = (columnas >= ini) & (columnas < fin)
+        bloque[i - ini, columnas[dentro] - ini] = valores[dentro]
+    return bloque
+
+def iterar_jacobi_bloques(A, b, x0=None, tam_bloque=256, hilos=None, traza=None):
+    """
+    Genera las iteraciones del método de Jacobi por bloques para Ax = b, sin límite.
+    
+    Las filas se dividen en bloques de tam_bloque; en cada iteración cada bloque se
+    actualiza con x_i = x_i + A_ii⁻¹ (b_i - A_i x), usando solo el x de la iteración
+    anterior. Los bloques son independientes, así que se reparten entre varios hilos
+    que escriben en partes distintas del mismo vector; numpy libera el GIL en los
+    productos, de modo que los hilos trabajan a la vez en varios núcleos.
+    
+    La inversa de cada bloque diagonal se obtiene una sola vez de su factorización
+    LU, y cada actualización es un producto matriz-vector. Cada bloque hace siempre
+    las mismas operaciones, así que el resultado no depende del número de hilos.
+    
+    Parámetros:
+    - A: Matriz de coeficientes (densa, MatrizCSR o scipy.sparse)
+    - b: Vector de términos independientes
+    - x0: Vector inicial (si no se proporciona, se usa un vector de ceros)
+    - tam_bloque: Número de filas de cada bloque
+    - hilos: Número de hilos (por defecto, todos los núcleos)
+    - traza: Traza opcional (instrumentacion.Traza) que registra cada iteración
+    
+    Genera:
+    - (iteracion, x, error): primero (0, x0, None) y después cada iteración. x es una
+      vista de solo lectura sobre el vector de trabajo (sin copia)
+    """
+    A = como_csr(A)
+    # La dominancia diagonal por filas es el criterio de Jacobi punto a punto; con
+    # bloques converge en más casos, así que solo se avisa con tam_bloque = 1
+    verificar_sistema(A, b, avisar=tam_bloque == 1)
+    if tam_bloque < 1:
+        raise ValueError("El tamaño de bloque debe ser al menos 1.")
+    
+    # Dimensión del sistema
+    n = A.shape[0]
+    b = np.asarray(b, dtype=float)
+    
+    # Si no se proporciona vector inicial, usar ceros
+    if x0 is None:
+        x0 = np.zeros(n)
+    
+    # Inicializar solución y el vector de la iteración siguiente
+    x = np.array(x0, dtype=float)
+    x_new = np.empty(n)
+    residuo = np.empty(n)
+    vista = x.view()
+    vista.flags.writeable = False
+    
+    def preparar(ini):
+        # Filas, inversa del bloque diagonal y filas de A del bloque
+        fin = min(ini + tam_bloque, n)
+        try:
+            inversa = FactorizacionLU(_bloque_diagonal(A, ini, fin)).inversa()
+        except ValueError:
+            raise ValueError(f"El bloque diagonal de las filas {ini}-{fin - 1} es singular; "
+                             "no se puede aplicar el método de Jacobi por bloques.")
+        filas = A.submatriz_filas(np.arange(ini, fin)) if isinstance(A, MatrizCSR) else A[ini:fin]
+        return ini, fin, inversa, filas
+    
+    def actualizar(bloque):
+        ini, fin, inversa, filas = bloque
+        residuo[ini:fin] = b[ini:fin] - filas @ x
+        x_new[ini:fin] = x[ini:fin] + inversa @ residuo[ini:fin]
+    
+    traza = iniciar_traza(traza, "jacobi_bloques", n)
+    with ThreadPoolExecutor(max_workers=hilos or os.cpu_count()) as hilos_trabajo:
+        # Las factorizaciones de los bloques también se reparten entre los hilos
+        bloques = list(hilos_trabajo.map(preparar, range(0, n, tam_bloque)))
+        yield 0, vista, None
         
-        # Verificar convergencia
-        if error < tol:
-            return x, k+1, error_hist
+        k = 0
+        while True:
+            k += 1
+            # Esperar a que terminen todos los bloques antes de pasar a la siguiente iteración
+            list(hilos_trabajo.map(actualizar, bloques))
+            
+            # Calcular error
+            paso = np.linalg.norm(x_new - x)
+            x[:] = x_new
+            error = paso / np.linalg.norm(x)
+            
+            if traza.activa:
+                # El residuo de la iteración anterior ya se ha calculado por bloques
+                traza.iteracion(k, np.linalg.norm(residuo), paso)
+                traza.contar("productos_matriz_vector")
+                traza.contar("flops", 2 * elementos(A) + 2 * n * tam_bloque + 4 * n)
+            yield k, vista, error
+
+def jacobi_bloques(A, b, x0=None, tol=1e-6, max_iter=100, tam_bloque=256, hilos=None, traza=None):
+    """
+    Método de Jacobi por bloques en paralelo con hilos (ver iterar_jacobi_bloques).
+    Con tam_bloque = 1 coincide con Jacobi; con bloques más grandes converge en
+    menos iteraciones y aprovecha varios núcleos en sistemas grandes.
     
-    print(f"El método de Gauss-Seidel no convergió después de {max_iter} iteraciones.")
-    return x, max_iter, error_hist
+    Parámetros:
+    - A: Matriz de coeficientes (densa, MatrizCSR o scipy.sparse)
+    - b: Vector de términos independientes
+    - x0: Vector inicial (si no se proporciona, se usa un vector de ceros)
+    - tol: Tolerancia para la convergencia
+    - max_iter: Número máximo de iteraciones
+    - tam_bloque: Número de filas de cada bloque
+    - hilos: Número de hilos (por defecto, todos los núcleos)
+    - traza: Traza opcional (instrumentacion.Traza) que registra cada iteración
+    
+    Retorna:
+    - x: Vector solución
+    - iter_count: Número de iteraciones realizadas
+    - error_hist: Historial de errores
+    """
+    return _recorrer(iterar_jacobi_bloques(A, b, x0, tam_bloque, hilos, traza), tol, max_iter,
+                     traza, "de Jacobi por bloques")
+
+class ContextoSolucion:
+    """
+    Caché de soluciones recientes para arrancar los métodos iterativos desde la
+    solución de un sistema parecido (por ejemplo, en un barrido de parámetros donde
+    cada sistema cambia poco respecto al anterior) en lugar de desde cero.
+    
+    Cada sistema se identifica por una firma barata de la matriz, A @ s con un
+    vector de sonda s fijo, que cambia poco si la matriz cambia poco, y por su
+    término independiente. Para un sistema nuevo se busca el guardado más cercano
+    con la misma forma y su solución se usa como x0 solo si tiene menos residuo
+    que empezar desde cero. Cada sistema ocupa una sola entrada, y cuando el tamaño
+    total supera max_bytes se descartan las soluciones menos usadas.
+    
+    Parámetros:
+    - max_bytes: Tamaño máximo de las soluciones guardadas
+    - distancia_misma: Distancia (relativa, de firma y término independiente) por
+      debajo de la cual dos sistemas se consideran el mismo
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, distancia_misma=1e-10):
+        self.max_bytes = max_bytes
+        self.distancia_misma = distancia_misma
+        self.aciertos = 0
+        self.fallos = 0
+        self._entradas = OrderedDict()
+        self._bytes = 0
+        self._siguiente = 0
+        self._sondas = {}
+
+    def __len__(self):
+        return len(self._entradas)
+
+    @property
+    def bytes_usados(self):
+        return self._bytes
+
+    def firma(self, A):
+        """
+        Retorna la firma de la matriz: su producto por un vector de sonda fijo.
+        """
+        n = A.shape[1]
+        if n not in self._sondas:
+            self._sondas[n] = np.random.default_rng(n).standard_normal(n)
+        return A @ self._sondas[n]
+
+    def _mas_cercana(self, firma, b):
+        """
+        Retorna (clave, distancia) de la entrada con la misma forma más cercana a
+        (firma, b), o (None, inf) si no hay ninguna. La distancia es la suma de las
+        diferencias relativas de la firma y del término independiente.
+        """
+        mejor, distancia_mejor = None, np.inf
+        norma_firma = np.linalg.norm(firma) or 1.0
+        norma_b = np.linalg.norm(b) or 1.0
+        for clave, (firma_e, b_e, x_e) in self._entradas.items():
+            if b_e.shape != b.shape or firma_e.shape != firma.shape:
+                continue
+            distancia = (np.linalg.norm(firma - firma_e) / norma_firma
+                         + np.linalg.norm(b - b_e) / norma_b)
+            if distancia < distancia_mejor:
+                mejor, distancia_mejor = clave, distancia
+        return mejor, distancia_mejor
+
+    def _buscar(self, A, firma, b):
+        """
+        Retorna la clave de la entrada más cercana a (firma, b) que mejora el
+        residuo de x0 = 0, o None si no hay ninguna.
+        """
+        mejor, _ = self._mas_cercana(firma, b)
+        if mejor is None:
+            return None
+        x_e = self._entradas[mejor][2]
+        # Escrito así para rechazar también un residuo nan
+        if not np.linalg.norm(b - A @ x_e) < np.linalg.norm(b):
+            return None
+        return mejor
+
+    def sugerir_x0(self, A, b):
+        """
+        Retorna una copia de la solución guardada más adecuada como vector inicial
+        para Ax = b, o None si no hay ninguna útil.
+        """
+        A = como_csr(A)
+        b = np.asarray(b, dtype=float)
+        clave = self._buscar(A, self.firma(A), b)
+        if clave is None:
+            self.fallos += 1
+            return None
+        
+        self.aciertos += 1
+        self._entradas.move_to_end(clave)
+        return self._entradas[clave][2].copy()
+
+    def guardar(self, A, b, x):
+        """
+        Guarda la solución x del sistema Ax = b. Si ya hay una entrada del mismo
+        sistema (a distancia menor que distancia_misma) se sustituye en lugar de
+        añadir otra. Las soluciones con nan o inf no se guardan.
+        """
+        x = np.array(x, dtype=float)
+        if not np.all(np.isfinite(x)):
+            return
+        
+        A = como_csr(A)
+        entrada = (self.firma(A), np.array(b, dtype=float), x)
+        tamano = sum(v.nbytes for v in entrada)
+        if tamano > self.max_bytes:
+            return
+        
+        clave, distancia = self._mas_cercana(entrada[0], entrada[1])
+        if clave is not None and distancia < self.distancia_misma:
+            self._bytes -= sum(v.nbytes for v in self._entradas[clave])
+            self._entradas[clave] = entrada
+            self._entradas.move_to_end(clave)
+        else:
+            clave = self._siguiente
+            self._siguiente += 1
+            self._entradas[clave] = entrada
+        
+        self._bytes += tamano
+        while self._bytes > self.max_bytes:
+            _, descartada = self._entradas.popitem(last=False)
+            self._bytes -= sum(v.nbytes for v in descartada)
+
+    def resolver(self, metodo, A, b, *args, **kwargs):
+        """
+        Resuelve Ax = b con metodo(A, b, x0, *args, **kwargs) (jacobi, gauss_seidel,
+        sor, gmres...) arrancando desde la solución guardada más cercana, y guarda
+        la solución obtenida si el método ha convergido.
+        
+        Retorna:
+        - Lo mismo que metodo
+        """
+        x0 = self.sugerir_x0(A, b)
+        x, iteraciones, errores = resultado = metodo(A, b, x0, *args, **kwargs)
+        
+        # tol y max_iter tal como los ha recibido el método (o sus valores por defecto)
+        parametros = inspect.signature(metodo).bind(A, b, x0, *args, **kwargs)
+        parametros.apply_defaults()
+        if convergido(iteraciones, errores, parametros.arguments["tol"],
+                      parametros.arguments["max_iter"]):
+            self.guardar(A, b, x)
+        return resultado
+
+    def estadisticas(self):
+        """
+        Retorna un diccionario con aciertos, fallos, entradas y bytes usados.
+        """
+        return {"aciertos": self.aciertos, "fallos": self.fallos,
+                "entradas": len(self._entradas), "bytes": self._bytes}
+
+    def limpiar(self):
+        """
+        Descarta todas las soluciones guardadas y pone a cero las estadísticas.
+        """
+        self._entradas.clear()
+        self._bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+
+def convergido(iteraciones, errores, tol, max_iter):
+    """
+    Indica si un método iterativo ha convergido a partir de lo que retorna:
+    menos de max_iter iteraciones (en todas las columnas, si hay varias) o último
+    error por debajo de tol.
+    """
+    if np.all(np.asarray(iteraciones) < max_iter):
+        return True
+    if len(errores) == 0:
+        return False
+    # Con varias columnas las ya congeladas aparecen como nan
+    ultimo = np.atleast_1d(np.asarray(errores[-1], dtype=float))
+    ultimo = ultimo[~np.isnan(ultimo)]
+    return ultimo.size > 0 and bool(np.all(ultimo < tol))
+
+_contexto = ContextoSolucion()
 
 def resolver_sistema_iterativo():
     """
@@ -161,7 +837,7 @@ def resolver_sistema_iterativo():
     """
     print("\n--- RESOLVER SISTEMA ITERATIVO ---")
     print("Primero, vamos a ingresar la matriz de coeficientes A:")
-    A = leer_matriz()
+    A = leer_matriz(densa=False)
     if A is None:
         return None, None, None
     
@@ -175,9 +851,30 @@ def resolver_sistema_iterativo():
     print("\nSelecciona el método iterativo:")
     print("1. Jacobi")
     print("2. Gauss-Seidel")
+    print("3. SOR (sobrerrelajación sucesiva)")
+    print("4. Gauss-Seidel rojo-negro (multicolor)")
+    print("5. Gradiente conjugado (matrices simétricas definidas positivas)")
+    print("6. GMRES")
+    print("7. BiCGSTAB")
+    print("8. Jacobi por bloques (en paralelo)")
     
     metodo = input("Método: ")
     
+    precondicionador = None
+    if metodo in ("5", "6", "7"):
+        print("Precondicionador: 0. Ninguno  1. Jacobi  2. SSOR  3. ILU(0)")
+        opcion = input("Precondicionador (por defecto 0): ") or "0"
+        precondicionador = {"1": "jacobi", "2": "ssor", "3": "ilu0"}.get(opcion)
+    
+    tam_bloque = 256
+    if metodo == "8":
+        tam_bloque = int(input("Filas por bloque (por defecto 256): ") or "256")
+    
+    omega = None
+    if metodo == "3":
+        entrada = input("Factor de relajación omega (vacío para estimarlo): ")
+        omega = float(entrada) if entrada.strip() else None
+    
     # Pedir parámetros adicionales
     tol = float(input("Tolerancia (por defecto 1e-6): ") or "1e-6")
     max_iter = int(input("Máximo de iteraciones (por defecto 100): ") or "100")
@@ -190,17 +887,46 @@ def resolver_sistema_iterativo():
         print("Introduce los elementos del vector inicial x0:")
         for i in range(A.shape[0]):
             x0[i] = float(input(f"x0[{i}]: "))
-    
-    if metodo == "1":
-        print("\nResolviendo sistema con el método de Jacobi...")
-        x, iteraciones, errores = jacobi(A, b, x0, tol, max_iter)
-    elif metodo == "2":
-        print("\nResolviendo sistema con el método de Gauss-Seidel...")
-        x, iteraciones, errores = gauss_seidel(A, b, x0, tol, max_iter)
     else:
-        print("Opción no válida.")
+        # Partir de la solución de un sistema anterior parecido, si la hay
+        x0 = _contexto.sugerir_x0(A, b)
+        if x0 is not None:
+            print("Se parte de la solución de un sistema anterior parecido.")
+    
+    try:
+        if metodo == "1":
+            print("\nResolviendo sistema con el método de Jacobi...")
+            x, iteraciones, errores = jacobi(A, b, x0, tol, max_iter)
+        elif metodo == "2":
+            print("\nResolviendo sistema con el método de Gauss-Seidel...")
+            x, iteraciones, errores = gauss_seidel(A, b, x0, tol, max_iter)
+        elif metodo == "3":
+            print("\nResolviendo sistema con el método SOR...")
+            x, iteraciones, errores = sor(A, b, x0, tol, max_iter, omega)
+        elif metodo == "4":
+            print("\nResolviendo sistema con Gauss-Seidel rojo-negro...")
+            x, iteraciones, errores = gauss_seidel_rojo_negro(A, b, x0, tol, max_iter)
+        elif metodo == "5":
+            print("\nResolviendo sistema con el método del gradiente conjugado...")
+            x, iteraciones, errores = gradiente_conjugado(A, b, x0, tol, max_iter, precondicionador)
+        elif metodo == "6":
+            print("\nResolviendo sistema con el método GMRES...")
+            x, iteraciones, errores = gmres(A, b, x0, tol, max_iter, precondicionador)
+        elif metodo == "7":
+            print("\nResolviendo sistema con el método BiCGSTAB...")
+            x, iteraciones, errores = bicgstab(A, b, x0, tol, max_iter, precondicionador)
+        elif metodo == "8":
+            print("\nResolviendo sistema con el método de Jacobi por bloques...")
+            x, iteraciones, errores = jacobi_bloques(A, b, x0, tol, max_iter, tam_bloque)
+        else:
+            print("Opción no válida.")
+            return None, None, None
+    except ValueError as e:
+        print("Error:", e)
         return None, None, None
     
+    if convergido(iteraciones, errores, tol, max_iter):
+        _contexto.guardar(A, b, x)
     return x, iteraciones, errores
 
 def mostrar_resultados_iterativos(x, iteraciones, errores):
@@ -0,0 +1,406 @@
+import numpy as np
+from matriz_dispersa import MatrizCSR, como_csr
+from instrumentacion import iniciar_traza, elementos
+
+def _verificar_dimensiones(A, b):
+    """
+    Verifica que A sea cuadrada y compatible con b.
+    """
+    if A.shape[0] != A.shape[1]:
+        raise ValueError("La matriz A debe ser cuadrada")
+
+    if A.shape[0] != b.shape[0]:
+        raise ValueError("Las dimensiones de A y b no son compatibles")
+
+def _partes_triangulares(A):
+    """
+    Separa una MatrizCSR en su parte estrictamente inferior, su diagonal y su parte
+    estrictamente superior.
+    """
+    filas = A._filas
+    partes = []
+    for mascara in (A.indices < filas, A.indices > filas):
+        indptr = np.zeros(A.shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(filas[mascara], minlength=A.shape[0]), out=indptr[1:])
+        partes.append(MatrizCSR(A.datos[mascara], A.indices[mascara], indptr, A.shape))
+    return partes[0], A.diagonal(), partes[1]
+
+def _sustitucion_csr(T, diag, rhs, inferior=True):
+    """
+    Resuelve (diag + T) y = rhs, con T estrictamente triangular en formato CSR.
+    Cada fila solo recorre sus elementos guardados, así que el coste es O(nnz).
+    """
+    n = T.shape[0]
+    y = np.zeros(n)
+    datos, indices, indptr = T.datos, T.indices, T.indptr
+    orden = range(n) if inferior else range(n - 1, -1, -1)
+    for i in orden:
+        ini, fin = indptr[i], indptr[i + 1]
+        y[i] = (rhs[i] - datos[ini:fin] @ y[indices[ini:fin]]) / diag[i]
+    return y
+
+def precondicionador_jacobi(A):
+    """
+    Precondicionador diagonal: M = diag(A).
+
+    Retorna:
+    - Función que aplica M⁻¹ a un vector
+    """
+    A = como_csr(A)
+    d = A.diagonal() if isinstance(A, MatrizCSR) else np.diag(A).astype(float)
+    if np.any(d == 0):
+        raise ValueError("La diagonal de A contiene ceros; no se puede usar el precondicionador de Jacobi.")
+    return lambda r: r / d
+
+def precondicionador_ssor(A, omega=1.0):
+    """
+    Precondicionador SSOR: M = (D + ωL) D⁻¹ (D + ωU) / (ω(2 - ω)).
+    Para omega = 1 es el precondicionador de Gauss-Seidel simétrico.
+
+    Retorna:
+    - Función que aplica M⁻¹ a un vector
+    """
+    if not 0 < omega < 2:
+        raise ValueError("El factor de relajación omega debe estar entre 0 y 2.")
+
+    A = como_csr(A)
+    if not isinstance(A, MatrizCSR):
+        A = MatrizCSR.desde_densa(A)
+    L, d, U = _partes_triangulares(A)
+    if np.any(d == 0):
+        raise ValueError("La diagonal de A contiene ceros; no se puede usar el precondicionador SSOR.")
+
+    # Se escalan las partes triangulares por omega una sola vez
+    L.datos = omega * L.datos
+    U.datos = omega * U.datos
+
+    def aplicar(r):
+        y = _sustitucion_csr(L, d, omega * (2 - omega) * r, inferior=True)
+        return _sustitucion_csr(U, d, d * y, inferior=False)
+
+    return aplicar
+
+def precondicionador_ilu0(A):
+    """
+    Precondicionador LU incompleto sin relleno, ILU(0): L y U conservan el patrón de
+    elementos distintos de cero de A.
+
+    Retorna:
+    - Función que aplica M⁻¹ = (LU)⁻¹ a un vector
+    """
+    A = como_csr(A)
+    if not isinstance(A, MatrizCSR):
+        A = MatrizCSR.desde_densa(A)
+
+    n = A.shape[0]
+    datos = A.datos.copy()
+    indices, indptr = A.indices, A.indptr
+    diag_pos = np.full(n, -1)
+    en_diagonal = np.flatnonzero(A._filas == indices)
+    diag_pos[A._filas[en_diagonal]] = en_diagonal
+    if np.any(diag_pos < 0):
+        raise ValueError("La diagonal de A contiene ceros; no se puede calcular ILU(0).")
+
+    # Variante IKJ restringida al patrón de A
+    for i in range(1, n):
+        ini, fin = indptr[i], indptr[i + 1]
+        cols_i = indices[ini:fin]
+        for p in range(ini, fin):
+            k = indices[p]
+            if k >= i:
+                break
+            if datos[diag_pos[k]] == 0:
+                raise ValueError("Pivote cero durante la factorización ILU(0).")
+            datos[p] /= datos[diag_pos[k]]
+
+            # Restar a_ik * a_kj solo donde (i, j) pertenece al patrón
+            ini_k, fin_k = diag_pos[k] + 1, indptr[k + 1]
+            cols_k = indices[ini_k:fin_k]
+            pos = np.searchsorted(cols_i, cols_k)
+            dentro = (pos < cols_i.size)
+            dentro[dentro] = cols_i[pos[dentro]] == cols_k[dentro]
+            datos[ini + pos[dentro]] -= datos[p] * datos[ini_k:fin_k][dentro]
+
+    LU = MatrizCSR(datos, indices, indptr, A.shape)
+    L, d, U = _partes_triangulares(LU)
+    if np.any(d == 0):
+        raise ValueError("Pivote cero durante la factorización ILU(0).")
+    unos = np.ones(n)
+
+    def aplicar(r):
+        y = _sustitucion_csr(L, unos, r, inferior=True)
+        return _sustitucion_csr(U, d, y, inferior=False)
+
+    return aplicar
+
+def crear_precondicionador(A, tipo):
+    """
+    Construye un precondicionador a partir de su nombre.
+
+    Parámetros:
+    - A: Matriz de coeficientes
+    - tipo: None, "jacobi", "ssor", "ilu0" o una función que ya aplica M⁻¹
+
+    Retorna:
+    - Función que aplica M⁻¹ a un vector
+    """
+    if tipo is None:
+        return lambda r: r
+    if callable(tipo):
+        return tipo
+    if tipo == "jacobi":
+        return precondicionador_jacobi(A)
+    if tipo == "ssor":
+        return precondicionador_ssor(A)
+    if tipo == "ilu0":
+        return precondicionador_ilu0(A)
+    raise ValueError(f"Precondicionador desconocido: {tipo}")
+
+def _preparar(A, b, x0):
+    A = como_csr(A)
+    b = np.asarray(b, dtype=float)
+    _verificar_dimensiones(A, b)
+    x = np.zeros(A.shape[0]) if x0 is None else np.array(x0, dtype=float)
+    norma_b = np.linalg.norm(b)
+    return A, b, x, norma_b if norma_b > 0 else 1.0
+
+def gradiente_conjugado(A, b, x0=None, tol=1e-6, max_iter=100, precondicionador=None, traza=None):
+    """
+    Implementa el método del gradiente conjugado (precondicionado) para Ax = b.
+    Requiere que A sea simétrica y definida positiva.
+
+    Parámetros:
+    - A: Matriz de coeficientes (densa, MatrizCSR o scipy.sparse)
+    - b: Vector de términos independientes
+    - x0: Vector inicial (si no se proporciona, se usa un vector de ceros)
+    - tol: Tolerancia para la convergencia (sobre ||r|| / ||b||)
+    - max_iter: Número máximo de iteraciones
+    - precondicionador: None, "jacobi", "ssor", "ilu0" o función que aplica M⁻¹
+    - traza: Traza opcional (instrumentacion.Traza) que registra cada iteración
+
+    Retorna:
+    - x: Vector solución
+    - iter_count: Número de iteraciones realizadas
+    - error_hist: Historial del residuo relativo
+    """
+    A, b, x, norma_b = _preparar(A, b, x0)
+    M = crear_precondicionador(A, precondicionador)
+
+    r = b - A @ x
+    z = M(r)
+    p = z.copy()
+    rz = r @ z
+    error_hist = []
+    traza = iniciar_traza(traza, "gradiente_conjugado", A.shape[0])
+
+    for k in range(max_iter):
+        Ap = A @ p
+        pAp = p @ Ap
+        if pAp <= 0:
+            traza.finalizar(False)
+            print("La matriz no es definida positiva; el gradiente conjugado no puede continuar.")
+            return x, k, error_hist
+
+        alpha = rz / pAp
+        x += alpha * p
+        r -= alpha * Ap
+
+        error = np.linalg.norm(r) / norma_b
+        error_hist.append(error)
+        if traza.activa:
+            traza.iteracion(k + 1, error * norma_b, abs(alpha) * np.linalg.norm(p))
+            traza.contar("productos_matriz_vector")
+            traza.contar("aplicaciones_precondicionador")
+            traza.contar("flops", 2 * elementos(A) + 12 * A.shape[0])
+        if error < tol:
+            traza.finalizar(True)
+            return x, k+1, error_hist
+
+        z = M(r)
+        rz_nuevo = r @ z
+        p = z + (rz_nuevo / rz) * p
+        rz = rz_nuevo
+
+    traza.finalizar(False)
+    print(f"El método del gradiente conjugado no convergió después de {max_iter} iteraciones.")
+    return x, max_iter, error_hist
+
+def gmres(A, b, x0=None, tol=1e-6, max_iter=100, precondicionador=None, reinicio=30,
+          traza=None):
+    """
+    Implementa GMRES con reinicio y precondicionamiento por la derecha para Ax = b.
+    Sirve para matrices no simétricas.
+
+    Parámetros:
+    - A: Matriz de coeficientes (densa, MatrizCSR o scipy.sparse)
+    - b: Vector de términos independientes
+    - x0: Vector inicial (si no se proporciona, se usa un vector de ceros)
+    - tol: Tolerancia para la convergencia (sobre ||r|| / ||b||)
+    - max_iter: Número máximo de iteraciones (productos matriz-vector)
+    - precondicionador: None, "jacobi", "ssor", "ilu0" o función que aplica M⁻¹
+    - reinicio: Dimensión máxima del subespacio de Krylov antes de reiniciar
+    - traza: Traza opcional (instrumentacion.Traza) que registra cada iteración
+
+    Retorna:
+    - x: Vector solución
+    - iter_count: Número de iteraciones realizadas
+    - error_hist: Historial del residuo relativo
+    """
+    A, b, x, norma_b = _preparar(A, b, x0)
+    M = crear_precondicionador(A, precondicionador)
+    n = A.shape[0]
+    m = min(reinicio, n)
+    error_hist = []
+    k = 0
+    traza = iniciar_traza(traza, "gmres", n)
+
+    while k < max_iter:
+        r = b - A @ x
+        beta = np.linalg.norm(r)
+        traza.contar("productos_matriz_vector")
+        if beta / norma_b < tol:
+            traza.finalizar(True)
+            return x, k, error_hist
+
+        V = np.zeros((m + 1, n))
+        H = np.zeros((m + 1, m))
+        cs = np.zeros(m)
+        sn = np.zeros(m)
+        g = np.zeros(m + 1)
+        g[0] = beta
+        V[0] = r / beta
+
+        for j in range(m):
+            # Arnoldi con Gram-Schmidt modificado
+            w = A @ M(V[j])
+            for i in range(j + 1):
+                H[i, j] = w @ V[i]
+                w -= H[i, j] * V[i]
+            h_siguiente = np.linalg.norm(w)
+            H[j + 1, j] = h_siguiente
+
+            # Aplicar las rotaciones de Givens anteriores y calcular la nueva
+            for i in range(j):
+                h = H[i, j]
+                H[i, j] = cs[i] * h + sn[i] * H[i + 1, j]
+                H[i + 1, j] = -sn[i] * h + cs[i] * H[i + 1, j]
+            rho = np.hypot(H[j, j], H[j + 1, j])
+            cs[j], sn[j] = H[j, j] / rho, H[j + 1, j] / rho
+            H[j, j] = rho
+            H[j + 1, j] = 0.0
+            g[j + 1] = -sn[j] * g[j]
+            g[j] = cs[j] * g[j]
+
+            k += 1
+            error = abs(g[j + 1]) / norma_b
+            error_hist.append(error)
+            if traza.activa:
+                # x solo se actualiza al reiniciar, así que no hay norma del paso
+                traza.iteracion(k, abs(g[j + 1]))
+                traza.contar("productos_matriz_vector")
+                traza.contar("aplicaciones_precondicionador")
+                traza.contar("flops", 2 * elementos(A) + 4 * (j + 1) * n + 8 * j)
+
+            if h_siguiente > 0:
+                V[j + 1] = w / h_siguiente
+            if error < tol or k >= max_iter or h_siguiente == 0:
+                break
+
+        # Resolver el sistema triangular de Hessenberg reducido y actualizar x
+        y = np.zeros(j + 1)
+        for i in range(j, -1, -1):
+            y[i] = (g[i] - H[i, i + 1:j + 1] @ y[i + 1:]) / H[i, i]
+        x += M(V[:j + 1].T @ y)
+        traza.contar("aplicaciones_precondicionador")
+        traza.contar("reinicios")
+
+        if error < tol:
+            traza.finalizar(True)
+            return x, k, error_hist
+
+    traza.finalizar(False)
+    print(f"El método GMRES no convergió después de {max_iter} iteraciones.")
+    return x, max_iter, error_hist
+
+def bicgstab(A, b, x0=None, tol=1e-6, max_iter=100, precondicionador=None, traza=None):
+    """
+    Implementa BiCGSTAB con precondicionamiento por la derecha para Ax = b.
+    Sirve para matrices no simétricas y usa memoria constante por iteración.
+
+    Parámetros:
+    - A: Matriz de coeficientes (densa, MatrizCSR o scipy.sparse)
+    - b: Vector de términos independientes
+    - x0: Vector inicial (si no se proporciona, se usa un vector de ceros)
+    - tol: Tolerancia para la convergencia (sobre ||r|| / ||b||)
+    - max_iter: Número máximo de iteraciones
+    - precondicionador: None, "jacobi", "ssor", "ilu0" o función que aplica M⁻¹
+    - traza: Traza opcional (instrumentacion.Traza) que registra cada iteración
+
+    Retorna:
+    - x: Vector solución
+    - iter_count: Número de iteraciones realizadas
+    - error_hist: Historial del residuo relativo
+    """
+    A, b, x, norma_b = _preparar(A, b, x0)
+    M = crear_precondicionador(A, precondicionador)
+
+    r = b - A @ x
+    r_hat = r.copy()
+    rho = alpha = omega = 1.0
+    v = np.zeros_like(x)
+    p = np.zeros_like(x)
+    error_hist = []
+    traza = iniciar_traza(traza, "bicgstab", A.shape[0])
+
+    for k in range(max_iter):
+        rho_nuevo = r_hat @ r
+        if rho_nuevo == 0:
+            traza.finalizar(False)
+            print("BiCGSTAB se ha interrumpido (rho = 0).")
+            return x, k, error_hist
+        beta = (rho_nuevo / rho) * (alpha / omega)
+        rho = rho_nuevo
+        p = r + beta * (p - omega * v)
+
+        p_hat = M(p)
+        v = A @ p_hat
+        alpha = rho / (r_hat @ v)
+        s = r - alpha * v
+
+        if np.linalg.norm(s) / norma_b < tol:
+            x += alpha * p_hat
+            error_hist.append(np.linalg.norm(s) / norma_b)
+            if traza.activa:
+                traza.iteracion(k + 1, np.linalg.norm(s), abs(alpha) * np.linalg.norm(p_hat))
+                traza.contar("productos_matriz_vector")
+                traza.contar("aplicaciones_precondicionador")
+                traza.contar("flops", 2 * elementos(A) + 10 * A.shape[0])
+            traza.finalizar(True)
+            return x, k+1, error_hist
+
+        s_hat = M(s)
+        t = A @ s_hat
+        tt = t @ t
+        omega = (t @ s) / tt if tt > 0 else 0.0
+        paso = alpha * p_hat + omega * s_hat
+        x += paso
+        r = s - omega * t
+
+        error = np.linalg.norm(r) / norma_b
+        error_hist.append(error)
+        if traza.activa:
+            traza.iteracion(k + 1, error * norma_b, np.linalg.norm(paso))
+            traza.contar("productos_matriz_vector", 2)
+            traza.contar("aplicaciones_precondicionador", 2)
+            traza.contar("flops", 4 * elementos(A) + 22 * A.shape[0])
+        if error < tol:
+            traza.finalizar(True)
+            return x, k+1, error_hist
+        if omega == 0:
+            traza.finalizar(False)
+            print("BiCGSTAB se ha interrumpido (omega = 0).")
+            return x, k+1, error_hist
+
+    traza.finalizar(False)
+    print(f"El método BiCGSTAB no convergió después de {max_iter} iteraciones.")
+    return x, max_iter, error_hist
@@ -1,5 +1,10 @@
+from itertools import islice
 import numpy as np
 import re
+from expresiones import compilar_expresion
+from diferenciacion import derivada, jacobiano, jacobiano_diferencias, evaluar_sistema
+from metodos_directos import FactorizacionLU
+from instrumentacion import iniciar_traza, cerrar_traza
 
 def derivada_numerica(f, x, h=1e-6):
     """
@@ -18,21 +23,19 @@ def derivada_numerica(f, x, h=1e-6):
 
 def crear_funcion(expresion):
     """
-    Convierte una expresión de texto en una función lambda.
+    Convierte una expresión de texto en una función de x.
     Más limitado que SymPy pero funciona para expresiones básicas.
+    La función está vectorizada: x puede ser un número o un array.
     
     Parámetros:
     - expresion: String con la expresión matemática
     
     Retorna:
-    - Función lambda que evalúa la expresión
+    - Función que evalúa la expresión
     """
-    # Limpiar la expresión
-    expr = expresion.strip()
-    
     try:
-        # Crear una función lambda que evalúa la expresión
-        funcion = eval(f"lambda x: {expr}")
+        # Compilar la expresión (queda en caché para usos posteriores)
+        funcion = compilar_expresion(expresion, ("x",))
         
         # Probar la función con un valor para verificar que funciona
         funcion(1.0)
@@ -58,184 +61,550 @@ def input_funcion():
         if funcion is None:
             return None, None, expresion
         
-        # Crear una función para la derivada usando diferenciación numérica
-        def derivada(x):
-            return derivada_numerica(funcion, x)
+        # Derivada exacta por diferenciación automática
+        df = derivada(funcion)
         
         print("Función ingresada correctamente:")
         print(f"f(x) = {expresion}")
-        print("La derivada se calculará numéricamente.")
+        print("La derivada se calculará de forma exacta (diferenciación automática).")
         
-        return funcion, derivada, expresion
+        return funcion, df, expresion
     
     except Exception as e:
         print(f"Error al procesar la función: {e}")
         return None, None, None
 
-def input_sistema_no_lineal():
+def nombres_variables(n):
     """
-    Permite al usuario ingresar un sistema de ecuaciones no lineales.
+    Nombres de las variables de un sistema de n ecuaciones:
+    x, y para 2; x, y, z para 3; x1, x2, ..., xn en otro caso.
     """
-    print("\n--- INGRESO DE SISTEMA NO LINEAL ---")
-    print("Introduce un sistema de ecuaciones no lineales de dos variables x e y.")
-    print("Por ejemplo, para el sistema:")
-    print("  x^2 + y^2 = 25")
-    print("  x*y = 12")
-    print("Debes escribir:")
-    print("  x**2 + y**2 - 25")
-    print("  x*y - 12")
+    if n == 2:
+        return ("x", "y")
+    if n == 3:
+        return ("x", "y", "z")
+    return tuple(f"x{i+1}" for i in range(n))
+
+def crear_sistema(expresiones, variables=None):
+    """
+    Convierte las expresiones de un sistema de N ecuaciones con N incógnitas en
+    funciones vectorizadas y crea su Jacobiano exacto por diferenciación automática.
     
+    Parámetros:
+    - expresiones: Lista con las expresiones F1, F2, ..., FN
+    - variables: Nombres de las variables (por defecto, los de nombres_variables)
+    
+    Retorna:
+    - ecuaciones: Lista de funciones [F1, ..., FN] (None si hay un error)
+    - J: Función J(*variables) que retorna la matriz Jacobiana NxN (None si hay un error)
+    """
+    if variables is None:
+        variables = nombres_variables(len(expresiones))
     ecuaciones = []
-    expresiones = []
     
-    for i in range(2):  # Sistema de 2 ecuaciones
-        expr = input(f"Ecuación {i+1}: ")
-        expresiones.append(expr)
-        
+    for i, expr in enumerate(expresiones):
         try:
-            # Convertir a función lambda
-            funcion = eval(f"lambda x, y: {expr}")
+            # Compilar la expresión
+            funcion = compilar_expresion(expr, variables)
             # Probar la función
-            funcion(1.0, 1.0)
+            funcion(*[1.0] * len(variables))
             ecuaciones.append(funcion)
         except Exception as e:
             print(f"Error al procesar la ecuación {i+1}: {e}")
-            return None, None, None
+            return None, None
     
-    # Crear funciones para las derivadas parciales usando diferencias finitas
-    def J11(x, y, h=1e-6):
-        return (ecuaciones[0](x + h, y) - ecuaciones[0](x - h, y)) / (2 * h)
-    
-    def J12(x, y, h=1e-6):
-        return (ecuaciones[0](x, y + h) - ecuaciones[0](x, y - h)) / (2 * h)
+    return ecuaciones, jacobiano(ecuaciones)
+
+def input_sistema_no_lineal():
+    """
+    Permite al usuario ingresar un sistema de ecuaciones no lineales.
+    """
+    print("\n--- INGRESO DE SISTEMA NO LINEAL ---")
+    n = int(input("Número de ecuaciones (por defecto 2): ") or "2")
+    variables = nombres_variables(n)
+    print(f"Introduce un sistema de {n} ecuaciones no lineales en las variables {', '.join(variables)}.")
+    print("Por ejemplo, para el sistema de dos variables:")
+    print("  x^2 + y^2 = 25")
+    print("  x*y = 12")
+    print("Debes escribir:")
+    print("  x**2 + y**2 - 25")
+    print("  x*y - 12")
     
-    def J21(x, y, h=1e-6):
-        return (ecuaciones[1](x + h, y) - ecuaciones[1](x - h, y)) / (2 * h)
+    expresiones = []
+    for i in range(n):
+        expresiones.append(input(f"Ecuación {i+1}: "))
     
-    def J22(x, y, h=1e-6):
-        return (ecuaciones[1](x, y + h) - ecuaciones[1](x, y - h)) / (2 * h)
+    ecuaciones, J = crear_sistema(expresiones, variables)
+    if ecuaciones is None:
+        return None, None, None
     
     print("\nSistema ingresado correctamente:")
-    print(f"F1(x,y) = {expresiones[0]}")
-    print(f"F2(x,y) = {expresiones[1]}")
+    for i, expr in enumerate(expresiones):
+        print(f"F{i+1}({','.join(variables)}) = {expr}")
     
-    print("\nJacobiano se calculará numéricamente.")
+    print("\nEl Jacobiano se calculará de forma exacta (diferenciación automática).")
     
-    return ecuaciones, expresiones, [J11, J12, J21, J22]
+    return ecuaciones, expresiones, J
 
-def newton_raphson_1var(f, df, x0, tol=1e-6, max_iter=100):
+def iterar_newton_1var(f, df, x0, traza=None):
     """
-    Implementa el método de Newton-Raphson para encontrar raíces de una ecuación no lineal.
+    Genera las aproximaciones del método de Newton-Raphson para f(x) = 0, una a una y
+    sin límite. Quien recorre el generador decide cuándo parar.
+    El generador termina si la derivada es casi cero.
     
     Parámetros:
     - f: Función de la cual encontrar las raíces
-    - df: Derivada de la función
+    - df: Derivada de la función (None para calcularla por diferenciación automática)
     - x0: Punto inicial
-    - tol: Tolerancia para la convergencia
-    - max_iter: Número máximo de iteraciones
+    - traza: Traza opcional (instrumentacion.Traza) que registra cada iteración
     
-    Retorna:
-    - raiz: Aproximación a la raíz
-    - iter_count: Número de iteraciones realizadas
-    - x_hist: Historial de aproximaciones
-    - error_hist: Historial de errores
+    Genera:
+    - (iteracion, x, error): primero (0, x0, None) y después cada aproximación
     """
+    if df is None:
+        df = derivada(f)
+    
     x = x0
-    x_hist = [x]
-    error_hist = []
+    traza = iniciar_traza(traza, "newton_raphson_1var", 1)
+    yield 0, x, None
     
-    for i in range(max_iter):
+    i = 0
+    while True:
         # Evaluar función y derivada
         f_x = f(x)
         df_x = df(x)
+        traza.contar("evaluaciones_funcion")
+        traza.contar("evaluaciones_derivada")
         
         # Verificar si la derivada es muy cercana a cero
         if abs(df_x) < 1e-10:
             print(f"La derivada es casi cero en x = {x}. No se puede continuar.")
-            return x, i, x_hist, error_hist
+            return
         
         # Calcular siguiente aproximación
         x_new = x - f_x / df_x
         
         # Calcular error
+        i += 1
         error = abs(x_new - x)
-        error_hist.append(error)
+        traza.iteracion(i, abs(f_x), error)
         
         # Actualizar valor
         x = x_new
+        yield i, x, error
+
+def newton_raphson_1var(f, df, x0, tol=1e-6, max_iter=100, traza=None):
+    """
+    Implementa el método de Newton-Raphson para encontrar raíces de una ecuación no lineal.
+    Recorre iterar_newton_1var hasta la convergencia o max_iter.
+    
+    Parámetros:
+    - f: Función de la cual encontrar las raíces
+    - df: Derivada de la función (None para calcularla por diferenciación automática)
+    - x0: Punto inicial
+    - tol: Tolerancia para la convergencia
+    - max_iter: Número máximo de iteraciones
+    - traza: Traza opcional (instrumentacion.Traza) que registra cada iteración
+    
+    Retorna:
+    - raiz: Aproximación a la raíz
+    - iter_count: Número de iteraciones realizadas
+    - x_hist: Historial de aproximaciones
+    - error_hist: Historial de errores
+    """
+    x_hist = []
+    error_hist = []
+    
+    for i, x, error in islice(iterar_newton_1var(f, df, x0, traza), max_iter + 1):
         x_hist.append(x)
+        if i == 0:
+            continue
+        error_hist.append(error)
         
         # Verificar convergencia
         if error < tol:
-            return x, i+1, x_hist, error_hist
+            cerrar_traza(traza, True)
+            return x, i, x_hist, error_hist
+    
+    cerrar_traza(traza, False)
+    if len(error_hist) < max_iter:
+        # El generador se ha detenido antes (derivada casi cero)
+        return x, len(error_hist), x_hist, error_hist
     
     print(f"El método de Newton-Raphson no convergió después de {max_iter} iteraciones.")
     return x, max_iter, x_hist, error_hist
 
-def newton_raphson_sistema(F, J, x0, tol=1e-6, max_iter=100):
+def iterar_newton_multiarranque(f, df, x0, tol=None, traza=None):
     """
-    Implementa el método de Newton-Raphson para sistemas de ecuaciones no lineales.
+    Genera las iteraciones de Newton-Raphson desde muchos puntos iniciales a la vez.
+    Los puntos que se estancan (derivada casi cero o valores no finitos) dejan de
+    actualizarse; con tol, también los que convergen. El generador termina cuando no
+    queda ningún punto activo.
     
     Parámetros:
-    - F: Lista de funciones del sistema [F1, F2]
-    - J: Lista de funciones del Jacobiano [J11, J12, J21, J22]
-    - x0: Vector inicial [x0, y0]
+    - f: Función vectorizada (acepta arrays) de la cual encontrar las raíces
+    - df: Derivada vectorizada (None para calcularla por diferenciación automática)
+    - x0: Array de puntos iniciales
+    - tol: Tolerancia para congelar los puntos que convergen (None para no congelarlos)
+    - traza: Traza opcional (instrumentacion.Traza). En cada iteración registra el mayor
+      |f(x)| y el mayor paso de los puntos activos
+    
+    Genera:
+    - (iteracion, x, error): primero (0, x0, None) y después cada iteración. x es una
+      vista de solo lectura (sin copia) con el valor actual de cada punto; error es un
+      array con el paso de cada punto (nan en los que no se han actualizado)
+    """
+    if df is None:
+        df = derivada(f)
+    
+    x = np.array(x0, dtype=float).ravel()
+    m = x.shape[0]
+    vista = x.view()
+    vista.flags.writeable = False
+    
+    activos = np.ones(m, dtype=bool)
+    traza = iniciar_traza(traza, "newton_raphson_multiarranque", m)
+    yield 0, vista, None
+    
+    i = 0
+    while activos.any():
+        i += 1
+        idx = np.flatnonzero(activos)
+        xa = x[idx]
+        
+        # Evaluar función y derivada en todos los puntos activos
+        f_x = np.broadcast_to(f(xa), xa.shape)
+        df_x = np.broadcast_to(df(xa), xa.shape)
+        
+        # Puntos estancados: derivada casi cero o valores no finitos
+        estancado = (np.abs(df_x) < 1e-10) | ~np.isfinite(f_x) | ~np.isfinite(df_x)
+        paso = np.where(estancado, 0.0, f_x / np.where(estancado, 1.0, df_x))
+        
+        x[idx] = xa - paso
+        error = np.full(m, np.nan)
+        error[idx[~estancado]] = np.abs(paso[~estancado])
+        if traza.activa:
+            # Cada llamada vectorizada evalúa todos los puntos activos
+            traza.contar("evaluaciones_funcion", idx.size)
+            traza.contar("evaluaciones_derivada", idx.size)
+            traza.iteracion(i, np.max(np.abs(f_x)), np.max(np.abs(paso)))
+        
+        # Congelar los puntos que terminan en esta iteración
+        activos[idx[estancado]] = False
+        if tol is not None:
+            activos[idx[~estancado & (np.abs(paso) < tol)]] = False
+        yield i, vista, error
+
+def newton_raphson_multiarranque(f, df, x0, tol=1e-6, max_iter=100, tol_raiz=None, traza=None):
+    """
+    Aplica Newton-Raphson a la vez desde muchos puntos iniciales.
+    Todos los puntos avanzan juntos con operaciones vectoriales; los que convergen o
+    se estancan (derivada casi cero o valores no finitos) dejan de actualizarse.
+    Recorre iterar_newton_multiarranque hasta que todos paran o max_iter.
+    
+    Parámetros:
+    - f: Función vectorizada (acepta arrays) de la cual encontrar las raíces
+    - df: Derivada vectorizada (None para calcularla por diferenciación automática)
+    - x0: Array de puntos iniciales
     - tol: Tolerancia para la convergencia
     - max_iter: Número máximo de iteraciones
+    - tol_raiz: Distancia máxima para considerar dos raíces la misma (por defecto 100·tol)
+    - traza: Traza opcional (instrumentacion.Traza). En cada iteración registra el mayor
+      |f(x)| y el mayor paso de los puntos activos
     
     Retorna:
-    - sol: Vector solución [x, y]
-    - iter_count: Número de iteraciones realizadas
-    - sol_hist: Historial de aproximaciones
-    - error_hist: Historial de errores
+    - raices: Array ordenado con las raíces distintas encontradas
+    - x: Valor final de cada punto inicial
+    - iteraciones: Iteraciones realizadas por cada punto
+    - convergido: Array booleano que indica qué puntos convergieron
+    - x_hist: Array (iteraciones + 1, m) con las aproximaciones (nan cuando ya paró)
+    - error_hist: Array (iteraciones, m) con los errores (nan cuando ya paró)
     """
-    x, y = x0
-    sol_hist = [[x, y]]
-    error_hist = []
-    
-    J11, J12, J21, J22 = J  # Funciones del Jacobiano
-    
-    for i in range(max_iter):
-        # Evaluar funciones
-        F1 = F[0](x, y)
-        F2 = F[1](x, y)
+    m = np.size(x0)
+    
+    # Historial preasignado; cada punto rellena solo las iteraciones que realiza
+    x_hist = np.full((max_iter + 1, m), np.nan)
+    error_hist = np.full((max_iter, m), np.nan)
+    
+    activos = np.ones(m, dtype=bool)
+    convergido = np.zeros(m, dtype=bool)
+    iteraciones = np.full(m, max_iter)
+    usadas = 0
+    
+    for i, x, error in islice(iterar_newton_multiarranque(f, df, x0, tol, traza), max_iter + 1):
+        if i == 0:
+            x_hist[0] = x
+            continue
+        usadas = i
         
-        # Evaluar Jacobiano
-        j11 = J11(x, y)
-        j12 = J12(x, y)
-        j21 = J21(x, y)
-        j22 = J22(x, y)
+        # Los puntos activos sin paso se han estancado en esta iteración
+        avanzan = activos & ~np.isnan(error)
+        estancado = activos & np.isnan(error)
+        error_hist[i - 1, avanzan] = error[avanzan]
+        x_hist[i, avanzan] = x[avanzan]
         
-        # Calcular el determinante del Jacobiano
-        det_J = j11*j22 - j12*j21
+        # Marcar los puntos que terminan en esta iteración
+        convergen = avanzan & (error < tol)
+        convergido[convergen] = True
+        iteraciones[convergen] = i
+        iteraciones[estancado] = i - 1
+        activos[convergen | estancado] = False
+    
+    x = x.copy()
+    cerrar_traza(traza, not activos.any())
+    if activos.any():
+        print(f"{activos.sum()} de {m} puntos iniciales no convergieron después de {max_iter} iteraciones.")
+    
+    raices = agrupar_raices(x[convergido], 100 * tol if tol_raiz is None else tol_raiz)
+    return raices, x, iteraciones, convergido, x_hist[:usadas + 1], error_hist[:usadas]
+
+def agrupar_raices(valores, tol_raiz):
+    """
+    Agrupa valores cercanos (a menos de tol_raiz entre vecinos ordenados) y
+    retorna la media de cada grupo, en orden creciente.
+    """
+    valores = np.sort(np.asarray(valores, dtype=float))
+    if valores.size == 0:
+        return valores
+    
+    inicio_grupo = np.concatenate([[True], np.diff(valores) > tol_raiz])
+    grupos = np.cumsum(inicio_grupo) - 1
+    return np.bincount(grupos, weights=valores) / np.bincount(grupos)
+
+def _preparar_jacobiano(F, J, n, patron=None):
+    """
+    Convierte cualquiera de las formas admitidas del Jacobiano (None, "diferencias",
+    función o lista de N² funciones) en una función J(*variables) -> matriz NxN.
+    """
+    if J is None:
+        return jacobiano(F, patron)
+    if isinstance(J, str):
+        if J != "diferencias":
+            raise ValueError(f"Tipo de Jacobiano desconocido: {J}")
+        return jacobiano_diferencias(F, patron)
+    if callable(J):
+        return J
+    
+    funciones_J = J  # Funciones del Jacobiano por filas
+    
+    def matriz_J(*variables):
+        return np.array([fj(*variables) for fj in funciones_J]).reshape(n, n)
+    
+    return matriz_J
+
+def _inversa_jacobiano(J, x):
+    """
+    Evalúa el Jacobiano en x y retorna su inversa, o None si es (casi) singular.
+    """
+    try:
+        factorizacion = FactorizacionLU(np.asarray(J(*x), dtype=float))
+    except ValueError:
+        return None
+    if np.min(np.abs(np.diag(factorizacion.LU))) < 1e-10:
+        return None
+    return factorizacion.inversa()
+
+def iterar_newton_sistema(F, J, x0, patron=None, traza=None):
+    """
+    Genera las aproximaciones de Newton-Raphson para un sistema de N ecuaciones no
+    lineales, una a una y sin límite. Quien recorre el generador decide cuándo parar.
+    El generador termina si el Jacobiano es casi singular.
+    Los parámetros son los de newton_raphson_sistema.
+    
+    Genera:
+    - (iteracion, x, error): primero (0, x0, None) y después cada aproximación. x es
+      una vista de solo lectura sobre el vector de trabajo (sin copia)
+    """
+    x = np.array(x0, dtype=float)
+    vista = x.view()
+    vista.flags.writeable = False
+    
+    n = x.shape[0]
+    J = _preparar_jacobiano(F, J, n, patron)
+    traza = iniciar_traza(traza, "newton_raphson_sistema", n)
+    yield 0, vista, None
+    
+    i = 0
+    while True:
+        # Evaluar funciones y Jacobiano
+        valores_F = evaluar_sistema(F, *x)
+        matriz_J = np.asarray(J(*x), dtype=float)
+        traza.contar("evaluaciones_funcion", len(F))
+        traza.contar("evaluaciones_jacobiano")
         
-        # Verificar si el determinante es muy cercano a cero
-        if abs(det_J) < 1e-10:
-            print(f"El determinante del Jacobiano es casi cero en [x,y] = [{x},{y}]. No se puede continuar.")
-            return [x, y], i, sol_hist, error_hist
+        # Factorizar el Jacobiano; si es (casi) singular no se puede continuar
+        try:
+            factorizacion = FactorizacionLU(matriz_J)
+            singular = np.min(np.abs(np.diag(factorizacion.LU))) < 1e-10
+        except ValueError:
+            singular = True
+        if singular:
+            print(f"El Jacobiano es casi singular en {list(x)}. No se puede continuar.")
+            return
         
         # Calcular siguiente aproximación resolviendo el sistema lineal J * Δx = -F
-        dx = (-j22*F1 + j12*F2) / det_J
-        dy = (j21*F1 - j11*F2) / det_J
-        
-        # Actualizar valores
-        x_new = x + dx
-        y_new = y + dy
+        dx = factorizacion.resolver(-valores_F)
         
         # Calcular error
-        error = np.sqrt(dx**2 + dy**2)
-        error_hist.append(error)
+        i += 1
+        error = np.linalg.norm(dx)
+        if traza.activa:
+            traza.iteracion(i, np.linalg.norm(valores_F), error)
+            traza.contar("factorizaciones_lu")
+            traza.contar("flops", 2 * n**3 // 3 + 2 * n**2)
         
         # Actualizar valores
-        x, y = x_new, y_new
-        sol_hist.append([x, y])
+        x += dx
+        yield i, vista, error
+
+def newton_raphson_sistema(F, J, x0, tol=1e-6, max_iter=100, patron=None, traza=None):
+    """
+    Implementa el método de Newton-Raphson para sistemas de N ecuaciones no lineales
+    con N incógnitas. En cada paso se resuelve J Δx = -F por factorización LU.
+    Recorre iterar_newton_sistema hasta la convergencia o max_iter.
+    
+    Parámetros:
+    - F: Lista de funciones del sistema [F1, ..., FN], cada una de las N variables
+    - J: Jacobiano. Puede ser:
+      - None: exacto por diferenciación automática
+      - "diferencias": diferencias centrales con una llamada vectorizada por ecuación
+      - Una función J(*variables) que retorna la matriz Jacobiana NxN
+      - Una lista con las N² funciones del Jacobiano por filas ([J11, J12, J21, J22])
+    - x0: Vector inicial
+    - tol: Tolerancia para la convergencia
+    - max_iter: Número máximo de iteraciones
+    - patron: Matriz booleana opcional con los elementos no nulos del Jacobiano.
+      Con J None o "diferencias" se usa para agrupar columnas por colores y así
+      calcular Jacobianos dispersos con pocas evaluaciones
+    - traza: Traza opcional (instrumentacion.Traza) que registra cada iteración
+    
+    Retorna:
+    - sol: Vector solución
+    - iter_count: Número de iteraciones realizadas
+    - sol_hist: Historial de aproximaciones
+    - error_hist: Historial de errores
+    """
+    sol_hist = []
+    error_hist = []
+    
+    for i, x, error in islice(iterar_newton_sistema(F, J, x0, patron, traza), max_iter + 1):
+        sol_hist.append(list(x))
+        if i == 0:
+            continue
+        error_hist.append(error)
         
         # Verificar convergencia
         if error < tol:
-            return [x, y], i+1, sol_hist, error_hist
+            cerrar_traza(traza, True)
+            return list(x), i, sol_hist, error_hist
+    
+    cerrar_traza(traza, False)
+    if len(error_hist) < max_iter:
+        # El generador se ha detenido antes (Jacobiano casi singular)
+        return list(x), len(error_hist), sol_hist, error_hist
     
     print(f"El método de Newton-Raphson no convergió después de {max_iter} iteraciones.")
-    return [x, y], max_iter, sol_hist, error_hist
+    return list(x), max_iter, sol_hist, error_hist
+
+def broyden_sistema(F, J, x0, tol=1e-6, max_iter=100, variante="buena", patron=None,
+                    max_estancamiento=3, traza=None):
+    """
+    Implementa el método cuasi-Newton de Broyden para sistemas de ecuaciones no lineales.
+    El Jacobiano se calcula una sola vez; después su inversa se corrige en cada paso
+    con una actualización de rango uno, sin nuevas evaluaciones de derivadas.
+    Si el residuo deja de disminuir durante max_estancamiento pasos seguidos, se
+    vuelve a calcular el Jacobiano verdadero en el punto actual.
+    
+    Parámetros:
+    - F: Lista de funciones del sistema [F1, ..., FN], cada una de las N variables
+    - J: Jacobiano inicial, con las mismas opciones que en newton_raphson_sistema
+    - x0: Vector inicial
+    - tol: Tolerancia para la convergencia
+    - max_iter: Número máximo de iteraciones
+    - variante: "buena" o "mala" (actualización de Broyden correspondiente)
+    - patron: Matriz booleana opcional con los elementos no nulos del Jacobiano
+    - max_estancamiento: Pasos sin reducir ||F|| antes de recalcular el Jacobiano
+    - traza: Traza opcional (instrumentacion.Traza) que registra cada iteración
+    
+    Retorna:
+    - sol: Vector solución
+    - iter_count: Número de iteraciones realizadas
+    - sol_hist: Historial de aproximaciones
+    - error_hist: Historial de errores
+    """
+    if variante not in ("buena", "mala"):
+        raise ValueError("La variante de Broyden debe ser 'buena' o 'mala'.")
+    
+    x = np.array(x0, dtype=float)
+    sol_hist = [list(x)]
+    error_hist = []
+    
+    n = x.shape[0]
+    J = _preparar_jacobiano(F, J, n, patron)
+    traza = iniciar_traza(traza, "broyden_sistema", n)
+    H = _inversa_jacobiano(J, x)
+    traza.contar("evaluaciones_jacobiano")
+    traza.contar("flops", 2 * n**3)
+    if H is None:
+        traza.finalizar(False)
+        print(f"El Jacobiano es casi singular en {list(x)}. No se puede continuar.")
+        return list(x), 0, sol_hist, error_hist
+    
+    valores_F = evaluar_sistema(F, *x)
+    traza.contar("evaluaciones_funcion", len(F))
+    estancado = 0
+    
+    for i in range(max_iter):
+        # Paso cuasi-Newton con la inversa aproximada
+        dx = -H @ valores_F
+        x = x + dx
+        nuevos_F = evaluar_sistema(F, *x)
+        
+        # Calcular error
+        error = np.linalg.norm(dx)
+        error_hist.append(error)
+        sol_hist.append(list(x))
+        if traza.activa:
+            traza.iteracion(i + 1, np.linalg.norm(nuevos_F), error)
+            traza.contar("evaluaciones_funcion", len(F))
+            # Paso (2n²) más la actualización de rango uno (unos 6n²)
+            traza.contar("flops", 8 * n**2)
+        
+        # Verificar convergencia
+        if error < tol:
+            traza.finalizar(True)
+            return list(x), i+1, sol_hist, error_hist
+        
+        # Contar los pasos en los que el residuo no baja lo suficiente
+        if np.linalg.norm(nuevos_F) > 0.9 * np.linalg.norm(valores_F):
+            estancado += 1
+        else:
+            estancado = 0
+        
+        dF = nuevos_F - valores_F
+        if estancado >= max_estancamiento:
+            # Recalcular el Jacobiano verdadero en el punto actual
+            H_nueva = _inversa_jacobiano(J, x)
+            traza.contar("evaluaciones_jacobiano")
+            traza.contar("flops", 2 * n**3)
+            if H_nueva is not None:
+                H = H_nueva
+            estancado = 0
+        elif variante == "buena":
+            H_dF = H @ dF
+            denominador = dx @ H_dF
+            if abs(denominador) > 1e-14:
+                H += np.outer(dx - H_dF, dx @ H) / denominador
+        else:
+            denominador = dF @ dF
+            if denominador > 1e-28:
+                H += np.outer(dx - H @ dF, dF) / denominador
+        
+        valores_F = nuevos_F
+    
+    traza.finalizar(False)
+    print(f"El método de Broyden no convergió después de {max_iter} iteraciones.")
+    return list(x), max_iter, sol_hist, error_hist
 
 def resolver_ecuacion_no_lineal():
     """
@@ -258,6 +627,46 @@ def resolver_ecuacion_no_lineal():
     
     return raiz, iteraciones, x_hist, errores, expr_f
 
+def buscar_raices_intervalo():
+    """
+    Busca todas las raíces de una ecuación en un intervalo lanzando Newton-Raphson
+    desde muchos puntos iniciales repartidos en él.
+    Pide al usuario ingresar la función, el intervalo y los parámetros.
+    """
+    f, df, expr_f = input_funcion()
+    if f is None:
+        return None, None
+    
+    a = float(input("\nExtremo izquierdo del intervalo: "))
+    b = float(input("Extremo derecho del intervalo: "))
+    puntos = int(input("Número de puntos iniciales (por defecto 1000): ") or "1000")
+    tol = float(input("Tolerancia (por defecto 1e-6): ") or "1e-6")
+    max_iter = int(input("Máximo de iteraciones (por defecto 100): ") or "100")
+    
+    print("\nBuscando raíces con Newton-Raphson desde varios puntos iniciales...")
+    raices, x, iteraciones, convergido, _, _ = newton_raphson_multiarranque(
+        f, df, np.linspace(a, b, puntos), tol, max_iter)
+    
+    # Quedarse con las raíces que caen dentro del intervalo
+    raices = raices[(raices >= min(a, b)) & (raices <= max(a, b))]
+    return raices, expr_f
+
+def mostrar_raices(raices, expr_f):
+    """
+    Muestra las raíces distintas encontradas por Newton-Raphson multiarranque.
+    """
+    if raices is None:
+        return
+    
+    print("\n--- RAÍCES ENCONTRADAS ---")
+    if raices.size == 0:
+        print("No se encontró ninguna raíz en el intervalo.")
+        return
+    
+    f = crear_funcion(expr_f)
+    for i, raiz in enumerate(raices):
+        print(f"Raíz {i+1}: x = {raiz:.8f}, f(x) = {f(raiz):.8e}")
+
 def resolver_sistema_no_lineal():
     """
     Función principal para resolver un sistema de ecuaciones no lineales con Newton-Raphson.
@@ -268,16 +677,25 @@ def resolver_sistema_no_lineal():
         return None, None, None, None, None
     
     # Pedir punto inicial
-    print("\nIngrese el punto inicial [x0, y0]:")
-    x0 = float(input("x0: "))
-    y0 = float(input("y0: "))
+    variables = nombres_variables(len(F))
+    print(f"\nIngrese el punto inicial [{', '.join(variables)}]:")
+    x0 = [float(input(f"{v}0: ")) for v in variables]
     
     # Pedir parámetros adicionales
     tol = float(input("Tolerancia (por defecto 1e-6): ") or "1e-6")
     max_iter = int(input("Máximo de iteraciones (por defecto 100): ") or "100")
     
-    print("\nResolviendo sistema con el método de Newton-Raphson...")
-    sol, iteraciones, sol_hist, errores = newton_raphson_sistema(F, J, [x0, y0], tol, max_iter)
+    print("\nSelecciona el método:")
+    print("1. Newton-Raphson")
+    print("2. Broyden (cuasi-Newton, para funciones costosas)")
+    metodo = input("Método (por defecto 1): ") or "1"
+    
+    if metodo == "2":
+        print("\nResolviendo sistema con el método de Broyden...")
+        sol, iteraciones, sol_hist, errores = broyden_sistema(F, J, x0, tol, max_iter)
+    else:
+        print("\nResolviendo sistema con el método de Newton-Raphson...")
+        sol, iteraciones, sol_hist, errores = newton_raphson_sistema(F, J, x0, tol, max_iter)
     
     return sol, iteraciones, sol_hist, errores, expr_F
 
@@ -317,26 +735,26 @@ def mostrar_resultados_newton_sistema(sol, iteraciones, sol_hist, errores, expr_
         return
     
     print("\n--- RESULTADOS NEWTON-RAPHSON PARA SISTEMAS ---")
-    print(f"Solución encontrada: x = {sol[0]:.8f}, y = {sol[1]:.8f}")
+    variables = nombres_variables(len(sol))
+    nombres = ",".join(variables)
+    print("Solución encontrada: " + ", ".join(f"{v} = {valor:.8f}" for v, valor in zip(variables, sol)))
     
     # Evaluar funciones en la solución
-    F1 = crear_funcion(expr_F[0].replace('y', str(sol[1])))
-    F2 = crear_funcion(expr_F[1].replace('y', str(sol[1])))
+    F, _ = crear_sistema(expr_F)
     
-    if F1 is not None and F2 is not None:
-        valor_F1 = F1(sol[0])
-        valor_F2 = F2(sol[0])
-        print(f"Valor de F1(x,y) en la solución: {valor_F1:.8e}")
-        print(f"Valor de F2(x,y) en la solución: {valor_F2:.8e}")
+    if F is not None:
+        for i, valor in enumerate(evaluar_sistema(F, *sol)):
+            print(f"Valor de F{i+1}({nombres}) en la solución: {valor:.8e}")
     
     print(f"Convergencia en {iteraciones} iteraciones")
     
     print("\nHistorial de aproximaciones:")
     for i, punto in enumerate(sol_hist[:min(10, len(sol_hist))]):
+        texto = ", ".join(f"{v:.6f}" for v in punto)
         if i < len(errores):
-            print(f"Iteración {i}: [x,y] = [{punto[0]:.6f}, {punto[1]:.6f}], error = {errores[i]:.8e}")
+            print(f"Iteración {i}: [{nombres}] = [{texto}], error = {errores[i]:.8e}")
         else:
-            print(f"Iteración {i}: [x,y] = [{punto[0]:.6f}, {punto[1]:.6f}]")
+            print(f"Iteración {i}: [{nombres}] = [{texto}]")
     
     if len(sol_hist) > 10:
-        print("...")
\ No newline at end of file
+        print("...")
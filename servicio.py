@@ -0,0 +1,289 @@
+import asyncio
+import json
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from lotes import ejecutar_trabajo
+from metodos_directos import CacheFactorizaciones, huella_matriz
+
+class ServicioSolucion:
+    """
+    Servicio local de resolución con un protocolo de líneas JSON: cada línea que envía
+    el cliente es un trabajo con el mismo formato que en el modo por lotes, y cada
+    respuesta es una línea con su registro de resultado (en el orden en que terminan,
+    identificadas por "id").
+
+    - Las solicitudes "gauss" que llegan a la vez con la misma matriz se agrupan en
+      una sola resolución con varios términos independientes, sobre una factorización
+      LU que además queda en caché para las siguientes.
+    - El resto de operaciones se ejecutan en un grupo de procesos que se mantiene
+      abierto, así que no se paga el arranque en cada solicitud.
+    - Cuando hay max_pendientes solicitudes en curso se deja de leer de los clientes
+      hasta que alguna termina (contrapresión).
+    - La operación "metricas" retorna las latencias por cliente y las agrupaciones.
+
+    Parámetros:
+    - procesos: Número de procesos para las operaciones generales (None: todos los núcleos)
+    - max_pendientes: Máximo de solicitudes en curso entre todos los clientes
+    - ventana: Segundos que se espera a otras solicitudes con la misma matriz
+    - max_columnas: Máximo de términos independientes por resolución agrupada
+    - max_bytes_cache: Tamaño máximo de la caché de factorizaciones
+    """
+
+    def __init__(self, procesos=None, max_pendientes=64, ventana=0.002, max_columnas=256,
+                 max_bytes_cache=256 * 1024 * 1024):
+        self.ventana = ventana
+        self.max_columnas = max_columnas
+        self.max_pendientes = max_pendientes
+        self.cache = CacheFactorizaciones(max_bytes_cache)
+        # Con "spawn" los procesos no heredan los sockets abiertos de los clientes
+        # (con fork, una conexión cerrada seguiría abierta en ellos)
+        self._procesos = ProcessPoolExecutor(max_workers=procesos,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        # Un único hilo para las factorizaciones: la caché no se comparte entre hilos
+        self._hilo = ThreadPoolExecutor(max_workers=1)
+        self._capacidad = None
+        self._grupos = {}
+        # El bucle de eventos solo guarda referencias débiles a las tareas: sin
+        # esta referencia un grupo pendiente podría liberarse sin resolverse
+        self._tareas_grupos = set()
+        self._clientes = {}
+        self.resoluciones_agrupadas = 0
+        self.solicitudes_agrupadas = 0
+
+    async def atender(self, lector, escritor):
+        """
+        Atiende una conexión: lee trabajos línea a línea y escribe cada resultado en
+        cuanto está listo.
+        """
+        if self._capacidad is None:
+            self._capacidad = asyncio.Semaphore(self.max_pendientes)
+
+        cliente = self._nombre_cliente(escritor)
+        candado = asyncio.Lock()
+        tareas = set()
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                if not linea.strip():
+                    continue
+                inicio = time.perf_counter()
+                # Sin capacidad libre no se lee la siguiente línea
+                await self._capacidad.acquire()
+                tarea = asyncio.create_task(self._procesar(linea, cliente, inicio, escritor, candado))
+                tareas.add(tarea)
+                tarea.add_done_callback(tareas.discard)
+            if tareas:
+                await asyncio.gather(*tareas)
+        finally:
+            escritor.close()
+
+    def _nombre_cliente(self, escritor):
+        # Sin el puerto, que cambia en cada conexión: así _clientes no crece con
+        # cada conexión nueva de un mismo cliente
+        direccion = escritor.get_extra_info("peername")
+        if isinstance(direccion, tuple):
+            return direccion[0]
+        return "local"
+
+    async def _procesar(self, linea, cliente, inicio, escritor, candado):
+        try:
+            try:
+                trabajo = json.loads(linea)
+            except json.JSONDecodeError as e:
+                registro = {"id": None, "operacion": None, "ok": False,
+                            "error": f"JSON no válido: {e}", "tiempo": 0.0}
+            else:
+                try:
+                    registro = await self._resolver(trabajo)
+                except Exception as e:
+                    # Por ejemplo, un grupo de procesos roto o una línea que no es un
+                    # objeto JSON: el cliente recibe el error en lugar de quedarse esperando
+                    datos = trabajo if isinstance(trabajo, dict) else {}
+                    registro = {"id": datos.get("id"), "operacion": datos.get("operacion"),
+                                "ok": False, "error": f"{type(e).__name__}: {e}", "tiempo": 0.0}
+            registro["latencia"] = time.perf_counter() - inicio
+            self._anotar(cliente, registro)
+
+            async with candado:
+                escritor.write((json.dumps(registro) + "\n").encode())
+                await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._capacidad.release()
+
+    async def _resolver(self, trabajo):
+        """
+        Resuelve un trabajo y retorna su registro de resultado.
+        """
+        operacion = trabajo.get("operacion")
+        if operacion == "metricas":
+            return {"id": trabajo.get("id"), "operacion": operacion, "ok": True,
+                    "resultado": self.metricas(), "tiempo": 0.0}
+        if (operacion == "gauss" and "matriz" in trabajo and "salida" not in trabajo
+                and trabajo.get("precision", "doble") == "doble"):
+            return await self._gauss(trabajo)
+
+        bucle = asyncio.get_running_loop()
+        return await bucle.run_in_executor(self._procesos, ejecutar_trabajo, trabajo)
+
+    async def _gauss(self, trabajo):
+        """
+        Resuelve un trabajo "gauss" dentro del grupo de su matriz.
+        """
+        registro = {"id": trabajo.get("id"), "operacion": "gauss"}
+        inicio = time.perf_counter()
+        try:
+            matriz = np.array(trabajo["matriz"], dtype=float)
+            vector = np.array(trabajo["vector"], dtype=float)
+            if matriz.ndim != 2 or matriz.shape[0] != matriz.shape[1]:
+                raise ValueError("La matriz debe ser cuadrada.")
+            if vector.shape[0] != matriz.shape[0]:
+                raise ValueError("Las dimensiones de la matriz y el vector no son compatibles.")
+            solucion, agrupadas = await self._encolar_gauss(matriz, vector)
+            registro["ok"] = True
+            registro["resultado"] = solucion.tolist()
+            registro["agrupadas"] = agrupadas
+        except Exception as e:
+            registro["ok"] = False
+            registro["error"] = f"{type(e).__name__}: {e}"
+        registro["tiempo"] = time.perf_counter() - inicio
+        return registro
+
+    async def _encolar_gauss(self, matriz, vector):
+        """
+        Añade el vector al grupo pendiente de su matriz y espera la solución.
+
+        Retorna:
+        - (solución, número de solicitudes resueltas en la misma llamada)
+        """
+        bucle = asyncio.get_running_loop()
+        clave = huella_matriz(matriz)
+        grupo = self._grupos.get(clave)
+        if grupo is None:
+            grupo = self._grupos[clave] = {"matriz": matriz, "solicitudes": [], "columnas": 0}
+            bucle.call_later(self.ventana, self._lanzar_grupo, clave, grupo)
+
+        futuro = bucle.create_future()
+        grupo["solicitudes"].append((vector, futuro))
+        grupo["columnas"] += 1 if vector.ndim == 1 else vector.shape[1]
+        if grupo["columnas"] >= self.max_columnas:
+            self._lanzar_grupo(clave, grupo)
+        return await futuro
+
+    def _lanzar_grupo(self, clave, grupo):
+        # El grupo puede haberse lanzado ya por llegar a max_columnas
+        if self._grupos.get(clave) is grupo:
+            del self._grupos[clave]
+            tarea = asyncio.ensure_future(self._resolver_grupo(grupo))
+            self._tareas_grupos.add(tarea)
+            tarea.add_done_callback(self._tareas_grupos.discard)
+
+    async def _resolver_grupo(self, grupo):
+        """
+        Resuelve todas las solicitudes del grupo con una sola llamada multi-RHS.
+        """
+        solicitudes = grupo["solicitudes"]
+        n = grupo["matriz"].shape[0]
+        B = np.hstack([v.reshape(n, -1) for v, _ in solicitudes])
+
+        bucle = asyncio.get_running_loop()
+        try:
+            X = await bucle.run_in_executor(self._hilo, self._resolver_multiple, grupo["matriz"], B)
+        except Exception as e:
+            for _, futuro in solicitudes:
+                if not futuro.done():
+                    futuro.set_exception(e)
+            return
+
+        self.resoluciones_agrupadas += 1
+        self.solicitudes_agrupadas += len(solicitudes)
+        columna = 0
+        for vector, futuro in solicitudes:
+            k = 1 if vector.ndim == 1 else vector.shape[1]
+            solucion = X[:, columna] if vector.ndim == 1 else X[:, columna:columna + k]
+            columna += k
+            if not futuro.done():
+                futuro.set_result((solucion, len(solicitudes)))
+
+    def _resolver_multiple(self, matriz, B):
+        # Con un pivote cero la propia factorización lanza el mismo ValueError que
+        # gauss_eliminacion, así que ambos modos dan la misma respuesta
+        return self.cache.obtener(matriz).resolver(B)
+
+    def _anotar(self, cliente, registro):
+        datos = self._clientes.setdefault(cliente, {
+            "solicitudes": 0, "errores": 0, "latencia_total": 0.0, "latencia_max": 0.0,
+            "latencias": deque(maxlen=1000)})
+        datos["solicitudes"] += 1
+        datos["errores"] += not registro["ok"]
+        datos["latencia_total"] += registro["latencia"]
+        datos["latencia_max"] = max(datos["latencia_max"], registro["latencia"])
+        datos["latencias"].append(registro["latencia"])
+
+    def metricas(self):
+        """
+        Retorna las métricas del servicio.
+
+        Retorna:
+        - Diccionario con, por cliente (su dirección IP, o "local" con un socket
+          Unix), el número de solicitudes y errores y la latencia media, p50, p95
+          y máxima (segundos, sobre las 1000 últimas para los percentiles); y las
+          resoluciones agrupadas y aciertos de la caché
+        """
+        clientes = {}
+        for cliente, datos in self._clientes.items():
+            latencias = np.array(datos["latencias"])
+            clientes[cliente] = {
+                "solicitudes": datos["solicitudes"],
+                "errores": datos["errores"],
+                "latencia_media": datos["latencia_total"] / datos["solicitudes"],
+                "latencia_p50": float(np.percentile(latencias, 50)),
+                "latencia_p95": float(np.percentile(latencias, 95)),
+                "latencia_max": datos["latencia_max"],
+            }
+        return {
+            "clientes": clientes,
+            "resoluciones_agrupadas": self.resoluciones_agrupadas,
+            "solicitudes_agrupadas": self.solicitudes_agrupadas,
+            "cache_aciertos": self.cache.aciertos,
+            "cache_fallos": self.cache.fallos,
+        }
+
+    def cerrar(self):
+        self._procesos.shutdown()
+        self._hilo.shutdown()
+
+async def servir(servicio, host="127.0.0.1", puerto=8765, ruta_socket=None):
+    """
+    Pone el servicio a escuchar en un socket Unix (si se indica ruta_socket) o en
+    host:puerto, hasta que se cancele.
+    """
+    if ruta_socket:
+        servidor = await asyncio.start_unix_server(servicio.atender, path=ruta_socket)
+        print(f"Servicio escuchando en {ruta_socket}")
+    else:
+        servidor = await asyncio.start_server(servicio.atender, host, puerto)
+        print(f"Servicio escuchando en {host}:{puerto}")
+    async with servidor:
+        await servidor.serve_forever()
+
+def ejecutar_servicio(host="127.0.0.1", puerto=8765, ruta_socket=None, procesos=None,
+                      max_pendientes=64):
+    """
+    Arranca el servicio y lo mantiene en marcha hasta Ctrl+C.
+    """
+    servicio = ServicioSolucion(procesos=procesos, max_pendientes=max_pendientes)
+    try:
+        asyncio.run(servir(servicio, host, puerto, ruta_socket))
+    except KeyboardInterrupt:
+        print("Servicio detenido.")
+    finally:
+        servicio.cerrar()